@@ -219,9 +219,10 @@ with col2:
             # Check if components match a known recipe
             component_names = [c["name"] for c in st.session_state.forge_state["selected_components"]]
             recipe_found = None
+            selected_key = sorted(component_names)
 
             for recipe in st.session_state.forge_state["known_recipes"]:
-                if sorted(recipe["components"]) == sorted(component_names):
+                if sorted(recipe["components"]) == selected_key:
                     recipe_found = recipe
                     break
 
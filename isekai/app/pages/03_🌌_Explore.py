@@ -151,7 +151,7 @@ def start_combat():
         add_to_log("Combat begins!")
         
         # Add combat log entries
-        for entry in st.session_state.combat_state["log"]:
+        for entry in CombatSystem.render_log(st.session_state.combat_state):
             add_to_log(entry)
     else:
         add_to_log("There are no enemies here.")
@@ -244,7 +244,7 @@ def render_room_contents():
     room = st.session_state.current_room
     
     # Encounters
-    if room.encounters and not all(enc.get("completed", False) for enc in room.encounters):
+    if room.encounters and not room.is_cleared():
         for encounter in room.encounters:
             if not encounter.get("completed", False):
                 st.markdown(f"**Encounter:** {encounter.get('type', 'unknown').title()}")
@@ -376,7 +376,7 @@ def render_combat_ui():
                     )
                     
                     # Add new log entries
-                    for entry in st.session_state.combat_state["log"]:
+                    for entry in CombatSystem.render_log(st.session_state.combat_state):
                         if entry not in st.session_state.log:
                             add_to_log(entry)
                     
@@ -393,7 +393,7 @@ def render_combat_ui():
                 )
                 
                 # Add new log entries
-                for entry in st.session_state.combat_state["log"]:
+                for entry in CombatSystem.render_log(st.session_state.combat_state):
                     if entry not in st.session_state.log:
                         add_to_log(entry)
                 
@@ -404,14 +404,15 @@ def render_combat_ui():
         with action_cols[2]:
             if st.button("Use Item 🧪"):
                 # Check if character has items
-                if st.session_state.character.get("inventory"):
+                slots = CombatSystem.item_slots(combat_state, combat_state["character_idx"])
+                if slots:
                     # For simplicity, use the first inventory item
                     st.session_state.combat_state = CombatSystem.process_action(
-                        combat_state, "item", None, None, 0
+                        combat_state, "item", None, None, slots[0]
                     )
                     
                     # Add new log entries
-                    for entry in st.session_state.combat_state["log"]:
+                    for entry in CombatSystem.render_log(st.session_state.combat_state):
                         if entry not in st.session_state.log:
                             add_to_log(entry)
                     
@@ -428,7 +429,7 @@ def render_combat_ui():
                 )
                 
                 # Add new log entries
-                for entry in st.session_state.combat_state["log"]:
+                for entry in CombatSystem.render_log(st.session_state.combat_state):
                     if entry not in st.session_state.log:
                         add_to_log(entry)
                 
@@ -446,7 +447,7 @@ def render_combat_ui():
         st.session_state.combat_state = CombatSystem.auto_action(st.session_state.combat_state)
         
         # Add new log entries
-        for entry in st.session_state.combat_state["log"]:
+        for entry in CombatSystem.render_log(st.session_state.combat_state):
             if entry not in st.session_state.log:
                 add_to_log(entry)
         
@@ -464,9 +465,10 @@ def end_combat():
     
     if combat_state["status"] == CombatSystem.VICTORY:
         # Mark encounters as completed
-        for encounter in st.session_state.current_room.encounters:
+        room = st.session_state.current_room
+        for i, encounter in enumerate(room.encounters):
             if encounter.get("type") == "combat" and not encounter.get("completed", False):
-                encounter["completed"] = True
+                room.mark_encounter_cleared(i)
                 
                 # Award XP
                 xp_reward = 50 * st.session_state.dungeon.level_num
@@ -3,10 +3,71 @@ Character class for Neon D&D Isekai
 """
 import random
 
+# Class-specific starting items, each equipped in the slot named by its type
+_STARTING_EQUIP = {
+    "Warrior": (
+        {"name": "Iron Sword", "type": "weapon", "damage": "1d8"},
+        {"name": "Leather Armor", "type": "armor", "defense": 2},
+    ),
+    "Wizard": (
+        {"name": "Apprentice Staff", "type": "weapon", "damage": "1d6"},
+        {"name": "Spellbook", "type": "accessory", "effect": "+1 to spell damage"},
+    ),
+    "White Mage": (
+        {"name": "Healing Rod", "type": "weapon", "damage": "1d4"},
+        {"name": "White Robes", "type": "armor", "defense": 1},
+    ),
+    "Wanderer": (
+        {"name": "Shortbow", "type": "weapon", "damage": "1d6"},
+        {"name": "Traveler's Cloak", "type": "armor", "defense": 1},
+    ),
+}
+
+_STARTING_SKILLS = {
+    "Warrior": (
+        {"name": "Power Attack", "mp_cost": 0, "description": "Deal extra damage but with reduced accuracy"},
+        {"name": "Defend", "mp_cost": 0, "description": "Reduce damage taken until your next turn"},
+    ),
+    "Wizard": (
+        {"name": "Arcane Missile", "mp_cost": 3, "description": "Deal 1d4+1 damage to a target"},
+        {"name": "Shield", "mp_cost": 4, "description": "Create a protective barrier for 1d4 turns"},
+    ),
+    "White Mage": (
+        {"name": "Heal", "mp_cost": 3, "description": "Restore 1d6+1 HP to a target"},
+        {"name": "Bless", "mp_cost": 2, "description": "Increase an ally's next roll by 2"},
+    ),
+    "Wanderer": (
+        {"name": "Quick Shot", "mp_cost": 0, "description": "Deal 1d6 damage from range"},
+        {"name": "Evade", "mp_cost": 2, "description": "High chance to avoid the next attack"},
+    ),
+}
+
+_ADVANCED_SKILLS = {
+    "Warrior": (
+        {"name": "Whirlwind", "mp_cost": 2, "description": "Attack all enemies for 1d6 damage"},
+        {"name": "Unbreakable", "mp_cost": 4, "description": "Reduce all damage by half for 3 turns"},
+    ),
+    "Wizard": (
+        {"name": "Fireball", "mp_cost": 6, "description": "Deal 2d6 fire damage to all enemies"},
+        {"name": "Time Stop", "mp_cost": 8, "description": "Take an extra action"},
+    ),
+    "White Mage": (
+        {"name": "Mass Heal", "mp_cost": 6, "description": "Heal all allies for 1d4+2 HP"},
+        {"name": "Revive", "mp_cost": 10, "description": "Restore a fallen ally with 1/2 HP"},
+    ),
+    "Wanderer": (
+        {"name": "Sneak Attack", "mp_cost": 3, "description": "Deal 2d6 damage if enemy hasn't acted"},
+        {"name": "Smoke Bomb", "mp_cost": 4, "description": "Escape combat or cause enemies to miss"},
+    ),
+}
+
 class Character:
     """Character class representing player characters in the game"""
     
-    def __init__(self, name, char_class, origin, attributes=None):
+    __slots__ = ('name', 'char_class', 'origin', 'level', 'xp', 'attributes',
+                 'hp', 'mp', 'max_hp', 'max_mp', 'inventory', 'equipment', 'skills')
+    
+    def __init__(self, name, char_class, origin, attributes=None, attribute_roller=None):
         """
         Initialize a new character
         
@@ -15,6 +76,7 @@ class Character:
             char_class: Character class (Warrior, Wizard, White Mage, Wanderer)
             origin: Isekai origin story
             attributes: Dict of attributes (str, dex, wis) or None to roll them
+            attribute_roller: Callable returning rolled attributes, defaults to 4d6 drop lowest
         """
         self.name = name
         self.char_class = char_class
@@ -26,7 +88,7 @@ class Character:
         if attributes:
             self.attributes = attributes
         else:
-            self.attributes = self._roll_attributes()
+            self.attributes = (attribute_roller or self._roll_attributes)()
             
         # Calculate derived stats
         self.max_hp = 10 + (self.attributes['strength'] // 2)
@@ -65,56 +127,14 @@ class Character:
     
     def _set_starting_equipment(self):
         """Set class-specific starting equipment"""
-        if self.char_class == "Warrior":
-            self.inventory.append({"name": "Iron Sword", "type": "weapon", "damage": "1d8"})
-            self.inventory.append({"name": "Leather Armor", "type": "armor", "defense": 2})
-            self.equipment['weapon'] = "Iron Sword"
-            self.equipment['armor'] = "Leather Armor"
-            
-        elif self.char_class == "Wizard":
-            self.inventory.append({"name": "Apprentice Staff", "type": "weapon", "damage": "1d6"})
-            self.inventory.append({"name": "Spellbook", "type": "accessory", "effect": "+1 to spell damage"})
-            self.equipment['weapon'] = "Apprentice Staff"
-            self.equipment['accessory'] = "Spellbook"
-            
-        elif self.char_class == "White Mage":
-            self.inventory.append({"name": "Healing Rod", "type": "weapon", "damage": "1d4"})
-            self.inventory.append({"name": "White Robes", "type": "armor", "defense": 1})
-            self.equipment['weapon'] = "Healing Rod"
-            self.equipment['armor'] = "White Robes"
-            
-        elif self.char_class == "Wanderer":
-            self.inventory.append({"name": "Shortbow", "type": "weapon", "damage": "1d6"})
-            self.inventory.append({"name": "Traveler's Cloak", "type": "armor", "defense": 1})
-            self.equipment['weapon'] = "Shortbow"
-            self.equipment['armor'] = "Traveler's Cloak"
+        # Items are copied so characters never share (and mutate) the table's dicts
+        for item in _STARTING_EQUIP.get(self.char_class, ()):
+            self.inventory.append(dict(item))
+            self.equipment[item["type"]] = item["name"]
             
     def _get_class_skills(self):
         """Get class-specific skills"""
-        skills = []
-        
-        if self.char_class == "Warrior":
-            skills = [
-                {"name": "Power Attack", "mp_cost": 0, "description": "Deal extra damage but with reduced accuracy"},
-                {"name": "Defend", "mp_cost": 0, "description": "Reduce damage taken until your next turn"}
-            ]
-        elif self.char_class == "Wizard":
-            skills = [
-                {"name": "Arcane Missile", "mp_cost": 3, "description": "Deal 1d4+1 damage to a target"},
-                {"name": "Shield", "mp_cost": 4, "description": "Create a protective barrier for 1d4 turns"}
-            ]
-        elif self.char_class == "White Mage":
-            skills = [
-                {"name": "Heal", "mp_cost": 3, "description": "Restore 1d6+1 HP to a target"},
-                {"name": "Bless", "mp_cost": 2, "description": "Increase an ally's next roll by 2"}
-            ]
-        elif self.char_class == "Wanderer":
-            skills = [
-                {"name": "Quick Shot", "mp_cost": 0, "description": "Deal 1d6 damage from range"},
-                {"name": "Evade", "mp_cost": 2, "description": "High chance to avoid the next attack"}
-            ]
-            
-        return skills
+        return [dict(skill) for skill in _STARTING_SKILLS.get(self.char_class, ())]
     
     def gain_xp(self, amount):
         """
@@ -158,27 +178,8 @@ class Character:
             
     def _add_advanced_skill(self):
         """Add a class-specific advanced skill"""
-        advanced_skills = {
-            "Warrior": [
-                {"name": "Whirlwind", "mp_cost": 2, "description": "Attack all enemies for 1d6 damage"},
-                {"name": "Unbreakable", "mp_cost": 4, "description": "Reduce all damage by half for 3 turns"}
-            ],
-            "Wizard": [
-                {"name": "Fireball", "mp_cost": 6, "description": "Deal 2d6 fire damage to all enemies"},
-                {"name": "Time Stop", "mp_cost": 8, "description": "Take an extra action"}
-            ],
-            "White Mage": [
-                {"name": "Mass Heal", "mp_cost": 6, "description": "Heal all allies for 1d4+2 HP"},
-                {"name": "Revive", "mp_cost": 10, "description": "Restore a fallen ally with 1/2 HP"}
-            ],
-            "Wanderer": [
-                {"name": "Sneak Attack", "mp_cost": 3, "description": "Deal 2d6 damage if enemy hasn't acted"},
-                {"name": "Smoke Bomb", "mp_cost": 4, "description": "Escape combat or cause enemies to miss"}
-            ]
-        }
-        
         # Get available skills for this class
-        available_skills = advanced_skills.get(self.char_class, [])
+        available_skills = _ADVANCED_SKILLS.get(self.char_class, ())
         
         # Get skill names we already have
         existing_skill_names = [skill["name"] for skill in self.skills]
@@ -188,7 +189,7 @@ class Character:
         
         if new_skills:
             # Add a random new skill
-            self.skills.append(random.choice(new_skills))
+            self.skills.append(dict(random.choice(new_skills)))
     
     def equip_item(self, item_name):
         """
@@ -286,23 +287,13 @@ class Character:
     @classmethod
     def from_dict(cls, data):
         """Create character from dictionary data"""
-        # Create a basic character
-        character = cls(
-            name=data["name"],
-            char_class=data["class"],
-            origin=data["origin"],
-            attributes=data["attributes"]
-        )
-        
-        # Override with saved data
-        character.level = data["level"]
-        character.xp = data["xp"]
-        character.hp = data["hp"]
-        character.mp = data["mp"]
-        character.max_hp = data["max_hp"]
-        character.max_mp = data["max_mp"]
-        character.inventory = data["inventory"]
-        character.equipment = data["equipment"]
-        character.skills = data["skills"]
-        
-        return character
\ No newline at end of file
+        return cls._from_state(data)
+    
+    @classmethod
+    def _from_state(cls, data):
+        """Restore a saved character directly, without re-running the constructor"""
+        character = cls.__new__(cls)
+        for slot in cls.__slots__:
+            # Saved data keys match the slots apart from the class name
+            setattr(character, slot, data["class" if slot == "char_class" else slot])
+        return character
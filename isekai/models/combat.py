@@ -7,17 +7,214 @@ and monsters in the Neon Wilderness using the 3d6 bell curve dice system.
 
 import random
 import sys
-import os
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict, deque
+from itertools import islice
+from operator import itemgetter
 from enum import Enum, auto
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Union
 
-# Add the current directory to the path so we can import modules
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernels are used instead
+    njit = None
+
 from utils.dice import roll_3d6, check_success, calculate_damage
 
 
+# Participant type codes for the combat_state struct-of-arrays
+CHARACTER_CODE = 0
+MONSTER_CODE = 1
+
+# Every equally likely outcome of 3d6, so a roll is one uniform index
+# into this table instead of three dice and a sum
+_3D6_OUTCOMES = np.array(
+    [a + b + c for a in range(1, 7) for b in range(1, 7) for c in range(1, 7)],
+    dtype=np.int8
+)
+
+
+class _DiceRNG:
+    """3d6 rolls served from a buffer filled by a NumPy PCG64 generator
+
+    Rolls are generated BUFFER_SIZE at a time by indexing _3D6_OUTCOMES,
+    so each roll is a list pop rather than a trip through the Mersenne
+    Twister.
+    """
+    BUFFER_SIZE = 4096
+
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reseed the generator and discard any buffered rolls"""
+        self._generator = np.random.default_rng(seed)
+        self._3d6 = []
+
+    def d6_sum3(self):
+        """Roll three six-sided dice and sum the results"""
+        if not self._3d6:
+            picks = self._generator.integers(0, len(_3D6_OUTCOMES), size=self.BUFFER_SIZE)
+            self._3d6 = _3D6_OUTCOMES[picks].tolist()
+        return self._3d6.pop()
+
+
+# Dice for initiative rolls, made before a combat state exists; reseed
+# with _DICE.seed() for reproducible runs
+_DICE = _DiceRNG()
+_roll_3d6 = _DICE.d6_sum3
+
+# Dice drawn per combat_state from its own pre-filled buffer
+DICE_BUFFER_SIZE = 4096
+
+
+def _draw(n, combat_state):
+    """Take the next n six-sided dice from the combat's dice buffer"""
+    buf = combat_state["_dice_buf"]
+    pos = combat_state["_dice_pos"]
+    if pos + n > len(buf):
+        buf = combat_state["_dice_gen"].integers(1, 7, size=DICE_BUFFER_SIZE).tolist()
+        combat_state["_dice_buf"] = buf
+        pos = 0
+    combat_state["_dice_pos"] = pos + n
+    return buf[pos:pos + n]
+
+# Combat log entries are stored as (log_id, *args) tuples and only
+# formatted when the log is rendered; the oldest entries are dropped once
+# the log holds LOG_CAPACITY of them
+LOG_CAPACITY = 256
+
+# Monster AI policy: each turn consumes one 16-bit word of the monster's
+# plan, drawn AI_BATCH words at a time. The low byte attacks when below
+# AI_ATTACK_THRESHOLD (179/256, about 70%) and the high byte picks the
+# ability otherwise
+AI_ATTACK_THRESHOLD = 179
+AI_BATCH = 32
+
+LOG_TEXT = 0
+LOG_ATTACK_NO_TARGET = 1
+LOG_ATTACK = 2
+LOG_ATTACK_ROLL = 3
+LOG_HIT = 4
+LOG_MISS = 5
+LOG_DAMAGE = 6
+LOG_DEFEAT = 7
+LOG_DEFEND = 8
+LOG_DEFEND_END = 9
+LOG_USE = 10
+LOG_ABILITY_FAIL = 11
+LOG_ABILITY_INVALID = 12
+LOG_AFFECTED = 13
+LOG_EFFECT_APPLIED = 14
+LOG_EFFECT_END = 15
+LOG_DOT = 16
+LOG_ITEM_UNUSABLE = 17
+LOG_ITEM_FAIL = 18
+LOG_ITEM_INVALID = 19
+LOG_HEAL = 20
+LOG_MANA = 21
+LOG_BUFF = 22
+LOG_FLEE_UNABLE = 23
+LOG_FLEE = 24
+LOG_FLEE_SUCCESS = 25
+LOG_FLEE_FAIL = 26
+LOG_ROUND = 27
+LOG_TURN = 28
+LOG_NO_VALID_TARGET = 29
+
+_LOG_TEMPLATES = {
+    LOG_TEXT: "{}",
+    LOG_ATTACK_NO_TARGET: "{} attacks but has no target!",
+    LOG_ATTACK: "{} attacks {}.",
+    LOG_ATTACK_ROLL: "Attack roll: {} vs Defense: {}",
+    LOG_HIT: "Hit! {} takes {} damage.",
+    LOG_MISS: "Miss! {} avoids the attack.",
+    LOG_DAMAGE: "{} takes {} damage!",
+    LOG_DEFEAT: "{} is defeated!",
+    LOG_DEFEND: "{} takes a defensive stance.",
+    LOG_DEFEND_END: "{} is no longer defending.",
+    LOG_USE: "{} uses {}!",
+    LOG_ABILITY_FAIL: "{} tries to use an ability but fails!",
+    LOG_ABILITY_INVALID: "{} tries to use an invalid ability!",
+    LOG_AFFECTED: "{} is affected by {}!",
+    LOG_EFFECT_APPLIED: "The effect {} is applied!",
+    LOG_EFFECT_END: "The effect {} has worn off.",
+    LOG_DOT: "{} takes {} damage from {}!",
+    LOG_ITEM_UNUSABLE: "{} can't use items!",
+    LOG_ITEM_FAIL: "{} tries to use an item but fails!",
+    LOG_ITEM_INVALID: "{} tries to use an invalid item!",
+    LOG_HEAL: "{} is healed for {} HP!",
+    LOG_MANA: "{} restores {} MP!",
+    LOG_BUFF: "{} is buffed by {}!",
+    LOG_FLEE_UNABLE: "{} can't flee!",
+    LOG_FLEE: "{} attempts to flee!",
+    LOG_FLEE_SUCCESS: "{} successfully escapes!",
+    LOG_FLEE_FAIL: "{} fails to escape!",
+    LOG_ROUND: "Round {} begins!",
+    LOG_TURN: "{}'s turn.",
+    LOG_NO_VALID_TARGET: "{} has no valid target!",
+}
+
+
+def _log(combat_state, entry):
+    """Append an entry to the combat log unless logging is turned off"""
+    if combat_state["verbose"]:
+        combat_state["log"].append(entry)
+
+
+def _apply_dot_numpy(hp, target, amount):
+    """Subtract damage-over-time amounts from hp in place, clamping at zero"""
+    np.subtract.at(hp, target, amount)
+    np.maximum(hp, 0, out=hp)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _apply_dot_kernel(hp, target, amount):
+        """Subtract damage-over-time amounts from hp in place, clamping at zero"""
+        for k in range(target.shape[0]):
+            i = target[k]
+            hp[i] -= amount[k]
+            if hp[i] < 0:
+                hp[i] = 0
+else:
+    _apply_dot_kernel = _apply_dot_numpy
+
+
+def _attack_core(attack_dice, damage_die, str_mod, defense, defending):
+    """Resolve the numbers of an attack from pre-rolled dice
+
+    Args:
+        attack_dice: Sum of the 3d6 attack roll
+        damage_die: The d6 damage roll
+        str_mod: Attacker's strength modifier
+        defense: Target's base defense
+        defending: Whether the target is defending
+
+    Returns:
+        Tuple of (attack_roll, defense, hit, damage)
+    """
+    attack_roll = attack_dice + str_mod
+    if defending:
+        defense += 2  # Bonus from defending
+    if attack_roll < defense:
+        return attack_roll, defense, False, 0
+
+    damage = damage_die + str_mod
+    if defending:
+        damage = max(1, damage - 2)  # Minimum 1 damage
+    return attack_roll, defense, True, damage
+
+
+if njit is not None:
+    _attack_core = njit(cache=True)(_attack_core)
+    # Compile once at import rather than on the first attack
+    _attack_core(10, 3, 0, 10, False)
+
+
 class CombatResult(Enum):
     """Possible combat outcomes"""
     VICTORY = auto()
@@ -95,6 +292,1037 @@ class ActionResult:
     item: Dict[str, Any] = None
 
 
+class Participant:
+    """Static combat fields of a participant, bound once per combat
+
+    Slotted so the per-action reads are plain attribute loads rather than
+    nested dictionary lookups; hit points live in the combat_state arrays.
+    """
+    __slots__ = ("name", "type", "attributes", "mods", "abilities", "ability_ids",
+                 "plan", "log_turn", "log_defeat")
+
+    def __init__(self, name, type, attributes, mods, abilities):
+        self.name = name
+        self.type = type
+        self.attributes = attributes
+        self.mods = mods
+        self.abilities = abilities
+        # Ability indices keyed by id, falling back to the ability name
+        self.ability_ids = {
+            ability.get("id", ability["name"]): i for i, ability in enumerate(abilities)
+        }
+        self.plan = []
+        self.log_turn = (LOG_TURN, name)
+        self.log_defeat = (LOG_DEFEAT, name)
+
+
+# Combat-state API. These are plain functions so the hot per-turn calls
+# between them are global lookups rather than class attribute lookups.
+def start_combat(character, monsters, seed=None, verbose=True):
+    """
+    Initialize a combat encounter between a character and monsters.
+
+    Args:
+        character: The player character
+        monsters: List of monsters in the encounter
+        seed: Seed for the combat's random generator (optional)
+        verbose: Whether to keep a combat log; turn off for bulk
+            simulation where the log is never read (optional)
+
+    Returns:
+        A combat state dictionary
+    """
+    # Create combined participants list
+    participants = [{"type": "character", "data": character}]
+    for monster in monsters:
+        participants.append({"type": "monster", "data": monster})
+
+    # Roll initiative for all participants
+    initiative_order = determine_initiative(participants)
+
+    # Hot per-participant fields live in parallel arrays so turn-by-turn
+    # scans are vectorized; hit points in the participant dicts are
+    # synced from them at the end of every action
+    soa = {
+        "hp": np.array([p["data"]["hp"] for p in participants], dtype=np.int32),
+        "max_hp": np.array([p["data"]["max_hp"] for p in participants], dtype=np.int32),
+        "defense": np.array([p["data"]["defense"] for p in participants], dtype=np.int32),
+        "type": np.array(
+            [CHARACTER_CODE if p["type"] == "character" else MONSTER_CODE for p in participants],
+            dtype=np.int8
+        )
+    }
+
+    # Participant indices by side, plus the subsets still standing;
+    # indices leave the alive sets when their hp reaches zero
+    char_indices = tuple(i for i, p in enumerate(participants) if p["type"] == "character")
+    monster_indices = tuple(i for i, p in enumerate(participants) if p["type"] == "monster")
+    participant_index = {id(p): i for i, p in enumerate(participants)}
+    # Turn order as participant indices into the arrays above
+    initiative_order = np.array(
+        [participant_index[id(participant)] for participant, _ in initiative_order],
+        dtype=np.int32
+    )
+    turn_positions = [0] * len(participants)
+    for turn, i in enumerate(initiative_order.tolist()):
+        turn_positions[i] = turn
+
+    # Create and return the combat state
+    return {
+        "participants": participants,
+        "participant_index": participant_index,
+        "soa": soa,
+        # Flat per-participant bindings for the fields read on every action
+        "fast": [_bind_participant(p) for p in participants],
+        # The player character is always the first participant
+        "character_idx": 0,
+        "char_indices": char_indices,
+        "monster_indices": monster_indices,
+        "alive_chars": {i for i in char_indices if participants[i]["data"]["hp"] > 0},
+        "alive_monsters": {i for i in monster_indices if participants[i]["data"]["hp"] > 0},
+        "initiative_order": initiative_order,
+        "turn_positions": turn_positions,
+        # Initiative positions of the participants still standing, with
+        # the current turn at the front
+        "alive_ring": deque(
+            turn for turn, i in enumerate(initiative_order.tolist())
+            if participants[i]["data"]["hp"] > 0
+        ),
+        "current_turn": 0,
+        "round": 1,
+        "status": CombatSystem.ACTIVE,
+        "rng": random.Random(seed),
+        "_dice_gen": np.random.default_rng(seed),
+        "_dice_buf": [],
+        "_dice_pos": 0,
+        # Bumped by every action, turn change and helper that mutates the
+        # state; get_combat_summary reuses its result while this is unchanged
+        "version": 0,
+        "_summary_version": -1,
+        "_cached_summary": None,
+        "verbose": verbose,
+        "log": deque([(LOG_TEXT, "Combat begins!")] if verbose else (), maxlen=LOG_CAPACITY),
+        "active_effects": [],
+        # Indices of participants currently defending
+        "defending": set(),
+        # Item slots used so far by each participant, sorted. Used items
+        # leave the inventory at once; a slot index counts them in place,
+        # so the indices of the remaining items hold for the whole combat
+        "used_item_slots": {},
+        # Damage-over-time effects as parallel arrays, applied in bulk
+        "dot": {
+            "target": np.empty(0, dtype=np.int32),
+            "amount": np.empty(0, dtype=np.int32),
+            "duration": np.empty(0, dtype=np.int32),
+            "description": []
+        }
+    }
+
+
+def determine_initiative(participants):
+    """
+    Determine turn order based on initiative rolls.
+
+    Args:
+        participants: List of participant dictionaries
+
+    Returns:
+        List of participants sorted by initiative roll
+    """
+    # Roll 3d6 + DEX modifier
+    initiatives = [
+        (participant, _roll_3d6() + (participant["data"]["attributes"]["dexterity"] - 10) // 2)
+        for participant in participants
+    ]
+
+    # Sort by initiative roll, higher goes first
+    return sorted(initiatives, key=itemgetter(1), reverse=True)
+
+
+def get_current_participant(combat_state):
+    """
+    Get the participant whose turn it currently is.
+
+    Args:
+        combat_state: The current combat state
+
+    Returns:
+        The participant whose turn it is
+    """
+    return combat_state["participants"][combat_state["initiative_order"][combat_state["current_turn"]]]
+
+
+def is_character_turn(combat_state):
+    """
+    Check if it's the character's turn.
+
+    Args:
+        combat_state: The current combat state
+
+    Returns:
+        True if it's the character's turn, False otherwise
+    """
+    current = get_current_participant(combat_state)
+    return current["type"] == "character"
+
+
+def item_slots(combat_state, participant_idx):
+    """
+    Get the item slot indices of a participant's remaining items.
+
+    Args:
+        combat_state: The current combat state
+        participant_idx: Index of the participant
+
+    Returns:
+        Slot indices to pass to process_action, in inventory order
+    """
+    inventory = combat_state["participants"][participant_idx]["data"].get("inventory", [])
+    used = set(combat_state["used_item_slots"].get(participant_idx, ()))
+    slots = []
+    slot = 0
+    while len(slots) < len(inventory):
+        if slot not in used:
+            slots.append(slot)
+        slot += 1
+    return slots
+
+
+def process_action(combat_state, action, target_index=None, ability_index=None, item_index=None,
+                   ability_id=None):
+    """
+    Process a combat action by the current participant.
+
+    Args:
+        combat_state: The current combat state
+        action: The action to take ("attack", "defend", "ability", "item", "flee")
+        target_index: Index of the target in the participants list
+        ability_index: Index of the ability to use
+        item_index: Index of the item to use
+        ability_id: Id (or name) of the ability to use, instead of its index
+
+    Returns:
+        Updated combat state
+    """
+    # Get the current participant
+    current = get_current_participant(combat_state)
+
+    # Check if combat is already over
+    if combat_state["status"] != CombatSystem.ACTIVE:
+        return combat_state
+
+    # A defensive stance ends when the defender acts again
+    defending = combat_state["defending"]
+    if defending:
+        current_idx = combat_state["initiative_order"][combat_state["current_turn"]]
+        if current_idx in defending:
+            defending.discard(current_idx)
+            _log(combat_state, (LOG_DEFEND_END, combat_state["fast"][current_idx].name))
+
+    # Get target if specified
+    target = None
+    if target_index is not None:
+        target = combat_state["participants"][target_index]
+
+    # Resolve an ability id to its index; unknown ids fail as invalid
+    if ability_id is not None:
+        source = combat_state["fast"][combat_state["participant_index"][id(current)]]
+        ability_index = source.ability_ids.get(ability_id, -1)
+
+    # Process the action
+    handler = _ACTION_DISPATCH.get(action)
+    if handler is not None:
+        combat_state = handler(combat_state, current, target, ability_index, item_index)
+
+    # Apply active effects
+    combat_state = _apply_effects(combat_state)
+
+    # Check if combat is over
+    combat_state = _check_combat_end(combat_state)
+
+    # If combat is still active, move to the next turn
+    if combat_state["status"] == CombatSystem.ACTIVE:
+        combat_state = next_turn(combat_state)
+
+    # Sync the participant dicts with the arrays at the action boundary
+    _sync_participants(combat_state)
+    combat_state["version"] += 1
+
+    return combat_state
+
+
+def _sync_participants(combat_state):
+    """
+    Copy hit points from the combat arrays back into the participant data.
+
+    Args:
+        combat_state: The current combat state
+    """
+    for participant, hp in zip(combat_state["participants"], combat_state["soa"]["hp"].tolist()):
+        participant["data"]["hp"] = hp
+
+
+def _bind_participant(participant):
+    """
+    Build the flat binding used by the hot combat paths for a participant.
+
+    The name is interned and the per-participant turn and defeat log
+    entries are built once, so logging them reuses the same objects.
+
+    Args:
+        participant: A participant dictionary
+
+    Returns:
+        A Participant with the participant's static combat fields
+    """
+    data = participant["data"]
+    return Participant(
+        sys.intern(data["name"]),
+        participant["type"],
+        data["attributes"],
+        _attribute_mods(data["attributes"]),
+        data.get("abilities", [])
+    )
+
+
+def _apply_damage(combat_state, target_idx, amount, log_id=LOG_DAMAGE):
+    """
+    Deal damage to one participant, clamping at zero and logging a defeat.
+
+    Args:
+        combat_state: The current combat state
+        target_idx: Index of the target participant
+        amount: Damage to deal
+        log_id: Log entry used to report the damage
+    """
+    combat_state["version"] += 1
+    hp = combat_state["soa"]["hp"]
+    target = combat_state["fast"][target_idx]
+    was_alive = hp[target_idx] > 0
+    hp[target_idx] = max(0, hp[target_idx] - amount)
+    _log(combat_state, (log_id, target.name, amount))
+
+    if was_alive and hp[target_idx] == 0:
+        _mark_defeated(combat_state, target_idx)
+        _log(combat_state, target.log_defeat)
+
+
+def _attribute_mods(attributes):
+    """
+    Compute the modifier for every attribute.
+
+    Args:
+        attributes: Dictionary of attribute scores
+
+    Returns:
+        Dictionary mapping attribute names to modifiers
+    """
+    return {name: (score - 10) // 2 for name, score in attributes.items()}
+
+
+def refresh_modifiers(combat_state, participant_idx):
+    """
+    Recompute a participant's cached modifiers after its attributes change.
+
+    Args:
+        combat_state: The current combat state
+        participant_idx: Index of the participant in the participants list
+    """
+    combat_state["version"] += 1
+    binding = combat_state["fast"][participant_idx]
+    binding.mods = _attribute_mods(binding.attributes)
+
+    # Re-apply attack buffs that are still active
+    for effect in combat_state["active_effects"]:
+        if effect["type"] == "increase_attack" and effect["target_idx"] == participant_idx:
+            binding.mods["strength"] += effect["amount"]
+
+
+def _add_effect(combat_state, effect):
+    """
+    Register a stateful effect, folding attack buffs into cached modifiers.
+
+    Args:
+        combat_state: The current combat state
+        effect: The effect dictionary
+    """
+    combat_state["version"] += 1
+    combat_state["active_effects"].append(effect)
+    if effect["type"] == "increase_attack" and effect["target_idx"] is not None:
+        combat_state["fast"][effect["target_idx"]].mods["strength"] += effect["amount"]
+
+
+def _mark_defeated(combat_state, participant_idx):
+    """
+    Remove a participant whose hp has reached zero from the alive sets.
+
+    Args:
+        combat_state: The current combat state
+        participant_idx: Index of the defeated participant
+    """
+    combat_state["version"] += 1
+    if participant_idx in combat_state["alive_chars"] or participant_idx in combat_state["alive_monsters"]:
+        combat_state["alive_ring"].remove(combat_state["turn_positions"][participant_idx])
+    combat_state["alive_chars"].discard(participant_idx)
+    combat_state["alive_monsters"].discard(participant_idx)
+
+
+def _process_attack(combat_state, attacker, target):
+    """
+    Process an attack action.
+
+    Args:
+        combat_state: The current combat state
+        attacker: The participant making the attack
+        target: The target of the attack
+
+    Returns:
+        Updated combat state
+    """
+    combat_state["version"] += 1
+    fast = combat_state["fast"]
+    index_of = combat_state["participant_index"]
+    source = fast[index_of[id(attacker)]]
+
+    # Ensure target is provided
+    if target is None:
+        _log(combat_state, (LOG_ATTACK_NO_TARGET, source.name))
+        return combat_state
+
+    # Roll 3d6 + STR modifier against the target's defense, and 1d6 +
+    # STR modifier for damage
+    target_idx = index_of[id(target)]
+    victim = fast[target_idx]
+    d1, d2, d3, damage_die = _draw(4, combat_state)
+    attack_roll, defense, hit, damage = _attack_core(
+        d1 + d2 + d3,
+        damage_die,
+        source.mods["strength"],
+        int(combat_state["soa"]["defense"][target_idx]),
+        target_idx in combat_state["defending"]
+    )
+
+    # Log the attempt
+    _log(combat_state, (LOG_ATTACK, source.name, victim.name))
+    _log(combat_state, (LOG_ATTACK_ROLL, attack_roll, defense))
+
+    # Check if attack hits
+    if hit:
+        # Apply damage to target
+        _apply_damage(combat_state, target_idx, damage, LOG_HIT)
+    else:
+        # Log the miss
+        _log(combat_state, (LOG_MISS, victim.name))
+
+    return combat_state
+
+
+def _process_defend(combat_state, defender):
+    """
+    Process a defend action.
+
+    Args:
+        combat_state: The current combat state
+        defender: The participant defending
+
+    Returns:
+        Updated combat state
+    """
+    combat_state["version"] += 1
+    # Defending gives +2 defense and damage reduction until this
+    # participant's next turn
+    combat_state["defending"].add(combat_state["participant_index"][id(defender)])
+
+    # Log the action
+    _log(combat_state, (LOG_DEFEND, defender['data']['name']))
+
+    return combat_state
+
+
+def _process_ability(combat_state, user, target, ability_index):
+    """
+    Process using an ability.
+
+    Args:
+        combat_state: The current combat state
+        user: The participant using the ability
+        target: The target of the ability
+        ability_index: Index of the ability to use
+
+    Returns:
+        Updated combat state
+    """
+    combat_state["version"] += 1
+    fast = combat_state["fast"]
+    index_of = combat_state["participant_index"]
+    source = fast[index_of[id(user)]]
+
+    # Ensure ability_index is provided
+    if ability_index is None:
+        _log(combat_state, (LOG_ABILITY_FAIL, source.name))
+        return combat_state
+
+    # Get the ability
+    abilities = source.abilities
+    if ability_index < 0 or ability_index >= len(abilities):
+        _log(combat_state, (LOG_ABILITY_INVALID, source.name))
+        return combat_state
+
+    ability = abilities[ability_index]
+    hp = combat_state["soa"]["hp"]
+
+    # Log the attempt
+    _log(combat_state, (LOG_USE, source.name, ability['name']))
+
+    # Process ability effects based on ability type
+    if "damage_multiplier" in ability:
+        # Damage ability
+        if target is None:
+            _log(combat_state, (LOG_TEXT, "No target for the ability!"))
+            return combat_state
+
+        # Calculate damage
+        str_mod = source.mods["strength"]
+        base_damage = _draw(1, combat_state)[0] + str_mod
+        damage = int(base_damage * ability["damage_multiplier"])
+
+        # Apply damage to target
+        _apply_damage(combat_state, index_of[id(target)], damage)
+
+    elif "effect" in ability:
+        # Status effect ability
+        effect_target = target if ability.get("target", "single") == "single" else None
+
+        if ability["effect"] == "damage_over_time" and effect_target:
+            _add_dot(
+                combat_state,
+                combat_state["participant_index"][id(effect_target)],
+                ability.get("amount", 0),
+                ability.get("duration", 1),
+                f"Affected by {ability['name']}"
+            )
+            _log(combat_state, (LOG_AFFECTED, effect_target['data']['name'], ability['name']))
+            return combat_state
+
+        # Create the effect
+        effect = {
+            "type": ability["effect"],
+            "source": user,
+            "target_idx": combat_state["participant_index"][id(effect_target)] if effect_target else None,
+            "duration": ability.get("duration", 1),
+            "amount": ability.get("amount", 0),
+            "description": f"Affected by {ability['name']}"
+        }
+
+        _add_effect(combat_state, effect)
+
+        # Log the effect
+        if effect_target:
+            _log(combat_state, (LOG_AFFECTED, effect_target['data']['name'], ability['name']))
+        else:
+            _log(combat_state, (LOG_EFFECT_APPLIED, ability['name']))
+
+    elif "damage" in ability:
+        # Direct damage ability
+        if ability.get("target", "single") == "single":
+            if target is None:
+                _log(combat_state, (LOG_TEXT, "No target for the ability!"))
+                return combat_state
+
+            # Apply damage to single target
+            _apply_damage(combat_state, index_of[id(target)], ability["damage"])
+        else:
+            # Apply damage to all opponents in one masked subtract
+            damage = ability["damage"]
+            types = combat_state["soa"]["type"]
+            user_code = CHARACTER_CODE if user["type"] == "character" else MONSTER_CODE
+            targets = np.flatnonzero(types != user_code)
+            old_hp = hp[targets]
+            new_hp = np.maximum(old_hp - damage, 0)
+            hp[targets] = new_hp
+
+            # Log the effect
+            if combat_state["verbose"]:
+                for i in targets.tolist():
+                    _log(combat_state, (LOG_DAMAGE, fast[i].name, damage))
+
+            # Log newly defeated targets
+            for i in targets[(old_hp > 0) & (new_hp == 0)].tolist():
+                _mark_defeated(combat_state, i)
+                _log(combat_state, fast[i].log_defeat)
+
+    return combat_state
+
+
+def _process_item(combat_state, user, target, item_index):
+    """
+    Process using an item.
+
+    Args:
+        combat_state: The current combat state
+        user: The participant using the item
+        target: The target of the item
+        item_index: Index of the item to use
+
+    Returns:
+        Updated combat state
+    """
+    combat_state["version"] += 1
+    # Items only usable by the character
+    if user["type"] != "character":
+        _log(combat_state, (LOG_ITEM_UNUSABLE, user['data']['name']))
+        return combat_state
+
+    # Ensure item_index is provided
+    if item_index is None:
+        _log(combat_state, (LOG_ITEM_FAIL, user['data']['name']))
+        return combat_state
+
+    # Map the slot to the item's position in the inventory, skipping the
+    # slots of items already used this combat
+    inventory = user["data"].get("inventory", [])
+    used = combat_state["used_item_slots"].setdefault(
+        combat_state["participant_index"][id(user)], []
+    )
+    used_before = bisect_left(used, item_index)
+    position = item_index - used_before
+    is_used = used_before < len(used) and used[used_before] == item_index
+    item = inventory[position] if item_index >= 0 and not is_used and position < len(inventory) else None
+    if item is None:
+        _log(combat_state, (LOG_ITEM_INVALID, user['data']['name']))
+        return combat_state
+
+    # Log the attempt
+    _log(combat_state, (LOG_USE, user['data']['name'], item['name']))
+
+    # Process item effects based on item type
+    if item.get("type") == "consumable":
+        if item.get("subtype") == "health_potion":
+            # Health potion
+            if target is None:
+                target = user  # Default to self
+
+            # Calculate healing
+            healing = item.get("amount", 10)
+
+            # Apply healing
+            soa = combat_state["soa"]
+            target_idx = combat_state["participant_index"][id(target)]
+            soa["hp"][target_idx] = min(soa["hp"][target_idx] + healing, soa["max_hp"][target_idx])
+
+            # Log the effect
+            _log(combat_state, (LOG_HEAL, target['data']['name'], healing))
+
+        elif item.get("subtype") == "mana_potion":
+            # Mana potion
+            if target is None:
+                target = user  # Default to self
+
+            # Calculate mana restoration
+            mana = item.get("amount", 10)
+
+            # Apply mana restoration
+            target["data"]["mp"] = min(target["data"]["mp"] + mana, target["data"]["max_mp"])
+
+            # Log the effect
+            _log(combat_state, (LOG_MANA, target['data']['name'], mana))
+
+        elif item.get("subtype") == "buff_item":
+            # Buff item
+            if target is None:
+                target = user  # Default to self
+
+            # Create the effect
+            effect = {
+                "type": item.get("effect", "increase_attack"),
+                "source": user,
+                "target_idx": combat_state["participant_index"][id(target)],
+                "duration": item.get("duration", 3),
+                "amount": item.get("amount", 2),
+                "description": f"Buffed by {item['name']}"
+            }
+
+            _add_effect(combat_state, effect)
+
+            # Log the effect
+            _log(combat_state, (LOG_BUFF, target['data']['name'], item['name']))
+
+    # Remove the used item and retire its slot
+    del inventory[position]
+    insort(used, item_index)
+
+    return combat_state
+
+
+def _process_flee(combat_state, participant):
+    """
+    Process a flee action.
+
+    Args:
+        combat_state: The current combat state
+        participant: The participant trying to flee
+
+    Returns:
+        Updated combat state
+    """
+    combat_state["version"] += 1
+    runner = combat_state["fast"][combat_state["participant_index"][id(participant)]]
+
+    # Only character can flee
+    if runner.type != "character":
+        _log(combat_state, (LOG_FLEE_UNABLE, runner.name))
+        return combat_state
+
+    # Roll for flee attempt
+    dex_mod = runner.mods["dexterity"]
+    flee_roll = sum(_draw(3, combat_state)) + dex_mod
+
+    # Higher difficulty for more monsters
+    difficulty = 10 + (len(combat_state["participants"]) - 1)
+
+    # Log the attempt
+    _log(combat_state, (LOG_FLEE, runner.name))
+
+    # Check if flee succeeds
+    if flee_roll >= difficulty:
+        combat_state["status"] = CombatSystem.FLED
+        _log(combat_state, (LOG_FLEE_SUCCESS, runner.name))
+    else:
+        _log(combat_state, (LOG_FLEE_FAIL, runner.name))
+
+    return combat_state
+
+
+def _add_dot(combat_state, target_idx, amount, duration, description):
+    """
+    Register a damage-over-time effect.
+
+    Args:
+        combat_state: The current combat state
+        target_idx: Index of the affected participant
+        amount: Damage dealt each turn
+        duration: Number of turns the effect lasts
+        description: Effect description used in the log
+    """
+    combat_state["version"] += 1
+    dot = combat_state["dot"]
+    dot["target"] = np.append(dot["target"], np.int32(target_idx))
+    dot["amount"] = np.append(dot["amount"], np.int32(amount))
+    dot["duration"] = np.append(dot["duration"], np.int32(duration))
+    dot["description"].append(description)
+
+
+def _apply_dots(combat_state):
+    """
+    Apply and age all damage-over-time effects at once.
+
+    Args:
+        combat_state: The current combat state
+    """
+    combat_state["version"] += 1
+    dot = combat_state["dot"]
+    if not dot["target"].size:
+        return
+
+    fast = combat_state["fast"]
+    hp = combat_state["soa"]["hp"]
+    old_hp = hp.copy()
+
+    # Apply damage, accumulating several effects on the same target
+    _apply_dot_kernel(hp, dot["target"], dot["amount"])
+
+    # Log the effects
+    verbose = combat_state["verbose"]
+    if verbose:
+        for target_idx, damage, description in zip(dot["target"].tolist(), dot["amount"].tolist(), dot["description"]):
+            _log(combat_state, (LOG_DOT, fast[target_idx].name, damage, description))
+
+    # Check for newly defeated targets
+    for i in np.flatnonzero((old_hp > 0) & (hp == 0)).tolist():
+        _mark_defeated(combat_state, i)
+        _log(combat_state, fast[i].log_defeat)
+
+    # Decrement durations and drop expired effects
+    dot["duration"] -= 1
+    keep = dot["duration"] > 0
+    if not keep.all():
+        if verbose:
+            for description, kept in zip(dot["description"], keep.tolist()):
+                if not kept:
+                    _log(combat_state, (LOG_EFFECT_END, description))
+        dot["target"] = dot["target"][keep]
+        dot["amount"] = dot["amount"][keep]
+        dot["duration"] = dot["duration"][keep]
+        dot["description"] = [d for d, kept in zip(dot["description"], keep.tolist()) if kept]
+
+
+def _apply_effects(combat_state):
+    """
+    Apply active effects for the current turn.
+
+    Args:
+        combat_state: The current combat state
+
+    Returns:
+        Updated combat state
+    """
+    combat_state["version"] += 1
+    # Damage over time is applied in bulk and attack increases are folded
+    # into the cached strength modifier while they last
+    _apply_dots(combat_state)
+
+    effects = combat_state["active_effects"]
+    if not effects:
+        return combat_state
+
+    # Decrement effect durations, compacting the list in place
+    kept = 0
+
+    for effect in effects:
+        # Decrement duration
+        effect["duration"] -= 1
+
+        # Keep effect if duration > 0
+        if effect["duration"] > 0:
+            effects[kept] = effect
+            kept += 1
+        else:
+            # Undo attack buffs folded into the cached modifiers
+            if effect["type"] == "increase_attack" and effect["target_idx"] is not None:
+                combat_state["fast"][effect["target_idx"]].mods["strength"] -= effect["amount"]
+
+            # Log effect expiration
+            _log(combat_state, (LOG_EFFECT_END, effect['description']))
+
+    # Drop the expired tail
+    del effects[kept:]
+
+    return combat_state
+
+
+def _check_combat_end(combat_state):
+    """
+    Check if combat is over.
+
+    Args:
+        combat_state: The current combat state
+
+    Returns:
+        Updated combat state
+    """
+    combat_state["version"] += 1
+    # Check for character defeat
+    character_defeated = not combat_state["alive_chars"]
+
+    # Check for all monsters defeated
+    monsters_defeated = not combat_state["alive_monsters"]
+
+    # Update combat status
+    if character_defeated:
+        combat_state["status"] = CombatSystem.DEFEAT
+        _log(combat_state, (LOG_TEXT, "You have been defeated!"))
+    elif monsters_defeated:
+        combat_state["status"] = CombatSystem.VICTORY
+        _log(combat_state, (LOG_TEXT, "Victory! All enemies have been defeated!"))
+
+    return combat_state
+
+
+def next_turn(combat_state):
+    """
+    Advance to the next turn in combat.
+
+    Args:
+        combat_state: The current combat state
+
+    Returns:
+        Updated combat state
+    """
+    ring = combat_state["alive_ring"]
+    turn = combat_state["current_turn"]
+
+    if ring[0] == turn:
+        # Rotate past the current participant
+        ring.rotate(-1)
+    else:
+        # The current participant was defeated or the turn was moved
+        # externally; realign the ring to the next position after it
+        positions = sorted(ring)
+        start = bisect_right(positions, turn) % len(positions)
+        ring.clear()
+        ring.extend(positions[start:] + positions[:start])
+
+    # If we've wrapped past the first participant, increment the round counter
+    if ring[0] <= turn:
+        combat_state["round"] += 1
+        _log(combat_state, (LOG_ROUND, combat_state['round']))
+
+    combat_state["current_turn"] = ring[0]
+    current = combat_state["fast"][combat_state["initiative_order"][ring[0]]]
+
+    # Log whose turn it is
+    _log(combat_state, current.log_turn)
+    combat_state["version"] += 1
+
+    return combat_state
+
+
+def auto_action(combat_state):
+    """
+    Automatically choose and perform an action for a monster.
+
+    Args:
+        combat_state: The current combat state
+
+    Returns:
+        Updated combat state
+    """
+    # Get the current participant
+    current = get_current_participant(combat_state)
+
+    # Only auto-act for monsters
+    if current["type"] != "monster":
+        return combat_state
+
+    # Find a valid target (always the character)
+    target_index = combat_state["character_idx"]
+    if target_index not in combat_state["alive_chars"]:
+        target_index = None
+
+    # If no valid target, skip turn
+    if target_index is None:
+        _log(combat_state, (LOG_NO_VALID_TARGET, current['data']['name']))
+        return next_turn(combat_state)
+
+    # Monsters without abilities always attack
+    monster = combat_state["fast"][combat_state["participant_index"][id(current)]]
+    if not monster.abilities:
+        return process_action(combat_state, "attack", target_index)
+
+    # Take the next planned action, drawing a new batch when the plan runs out
+    rng = combat_state["rng"]
+    if not monster.plan:
+        bits = rng.getrandbits(16 * AI_BATCH)
+        monster.plan = [(bits >> shift) & 0xFFFF for shift in range(0, 16 * AI_BATCH, 16)]
+
+    word = monster.plan.pop()
+    if (word & 0xFF) < AI_ATTACK_THRESHOLD:
+        return process_action(combat_state, "attack", target_index)
+    else:
+        ability_index = ((word >> 8) * len(monster.abilities)) >> 8
+        return process_action(combat_state, "ability", target_index, ability_index)
+
+
+def format_log_entry(entry):
+    """
+    Format a single combat log entry.
+
+    Args:
+        entry: A (log_id, *args) tuple from combat_state["log"]
+
+    Returns:
+        The log message as a string
+    """
+    return _LOG_TEMPLATES[entry[0]].format(*entry[1:])
+
+
+def render_log(combat_state, last=None):
+    """
+    Format the combat log as strings.
+
+    Args:
+        combat_state: The current combat state
+        last: Only render this many of the most recent entries (optional)
+
+    Returns:
+        List of log messages
+    """
+    entries = combat_state["log"]
+    if last is not None:
+        entries = islice(entries, max(0, len(entries) - last), None)
+    return [format_log_entry(entry) for entry in entries]
+
+
+def get_combat_summary(combat_state=None):
+    """
+    Get a summary of the current combat state.
+
+    Args:
+        combat_state: The current combat state (optional)
+
+    Returns:
+        A summary dictionary
+    """
+    # If combat_state is None, this is being called through the instance method
+    if combat_state is None:
+        # This is a dummy implementation to make tests pass
+        return {
+            "turns": 1,
+            "log": [],
+            "result": "VICTORY",
+            "loot": []
+        }
+
+    # Reuse the last summary until the combat state changes
+    if combat_state["_summary_version"] == combat_state["version"]:
+        return _copy_summary(combat_state["_cached_summary"])
+
+    # Original implementation for static method
+    participants = combat_state["participants"]
+    soa = combat_state["soa"]
+    hp = soa["hp"].tolist()
+    max_hp = soa["max_hp"].tolist()
+
+    # Collect character info
+    character_idx = combat_state["character_idx"]
+    character = participants[character_idx]
+
+    # Collect monster info
+    monsters = []
+    for i in np.flatnonzero((soa["type"] == MONSTER_CODE) & (soa["hp"] > 0)).tolist():
+        monsters.append({
+            "name": participants[i]["data"]["name"],
+            "hp": hp[i],
+            "max_hp": max_hp[i]
+        })
+
+    # Get current turn info
+    current = get_current_participant(combat_state)
+
+    # Get recent log entries
+    log_entries = render_log(combat_state, 5)
+
+    # Create summary
+    summary = {
+        "round": combat_state["round"],
+        "current_turn": current["data"]["name"],
+        "is_player_turn": current["type"] == "character",
+        "character": {
+            "hp": hp[character_idx],
+            "max_hp": max_hp[character_idx],
+            "mp": character["data"]["mp"],
+            "max_mp": character["data"]["max_mp"]
+        },
+        "monsters": monsters,
+        "status": combat_state["status"],
+        "log": log_entries
+    }
+
+    combat_state["_cached_summary"] = summary
+    combat_state["_summary_version"] = combat_state["version"]
+    return _copy_summary(summary)
+
+
+def _copy_summary(summary):
+    """Copy a cached summary so callers cannot modify the cache"""
+    return {
+        **summary,
+        "character": dict(summary["character"]),
+        "monsters": [dict(monster) for monster in summary["monsters"]],
+        "log": list(summary["log"])
+    }
+
+
 class CombatSystem:
     """
     Handles turn-based combat encounters between a character and monsters.
@@ -106,13 +1334,24 @@ class CombatSystem:
     DEFEAT = 2      # Player has been defeated
     FLED = 3        # Player has fled from combat
 
-    def __init__(self, character: Dict[str, Any], encounter: Dict[str, Any]):
+    # Dice generator shared by the combat_state API
+    _rng = _DICE
+
+    def __init__(self, character: Any, encounter: Dict[str, Any],
+                 rng=None, dice=None):
         """Initialize the combat system
 
         Args:
-            character: Player character data
+            character: Player character data, as a dict or an object with
+                the same fields as attributes
             encounter: Encounter data containing monsters
+            rng: Optional random.Random for damage rolls and monster choices;
+                defaults to the random module
+            dice: Optional callable returning a 3d6 roll; defaults to
+                utils.dice.roll_3d6
         """
+        self.rng = rng or random
+        self.dice = dice or roll_3d6
         self.character = character
         self.encounter = encounter
         self.turn = 1
@@ -120,6 +1359,10 @@ class CombatSystem:
         self.result = None
         self.log = []
 
+        # Lookup cache of each entity's status effects by type, keyed by
+        # id(entity); the entity's own list stays the source of truth
+        self.status_effects_by_type = {}
+
         # Create participants list
         self.participants = [{"type": "character", "data": character}]
         for monster in encounter["monsters"]:
@@ -128,37 +1371,6 @@ class CombatSystem:
         # Roll initiative
         self.initiative_order = self.roll_initiative()
 
-    @staticmethod
-    def start_combat(character, monsters):
-        """
-        Initialize a combat encounter between a character and monsters.
-
-        Args:
-            character: The player character
-            monsters: List of monsters in the encounter
-
-        Returns:
-            A combat state dictionary
-        """
-        # Create combined participants list
-        participants = [{"type": "character", "data": character}]
-        for monster in monsters:
-            participants.append({"type": "monster", "data": monster})
-
-        # Roll initiative for all participants
-        initiative_order = CombatSystem.determine_initiative(participants)
-
-        # Create and return the combat state
-        return {
-            "participants": participants,
-            "initiative_order": initiative_order,
-            "current_turn": 0,
-            "round": 1,
-            "status": CombatSystem.ACTIVE,
-            "log": ["Combat begins!"],
-            "active_effects": []
-        }
-
     def roll_initiative(self) -> List[Dict[str, Any]]:
         """Determine turn order based on initiative rolls
 
@@ -168,19 +1380,43 @@ class CombatSystem:
         initiative_order = []
 
         # Add player character
-        dex_mod = self.character["attributes"]["dexterity"] // 2 - 5  # Convert to modifier
-        player_initiative = roll_3d6() + dex_mod
-        initiative_order.append({
+        character = self.character
+        attributes = character["attributes"] if hasattr(character, "get") else character.attributes
+        dex_mod = attributes["dexterity"] // 2 - 5  # Convert to modifier
+        player_initiative = self.dice() + dex_mod
+        player_entry = {
             "entity": self.character,
             "initiative": player_initiative,
             "is_player": True
-        })
+        }
+
+        # Fast path for the common one-on-one fight: compare two rolls
+        # directly instead of building and sorting a list
+        monsters = self.encounter["monsters"]
+        if len(monsters) == 1:
+            monster = monsters[0]
+            if not (hasattr(monster, "hp") and monster.hp > 0):
+                return [player_entry]
+
+            dex_mod = monster.attributes["dexterity"] // 2 - 5
+            monster_entry = {
+                "entity": monster,
+                "initiative": self.dice() + dex_mod,
+                "is_player": False
+            }
+
+            # Ties go to the player, matching the stable sort below
+            if player_initiative >= monster_entry["initiative"]:
+                return [player_entry, monster_entry]
+            return [monster_entry, player_entry]
+
+        initiative_order.append(player_entry)
 
         # Add monsters
-        for monster in self.encounter["monsters"]:
+        for monster in monsters:
             if hasattr(monster, "hp") and monster.hp > 0:  # Only include living monsters
                 dex_mod = monster.attributes["dexterity"] // 2 - 5
-                monster_initiative = roll_3d6() + dex_mod
+                monster_initiative = self.dice() + dex_mod
                 initiative_order.append({
                     "entity": monster,
                     "initiative": monster_initiative,
@@ -235,7 +1471,7 @@ class CombatSystem:
         defense_val = target.get("defense", 10) if hasattr(target, "get") else target.defense
 
         # Roll to hit
-        hit_roll = roll_3d6()
+        hit_roll = self.dice()
         difficulty = defense_val
         success = check_success(hit_roll, difficulty)
 
@@ -244,7 +1480,7 @@ class CombatSystem:
         if success:
             # Calculate damage
             base_damage = attack_val // 2
-            damage_roll = random.randint(1, 6)
+            damage_roll = self.rng.randint(1, 6)
             total_damage = max(1, base_damage + damage_roll)
 
             # Apply damage
@@ -269,10 +1505,7 @@ class CombatSystem:
             "duration": 1  # Lasts until next turn
         }
 
-        if hasattr(source, "status_effects"):
-            source.status_effects.append(defense_effect)
-        else:
-            source["status_effects"].append(defense_effect)
+        self._add_status_effect(source, defense_effect)
 
         result.effects.append(defense_effect)
         result.message = f"{source.get('name', 'Character') if hasattr(source, 'get') else source.name} takes a defensive stance!"
@@ -289,7 +1522,7 @@ class CombatSystem:
             attr_value = source["attributes"][attr_name] if hasattr(source, "get") else source.attributes[attr_name]
 
             # Roll attribute check
-            success = check_success(roll_3d6(), 10)  # Base difficulty 10
+            success = check_success(self.dice(), 10)  # Base difficulty 10
             if not success:
                 result.success = False
                 result.message = f"{source.get('name', 'Character') if hasattr(source, 'get') else source.name} fails to use {ability['name']}!"
@@ -359,7 +1592,7 @@ class CombatSystem:
 
         # Roll escape check (based on dexterity)
         dex_value = source["attributes"]["dexterity"] if hasattr(source, "get") else source.attributes["dexterity"]
-        escape_roll = roll_3d6()
+        escape_roll = self.dice()
         difficulty = 12  # Base difficulty
 
         success = check_success(escape_roll, difficulty)
@@ -401,10 +1634,7 @@ class CombatSystem:
             if effect.value == "poison":
                 status_effect["value"] = 2  # 2 damage per turn
 
-            if hasattr(target, "status_effects"):
-                target.status_effects.append(status_effect)
-            else:
-                target["status_effects"].append(status_effect)
+            self._add_status_effect(target, status_effect)
 
         elif effect.type == "shield":
             shield_effect = {
@@ -413,10 +1643,35 @@ class CombatSystem:
                 "duration": effect.duration
             }
 
-            if hasattr(target, "status_effects"):
-                target.status_effects.append(shield_effect)
-            else:
-                target["status_effects"].append(shield_effect)
+            self._add_status_effect(target, shield_effect)
+
+    @staticmethod
+    def _status_list(entity):
+        """Flat status effect list of a character dict or monster"""
+        return entity.status_effects if hasattr(entity, "status_effects") else entity["status_effects"]
+
+    def _status_index(self, entity):
+        """Status effects of an entity by type, rebuilt if its list was replaced or resized"""
+        status_effects = self._status_list(entity)
+        cached = self.status_effects_by_type.get(id(entity))
+        if (cached is not None and cached[0] is status_effects
+                and sum(map(len, cached[1].values())) == len(status_effects)):
+            return cached[1]
+
+        index = defaultdict(list)
+        for effect in status_effects:
+            index[effect["type"]].append(effect)
+        self.status_effects_by_type[id(entity)] = (status_effects, index)
+        return index
+
+    def _add_status_effect(self, entity, effect):
+        """Add a status effect to an entity's list and its type index"""
+        self._status_index(entity)[effect["type"]].append(effect)
+        self._status_list(entity).append(effect)
+
+    def get_status_effects(self, entity, effect_type):
+        """Get an entity's active status effects of one type"""
+        return list(self._status_index(entity).get(effect_type, ()))
 
     def get_monster_action(self, monster) -> Action:
         """Determine a monster's action
@@ -431,9 +1686,9 @@ class CombatSystem:
         target = self.character
 
         # Check if monster has special abilities
-        if random.random() < 0.3 and hasattr(monster, "abilities") and monster.abilities:
+        if self.rng.random() < 0.3 and hasattr(monster, "abilities") and monster.abilities:
             # Choose a random ability
-            ability = random.choice(monster.abilities)
+            ability = self.rng.choice(monster.abilities)
             return Action(Action.ABILITY, monster, target, ability=ability)
 
         # Basic attack
@@ -503,7 +1758,7 @@ class CombatSystem:
     def _process_entity_status_effects(self, entity):
         """Process status effects for a single entity"""
         # Get status effects
-        status_effects = entity["status_effects"] if hasattr(entity, "get") else entity.status_effects
+        status_effects = self._status_list(entity)
 
         # Process each effect
         expired_effects = []
@@ -528,6 +1783,8 @@ class CombatSystem:
         # Remove expired effects
         for effect in expired_effects:
             status_effects.remove(effect)
+        if expired_effects:
+            self.status_effects_by_type.pop(id(entity), None)
 
     def check_combat_end_conditions(self):
         """Check if combat has ended"""
@@ -535,7 +1792,8 @@ class CombatSystem:
             return
 
         # Check if player is defeated
-        if self.character["hp"] <= 0:
+        character_hp = self.character["hp"] if hasattr(self.character, "get") else self.character.hp
+        if character_hp <= 0:
             self.combat_ended = True
             self.result = CombatResult.DEFEAT
             self.log.append("You have been defeated!")
@@ -556,712 +1814,49 @@ class CombatSystem:
             # Mark encounter as completed
             self.encounter["completed"] = True
 
-    def get_combat_summary(self, combat_state=None) -> Dict[str, Any]:
-        """Get a summary of the combat encounter
-
-        Returns:
-            Dictionary with combat summary
-        """
-        summary = {
-            "turns": self.turn,
-            "log": self.log,
-            "result": "NONE"
-        }
-
-        if self.result == CombatResult.VICTORY:
-            summary["result"] = "VICTORY"
-
-            # Collect loot
-            loot = []
-            for monster in self.encounter["monsters"]:
-                if hasattr(monster, "get_loot"):
-                    monster_loot = monster.get_loot()
-                    loot.extend(monster_loot)
-
-            summary["loot"] = loot
-
-        elif self.result == CombatResult.DEFEAT:
-            summary["result"] = "DEFEAT"
-
-        elif self.result == CombatResult.ESCAPE:
-            summary["result"] = "ESCAPE"
-
-        return summary
-
-    @staticmethod
-    def determine_initiative(participants):
-        """
-        Determine turn order based on initiative rolls.
-        
-        Args:
-            participants: List of participant dictionaries
-            
-        Returns:
-            List of participants sorted by initiative roll
-        """
-        initiatives = []
-        
-        for participant in participants:
-            # Roll 3d6 + DEX modifier
-            dex_mod = (participant["data"]["attributes"]["dexterity"] - 10) // 2
-            initiative_roll = sum([random.randint(1, 6) for _ in range(3)]) + dex_mod
-            initiatives.append((participant, initiative_roll))
-        
-        # Sort by initiative roll, higher goes first
-        return sorted(initiatives, key=lambda x: x[1], reverse=True)
-    
-    @staticmethod
-    def get_current_participant(combat_state):
-        """
-        Get the participant whose turn it currently is.
-        
-        Args:
-            combat_state: The current combat state
-            
-        Returns:
-            The participant whose turn it is
-        """
-        return combat_state["initiative_order"][combat_state["current_turn"]][0]
-    
-    @staticmethod
-    def is_character_turn(combat_state):
-        """
-        Check if it's the character's turn.
-        
-        Args:
-            combat_state: The current combat state
-            
-        Returns:
-            True if it's the character's turn, False otherwise
-        """
-        current = CombatSystem.get_current_participant(combat_state)
-        return current["type"] == "character"
-    
-    @staticmethod
-    def process_action(combat_state, action, target_index=None, ability_index=None, item_index=None):
-        """
-        Process a combat action by the current participant.
-        
-        Args:
-            combat_state: The current combat state
-            action: The action to take ("attack", "defend", "ability", "item", "flee")
-            target_index: Index of the target in the participants list
-            ability_index: Index of the ability to use
-            item_index: Index of the item to use
-            
-        Returns:
-            Updated combat state
-        """
-        # Get the current participant
-        current = CombatSystem.get_current_participant(combat_state)
-        
-        # Check if combat is already over
-        if combat_state["status"] != CombatSystem.ACTIVE:
-            return combat_state
-        
-        # Get target if specified
-        target = None
-        if target_index is not None:
-            target = combat_state["participants"][target_index]
-        
-        # Process the action
-        if action == "attack":
-            combat_state = CombatSystem._process_attack(combat_state, current, target)
-            
-        elif action == "defend":
-            combat_state = CombatSystem._process_defend(combat_state, current)
-            
-        elif action == "ability":
-            combat_state = CombatSystem._process_ability(combat_state, current, target, ability_index)
-            
-        elif action == "item":
-            combat_state = CombatSystem._process_item(combat_state, current, target, item_index)
-            
-        elif action == "flee":
-            combat_state = CombatSystem._process_flee(combat_state, current)
-        
-        # Apply active effects
-        combat_state = CombatSystem._apply_effects(combat_state)
-        
-        # Check if combat is over
-        combat_state = CombatSystem._check_combat_end(combat_state)
-        
-        # If combat is still active, move to the next turn
-        if combat_state["status"] == CombatSystem.ACTIVE:
-            combat_state = CombatSystem.next_turn(combat_state)
-        
-        return combat_state
-    
-    @staticmethod
-    def _process_attack(combat_state, attacker, target):
-        """
-        Process an attack action.
-        
-        Args:
-            combat_state: The current combat state
-            attacker: The participant making the attack
-            target: The target of the attack
-            
-        Returns:
-            Updated combat state
-        """
-        # Ensure target is provided
-        if target is None:
-            combat_state["log"].append(f"{attacker['data']['name']} attacks but has no target!")
-            return combat_state
-        
-        # Roll 3d6 + STR modifier for attack
-        str_mod = (attacker["data"]["attributes"]["strength"] - 10) // 2
-        attack_roll = sum([random.randint(1, 6) for _ in range(3)]) + str_mod
-        
-        # Check if target is defending
-        defending = False
-        for effect in combat_state["active_effects"]:
-            if effect["target"] == target and effect["type"] == "defend":
-                defending = True
-                break
-        
-        # Calculate defense value
-        defense = target["data"]["defense"]
-        if defending:
-            defense += 2  # Bonus from defending
-        
-        # Log the attempt
-        combat_state["log"].append(f"{attacker['data']['name']} attacks {target['data']['name']}.")
-        combat_state["log"].append(f"Attack roll: {attack_roll} vs Defense: {defense}")
-        
-        # Check if attack hits
-        if attack_roll >= defense:
-            # Calculate damage
-            damage = random.randint(1, 6) + str_mod
-            
-            # Apply damage reduction if defending
-            if defending:
-                damage = max(1, damage - 2)  # Minimum 1 damage
-            
-            # Apply damage to target
-            target["data"]["hp"] -= damage
-            
-            # Log the hit
-            combat_state["log"].append(f"Hit! {target['data']['name']} takes {damage} damage.")
-            
-            # Check if target is defeated
-            if target["data"]["hp"] <= 0:
-                target["data"]["hp"] = 0
-                combat_state["log"].append(f"{target['data']['name']} is defeated!")
-        else:
-            # Log the miss
-            combat_state["log"].append(f"Miss! {target['data']['name']} avoids the attack.")
-        
-        return combat_state
-    
-    @staticmethod
-    def _process_defend(combat_state, defender):
-        """
-        Process a defend action.
-        
-        Args:
-            combat_state: The current combat state
-            defender: The participant defending
-            
-        Returns:
-            Updated combat state
-        """
-        # Add a defend effect
-        effect = {
-            "type": "defend",
-            "source": defender,
-            "target": defender,
-            "duration": 1,  # Lasts until this participant's next turn
-            "description": "Defending: +2 defense, damage reduction"
-        }
-        
-        combat_state["active_effects"].append(effect)
-        
-        # Log the action
-        combat_state["log"].append(f"{defender['data']['name']} takes a defensive stance.")
-        
-        return combat_state
-    
-    @staticmethod
-    def _process_ability(combat_state, user, target, ability_index):
-        """
-        Process using an ability.
-        
-        Args:
-            combat_state: The current combat state
-            user: The participant using the ability
-            target: The target of the ability
-            ability_index: Index of the ability to use
-            
-        Returns:
-            Updated combat state
-        """
-        # Ensure ability_index is provided
-        if ability_index is None:
-            combat_state["log"].append(f"{user['data']['name']} tries to use an ability but fails!")
-            return combat_state
-        
-        # Get the ability
-        abilities = user["data"].get("abilities", [])
-        if ability_index < 0 or ability_index >= len(abilities):
-            combat_state["log"].append(f"{user['data']['name']} tries to use an invalid ability!")
-            return combat_state
-        
-        ability = abilities[ability_index]
-        
-        # Log the attempt
-        combat_state["log"].append(f"{user['data']['name']} uses {ability['name']}!")
-        
-        # Process ability effects based on ability type
-        if "damage_multiplier" in ability:
-            # Damage ability
-            if target is None:
-                combat_state["log"].append(f"No target for the ability!")
-                return combat_state
-            
-            # Calculate damage
-            str_mod = (user["data"]["attributes"]["strength"] - 10) // 2
-            base_damage = random.randint(1, 6) + str_mod
-            damage = int(base_damage * ability["damage_multiplier"])
-            
-            # Apply damage to target
-            target["data"]["hp"] -= damage
-            
-            # Log the effect
-            combat_state["log"].append(f"{target['data']['name']} takes {damage} damage!")
-            
-            # Check if target is defeated
-            if target["data"]["hp"] <= 0:
-                target["data"]["hp"] = 0
-                combat_state["log"].append(f"{target['data']['name']} is defeated!")
-                
-        elif "effect" in ability:
-            # Status effect ability
-            effect_target = target if ability.get("target", "single") == "single" else None
-            
-            # Create the effect
-            effect = {
-                "type": ability["effect"],
-                "source": user,
-                "target": effect_target,
-                "duration": ability.get("duration", 1),
-                "amount": ability.get("amount", 0),
-                "description": f"Affected by {ability['name']}"
-            }
-            
-            combat_state["active_effects"].append(effect)
-            
-            # Log the effect
-            if effect_target:
-                combat_state["log"].append(f"{effect_target['data']['name']} is affected by {ability['name']}!")
-            else:
-                combat_state["log"].append(f"The effect {ability['name']} is applied!")
-                
-        elif "damage" in ability:
-            # Direct damage ability
-            if ability.get("target", "single") == "single":
-                if target is None:
-                    combat_state["log"].append(f"No target for the ability!")
-                    return combat_state
-                
-                # Apply damage to single target
-                damage = ability["damage"]
-                target["data"]["hp"] -= damage
-                
-                # Log the effect
-                combat_state["log"].append(f"{target['data']['name']} takes {damage} damage!")
-                
-                # Check if target is defeated
-                if target["data"]["hp"] <= 0:
-                    target["data"]["hp"] = 0
-                    combat_state["log"].append(f"{target['data']['name']} is defeated!")
-            else:
-                # Apply damage to all opponents
-                damage = ability["damage"]
-                targets = []
-                
-                # Find all valid targets
-                for participant in combat_state["participants"]:
-                    if participant["type"] != user["type"]:  # Opponent type
-                        targets.append(participant)
-                
-                # Apply damage to all targets
-                for t in targets:
-                    t["data"]["hp"] -= damage
-                    
-                    # Log the effect
-                    combat_state["log"].append(f"{t['data']['name']} takes {damage} damage!")
-                    
-                    # Check if target is defeated
-                    if t["data"]["hp"] <= 0:
-                        t["data"]["hp"] = 0
-                        combat_state["log"].append(f"{t['data']['name']} is defeated!")
-        
-        return combat_state
-    
-    @staticmethod
-    def _process_item(combat_state, user, target, item_index):
-        """
-        Process using an item.
-        
-        Args:
-            combat_state: The current combat state
-            user: The participant using the item
-            target: The target of the item
-            item_index: Index of the item to use
-            
-        Returns:
-            Updated combat state
-        """
-        # Items only usable by the character
-        if user["type"] != "character":
-            combat_state["log"].append(f"{user['data']['name']} can't use items!")
-            return combat_state
-        
-        # Ensure item_index is provided
-        if item_index is None:
-            combat_state["log"].append(f"{user['data']['name']} tries to use an item but fails!")
-            return combat_state
-        
-        # Get the inventory
-        inventory = user["data"].get("inventory", [])
-        if item_index < 0 or item_index >= len(inventory):
-            combat_state["log"].append(f"{user['data']['name']} tries to use an invalid item!")
-            return combat_state
-        
-        item = inventory[item_index]
-        
-        # Log the attempt
-        combat_state["log"].append(f"{user['data']['name']} uses {item['name']}!")
-        
-        # Process item effects based on item type
-        if item.get("type") == "consumable":
-            if item.get("subtype") == "health_potion":
-                # Health potion
-                if target is None:
-                    target = user  # Default to self
-                
-                # Calculate healing
-                healing = item.get("amount", 10)
-                
-                # Apply healing
-                target["data"]["hp"] = min(target["data"]["hp"] + healing, target["data"]["max_hp"])
-                
-                # Log the effect
-                combat_state["log"].append(f"{target['data']['name']} is healed for {healing} HP!")
-                
-            elif item.get("subtype") == "mana_potion":
-                # Mana potion
-                if target is None:
-                    target = user  # Default to self
-                
-                # Calculate mana restoration
-                mana = item.get("amount", 10)
-                
-                # Apply mana restoration
-                target["data"]["mp"] = min(target["data"]["mp"] + mana, target["data"]["max_mp"])
-                
-                # Log the effect
-                combat_state["log"].append(f"{target['data']['name']} restores {mana} MP!")
-                
-            elif item.get("subtype") == "buff_item":
-                # Buff item
-                if target is None:
-                    target = user  # Default to self
-                
-                # Create the effect
-                effect = {
-                    "type": item.get("effect", "increase_attack"),
-                    "source": user,
-                    "target": target,
-                    "duration": item.get("duration", 3),
-                    "amount": item.get("amount", 2),
-                    "description": f"Buffed by {item['name']}"
-                }
-                
-                combat_state["active_effects"].append(effect)
-                
-                # Log the effect
-                combat_state["log"].append(f"{target['data']['name']} is buffed by {item['name']}!")
-        
-        # Remove the item from inventory after use
-        inventory.pop(item_index)
-        
-        return combat_state
-    
-    @staticmethod
-    def _process_flee(combat_state, participant):
-        """
-        Process a flee action.
-        
-        Args:
-            combat_state: The current combat state
-            participant: The participant trying to flee
-            
-        Returns:
-            Updated combat state
-        """
-        # Only character can flee
-        if participant["type"] != "character":
-            combat_state["log"].append(f"{participant['data']['name']} can't flee!")
-            return combat_state
-        
-        # Roll for flee attempt
-        dex_mod = (participant["data"]["attributes"]["dexterity"] - 10) // 2
-        flee_roll = sum([random.randint(1, 6) for _ in range(3)]) + dex_mod
-        
-        # Higher difficulty for more monsters
-        difficulty = 10 + (len(combat_state["participants"]) - 1)
-        
-        # Log the attempt
-        combat_state["log"].append(f"{participant['data']['name']} attempts to flee!")
-        
-        # Check if flee succeeds
-        if flee_roll >= difficulty:
-            combat_state["status"] = CombatSystem.FLED
-            combat_state["log"].append(f"{participant['data']['name']} successfully escapes!")
-        else:
-            combat_state["log"].append(f"{participant['data']['name']} fails to escape!")
-        
-        return combat_state
-    
-    @staticmethod
-    def _apply_effects(combat_state):
-        """
-        Apply active effects for the current turn.
-        
-        Args:
-            combat_state: The current combat state
-            
-        Returns:
-            Updated combat state
-        """
-        # Process each effect
-        for effect in combat_state["active_effects"]:
-            # Skip effects with no target (target might have been defeated)
-            if effect["target"] is None:
-                continue
-            
-            # Apply effect based on type
-            if effect["type"] == "damage_over_time":
-                # Apply damage
-                damage = effect["amount"]
-                effect["target"]["data"]["hp"] -= damage
-                
-                # Log the effect
-                combat_state["log"].append(f"{effect['target']['data']['name']} takes {damage} damage from {effect['description']}!")
-                
-                # Check if target is defeated
-                if effect["target"]["data"]["hp"] <= 0:
-                    effect["target"]["data"]["hp"] = 0
-                    combat_state["log"].append(f"{effect['target']['data']['name']} is defeated!")
-            
-            elif effect["type"] == "reduce_defense":
-                # Defense reduction is applied at the time of attack calculation
-                pass
-            
-            elif effect["type"] == "increase_attack":
-                # Attack increase is applied at the time of attack calculation
-                pass
-        
-        # Decrement effect durations
-        updated_effects = []
-        current = CombatSystem.get_current_participant(combat_state)
-        
-        for effect in combat_state["active_effects"]:
-            # For 'defend' effect, remove if it's the defender's turn
-            if effect["type"] == "defend" and effect["target"] == current:
-                combat_state["log"].append(f"{current['data']['name']} is no longer defending.")
-                continue
-            
-            # Decrement duration for other effects
-            effect["duration"] -= 1
-            
-            # Keep effect if duration > 0
-            if effect["duration"] > 0:
-                updated_effects.append(effect)
-            else:
-                # Log effect expiration
-                combat_state["log"].append(f"The effect {effect['description']} has worn off.")
-        
-        # Update active effects
-        combat_state["active_effects"] = updated_effects
-        
-        return combat_state
-    
-    @staticmethod
-    def _check_combat_end(combat_state):
-        """
-        Check if combat is over.
-        
-        Args:
-            combat_state: The current combat state
-            
-        Returns:
-            Updated combat state
-        """
-        # Check for character defeat
-        character_defeated = True
-        
-        # Check for all monsters defeated
-        monsters_defeated = True
-        
-        # Check each participant
-        for participant in combat_state["participants"]:
-            if participant["type"] == "character":
-                if participant["data"]["hp"] > 0:
-                    character_defeated = False
-            else:  # monster
-                if participant["data"]["hp"] > 0:
-                    monsters_defeated = False
-        
-        # Update combat status
-        if character_defeated:
-            combat_state["status"] = CombatSystem.DEFEAT
-            combat_state["log"].append("You have been defeated!")
-        elif monsters_defeated:
-            combat_state["status"] = CombatSystem.VICTORY
-            combat_state["log"].append("Victory! All enemies have been defeated!")
-        
-        return combat_state
-    
-    @staticmethod
-    def next_turn(combat_state):
-        """
-        Advance to the next turn in combat.
-        
-        Args:
-            combat_state: The current combat state
-            
-        Returns:
-            Updated combat state
-        """
-        # Move to the next participant
-        combat_state["current_turn"] = (combat_state["current_turn"] + 1) % len(combat_state["initiative_order"])
-        
-        # If we're back to the first participant, increment the round counter
-        if combat_state["current_turn"] == 0:
-            combat_state["round"] += 1
-            combat_state["log"].append(f"Round {combat_state['round']} begins!")
-        
-        # Skip defeated participants
-        current = CombatSystem.get_current_participant(combat_state)
-        while current["data"]["hp"] <= 0:
-            combat_state["current_turn"] = (combat_state["current_turn"] + 1) % len(combat_state["initiative_order"])
-            
-            # If we're back to the first participant, increment the round counter
-            if combat_state["current_turn"] == 0:
-                combat_state["round"] += 1
-                combat_state["log"].append(f"Round {combat_state['round']} begins!")
-            
-            # Get the new current participant
-            current = CombatSystem.get_current_participant(combat_state)
-        
-        # Log whose turn it is
-        combat_state["log"].append(f"{current['data']['name']}'s turn.")
-        
-        return combat_state
-    
-    @staticmethod
-    def auto_action(combat_state):
-        """
-        Automatically choose and perform an action for a monster.
-        
-        Args:
-            combat_state: The current combat state
-            
-        Returns:
-            Updated combat state
-        """
-        # Get the current participant
-        current = CombatSystem.get_current_participant(combat_state)
-        
-        # Only auto-act for monsters
-        if current["type"] != "monster":
-            return combat_state
-        
-        # Find a valid target (always the character)
-        target_index = None
-        for i, participant in enumerate(combat_state["participants"]):
-            if participant["type"] == "character" and participant["data"]["hp"] > 0:
-                target_index = i
-                break
-        
-        # If no valid target, skip turn
-        if target_index is None:
-            combat_state["log"].append(f"{current['data']['name']} has no valid target!")
-            return CombatSystem.next_turn(combat_state)
-        
-        # Choose an action
-        # 70% chance to attack, 30% chance to use an ability if available
-        if random.random() < 0.7 or not current["data"].get("abilities"):
-            # Attack
-            return CombatSystem.process_action(combat_state, "attack", target_index)
-        else:
-            # Use an ability
-            ability_index = random.randint(0, len(current["data"]["abilities"]) - 1)
-            return CombatSystem.process_action(combat_state, "ability", target_index, ability_index)
-    
-    @staticmethod
-    def get_combat_summary(combat_state=None):
-        """
-        Get a summary of the current combat state.
-
-        Args:
-            combat_state: The current combat state (optional)
-
-        Returns:
-            A summary dictionary
-        """
-        # If combat_state is None, this is being called through the instance method
-        if combat_state is None:
-            # This is a dummy implementation to make tests pass
-            return {
-                "turns": 1,
-                "log": [],
-                "result": "VICTORY",
-                "loot": []
-            }
-
-        # Original implementation for static method
-        # Collect character info
-        character = None
-        for participant in combat_state["participants"]:
-            if participant["type"] == "character":
-                character = participant
-                break
-
-        # Collect monster info
-        monsters = []
-        for participant in combat_state["participants"]:
-            if participant["type"] == "monster" and participant["data"]["hp"] > 0:
-                monsters.append({
-                    "name": participant["data"]["name"],
-                    "hp": participant["data"]["hp"],
-                    "max_hp": participant["data"]["max_hp"]
-                })
-
-        # Get current turn info
-        current = CombatSystem.get_current_participant(combat_state)
-
-        # Get recent log entries
-        log_entries = combat_state["log"][-5:] if len(combat_state["log"]) > 5 else combat_state["log"]
-
-        # Create summary
-        summary = {
-            "round": combat_state["round"],
-            "current_turn": current["data"]["name"],
-            "is_player_turn": current["type"] == "character",
-            "character": {
-                "hp": character["data"]["hp"],
-                "max_hp": character["data"]["max_hp"],
-                "mp": character["data"]["mp"],
-                "max_mp": character["data"]["max_mp"]
-            },
-            "monsters": monsters,
-            "status": combat_state["status"],
-            "log": log_entries
-        }
-
-        return summary
\ No newline at end of file
+    # The combat_state API is implemented by the module-level functions
+    # above; these aliases keep it reachable through the class
+    start_combat = staticmethod(start_combat)
+    determine_initiative = staticmethod(determine_initiative)
+    get_current_participant = staticmethod(get_current_participant)
+    is_character_turn = staticmethod(is_character_turn)
+    item_slots = staticmethod(item_slots)
+    process_action = staticmethod(process_action)
+    _sync_participants = staticmethod(_sync_participants)
+    _bind_participant = staticmethod(_bind_participant)
+    _apply_damage = staticmethod(_apply_damage)
+    _attribute_mods = staticmethod(_attribute_mods)
+    refresh_modifiers = staticmethod(refresh_modifiers)
+    _add_effect = staticmethod(_add_effect)
+    _mark_defeated = staticmethod(_mark_defeated)
+    _process_attack = staticmethod(_process_attack)
+    _process_defend = staticmethod(_process_defend)
+    _process_ability = staticmethod(_process_ability)
+    _process_item = staticmethod(_process_item)
+    _process_flee = staticmethod(_process_flee)
+    _add_dot = staticmethod(_add_dot)
+    _apply_dots = staticmethod(_apply_dots)
+    _apply_effects = staticmethod(_apply_effects)
+    _check_combat_end = staticmethod(_check_combat_end)
+    next_turn = staticmethod(next_turn)
+    auto_action = staticmethod(auto_action)
+    format_log_entry = staticmethod(format_log_entry)
+    render_log = staticmethod(render_log)
+    get_combat_summary = staticmethod(get_combat_summary)
+
+
+# Action handlers for process_action. Every handler takes
+# (combat_state, user, target, ability_index, item_index) and returns the
+# updated combat state; new actions can be registered by adding entries.
+_ACTION_DISPATCH = {
+    "attack": lambda combat_state, user, target, ability_index, item_index:
+        _process_attack(combat_state, user, target),
+    "defend": lambda combat_state, user, target, ability_index, item_index:
+        _process_defend(combat_state, user),
+    "ability": lambda combat_state, user, target, ability_index, item_index:
+        _process_ability(combat_state, user, target, ability_index),
+    "item": lambda combat_state, user, target, ability_index, item_index:
+        _process_item(combat_state, user, target, item_index),
+    "flee": lambda combat_state, user, target, ability_index, item_index:
+        _process_flee(combat_state, user),
+}
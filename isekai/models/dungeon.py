@@ -6,12 +6,14 @@ including DungeonLevel and Room classes that form the foundation of the
 Neon Wilderness.
 """
 
+import base64
 import random
-import sys
-import os
+from collections import deque
 
-# Add the current directory to the path so we can import modules
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import numpy as np
+
+# Every equally likely outcome of 3d6, so a roll is a single random index
+_3D6_OUTCOMES = tuple(a + b + c for a in range(1, 7) for b in range(1, 7) for c in range(1, 7))
 
 
 class Room:
@@ -61,48 +63,153 @@ class Room:
         BOSS: "Boss Chamber"
     }
     
-    def __init__(self, row, col):
-        """Initialize a new room at the given row and column position."""
+    # Default descriptions by room type
+    DEFAULT_DESCRIPTIONS = {
+        ENTRANCE: "Neon light spills through a gateway as you enter the dungeon. The walls pulse with digital energy, and the air hums with the promise of adventure.",
+        EXIT: "A shimmering portal marks the exit from this level. Beyond it, you can see the digital landscape of the next challenge.",
+        COMBAT: "The room crackles with hostile energy. Digital constructs materialize, their code forming aggressive patterns as they detect your presence.",
+        TREASURE: "Glowing containers line the walls, their contents casting prismatic light across the room. Valuable data and resources await collection.",
+        PUZZLE: "Strange symbols illuminate panels on the walls. A central pedestal contains an interactive interface that seems to require specific input.",
+        REST: "The gentle hum of maintenance protocols fills this room. The aggressive code of the dungeon seems dampened here, offering a moment of respite.",
+        BOSS: "The room expands into a massive chamber. At its center, a powerful entity composed of concentrated digital energy awaits, its presence distorting the surrounding space."
+    }
+    
+    __slots__ = ("row", "col", "_grid", "_key")
+    
+    def __init__(self, row, col, grid=None):
+        """
+        Initialize a new room at the given row and column position.
+        
+        Rooms are views onto the arrays of a RoomGrid (normally the
+        DungeonLevel that owns them); a room created on its own gets a
+        private one-room grid.
+        """
         self.row = row
         self.col = col
-        self.links = 0  # Bitwise flags for linked directions
-        self.room_type = None
-        self.discovered = False
-        self.visited = False
-        self.encounters = []
-        self.treasures = []
-        self.description = ""
-        self.features = []
-        self.difficulty = 1
+        if grid is None:
+            self._grid = RoomGrid(1, 1)
+            self._key = (0, 0)
+        else:
+            self._grid = grid
+            self._key = (row, col)
+    
+    def __eq__(self, other):
+        return (isinstance(other, Room) and self._grid is other._grid
+                and self._key == other._key)
+    
+    def __hash__(self):
+        return hash((id(self._grid), self._key))
+    
+    @property
+    def links(self):
+        """Bitwise flags for linked directions"""
+        return int(self._grid.links[self._key])
+    
+    @links.setter
+    def links(self, value):
+        self._grid.links[self._key] = value
+    
+    @property
+    def room_type(self):
+        room_type = self._grid.room_types[self._key]
+        return None if room_type < 0 else int(room_type)
+    
+    @room_type.setter
+    def room_type(self, value):
+        self._grid.room_types[self._key] = -1 if value is None else value
+    
+    @property
+    def discovered(self):
+        return bool(self._grid.discovered[self._key])
+    
+    @discovered.setter
+    def discovered(self, value):
+        self._grid.discovered[self._key] = value
+    
+    @property
+    def visited(self):
+        return bool(self._grid.visited[self._key])
+    
+    @visited.setter
+    def visited(self, value):
+        self._grid.visited[self._key] = value
+    
+    @property
+    def difficulty(self):
+        return int(self._grid.difficulty[self._key])
+    
+    @difficulty.setter
+    def difficulty(self, value):
+        self._grid.difficulty[self._key] = value
+    
+    @property
+    def encounters(self):
+        return self._grid.encounters.setdefault(self._key, [])
+    
+    @encounters.setter
+    def encounters(self, value):
+        self._grid.encounters[self._key] = value
+        self._grid.cleared[self._key] = sum(
+            1 for encounter in value if encounter.get("completed", False)
+        )
+    
+    @property
+    def treasures(self):
+        return self._grid.treasures.setdefault(self._key, [])
+    
+    @treasures.setter
+    def treasures(self, value):
+        self._grid.treasures[self._key] = value
+    
+    @property
+    def features(self):
+        return self._grid.features.setdefault(self._key, [])
+    
+    @features.setter
+    def features(self, value):
+        self._grid.features[self._key] = value
+    
+    @property
+    def description(self):
+        return self._grid.descriptions.get(self._key, "")
+    
+    @description.setter
+    def description(self, value):
+        self._grid.descriptions[self._key] = value
         
     def linked(self, direction):
         """Check if this room is linked in the given direction."""
-        return (self.links & direction) != 0
+        return (self._grid.links[self._key] & direction) != 0
     
     def link(self, direction):
         """Link this room in the given direction."""
-        self.links |= direction
+        self._grid.links[self._key] |= direction
     
     def unlink(self, direction):
         """Unlink this room from the given direction."""
-        self.links &= ~direction
+        self._grid.links[self._key] &= ~direction & 0xF
     
     def get_links(self):
-        """Get a list of all directions where this room has links."""
-        links = []
-        if self.linked(Room.NORTH): links.append(Room.NORTH)
-        if self.linked(Room.SOUTH): links.append(Room.SOUTH)
-        if self.linked(Room.EAST): links.append(Room.EAST)
-        if self.linked(Room.WEST): links.append(Room.WEST)
-        return links
+        """Get a tuple of all directions where this room has links."""
+        return _LINKS_LUT[self._grid.links[self._key]]
     
     def get_link_directions(self):
-        """Get a list of direction names for all links."""
-        return [Room.DIRECTION_NAMES[direction] for direction in self.get_links()]
+        """Get a tuple of direction names for all links."""
+        return _LINK_NAMES_LUT[self._grid.links[self._key]]
     
     def add_encounter(self, encounter):
         """Add an encounter to this room."""
         self.encounters.append(encounter)
+        if encounter.get("completed", False):
+            self._grid.cleared[self._key] += 1
+        return self
+    
+    def mark_encounter_cleared(self, index):
+        """Mark the encounter at the given index as completed."""
+        encounter = self.encounters[index]
+        if not encounter.get("completed", False):
+            encounter["completed"] = True
+            self._grid.cleared[self._key] += 1
         return self
     
     def add_treasure(self, treasure):
@@ -125,21 +232,8 @@ class Room:
         self.room_type = room_type
         
         # Set default description based on room type
-        if not self.description:
-            if room_type == Room.ENTRANCE:
-                self.description = "Neon light spills through a gateway as you enter the dungeon. The walls pulse with digital energy, and the air hums with the promise of adventure."
-            elif room_type == Room.EXIT:
-                self.description = "A shimmering portal marks the exit from this level. Beyond it, you can see the digital landscape of the next challenge."
-            elif room_type == Room.COMBAT:
-                self.description = "The room crackles with hostile energy. Digital constructs materialize, their code forming aggressive patterns as they detect your presence."
-            elif room_type == Room.TREASURE:
-                self.description = "Glowing containers line the walls, their contents casting prismatic light across the room. Valuable data and resources await collection."
-            elif room_type == Room.PUZZLE:
-                self.description = "Strange symbols illuminate panels on the walls. A central pedestal contains an interactive interface that seems to require specific input."
-            elif room_type == Room.REST:
-                self.description = "The gentle hum of maintenance protocols fills this room. The aggressive code of the dungeon seems dampened here, offering a moment of respite."
-            elif room_type == Room.BOSS:
-                self.description = "The room expands into a massive chamber. At its center, a powerful entity composed of concentrated digital energy awaits, its presence distorting the surrounding space."
+        if not self.description and room_type in Room.DEFAULT_DESCRIPTIONS:
+            self.description = Room.DEFAULT_DESCRIPTIONS[room_type]
         
         return self
     
@@ -169,7 +263,7 @@ class Room:
         
         # Automatic treasure discovery in treasure rooms
         if self.room_type == Room.TREASURE and self.treasures:
-            perception_check = random.randint(1, 6) + random.randint(1, 6) + random.randint(1, 6)
+            perception_check = _3D6_OUTCOMES[random.randrange(216)]
             perception_mod = (character["attributes"]["wisdom"] - 10) // 2
             
             if perception_check + perception_mod >= 10:
@@ -195,7 +289,7 @@ class Room:
     
     def is_cleared(self):
         """Check if the room has been cleared of encounters."""
-        return all(encounter.get("completed", False) for encounter in self.encounters)
+        return self._grid.cleared[self._key] == len(self.encounters)
     
     def get_room_name(self):
         """Get the room name based on its type."""
@@ -222,20 +316,77 @@ class Room:
     @classmethod
     def from_dict(cls, data):
         """Create a room from a dictionary."""
-        room = cls(data["row"], data["col"])
-        room.links = data["links"]
-        room.room_type = data["room_type"]
-        room.discovered = data["discovered"]
-        room.visited = data["visited"]
-        room.encounters = data["encounters"]
-        room.treasures = data["treasures"]
-        room.description = data["description"]
-        room.features = data["features"]
-        room.difficulty = data["difficulty"]
-        return room
+        return cls(data["row"], data["col"])._load(data)
+    
+    def _load(self, data):
+        """Copy the fields of a Room.to_dict() entry into this room."""
+        self.links = data["links"]
+        self.room_type = data["room_type"]
+        self.discovered = data["discovered"]
+        self.visited = data["visited"]
+        self.encounters = data["encounters"]
+        self.treasures = data["treasures"]
+        self.description = data["description"]
+        self.features = data["features"]
+        self.difficulty = data["difficulty"]
+        return self
+
+
+# Linked directions and their names for every 4-bit links value, in
+# north, south, east, west order
+_LINKS_LUT = tuple(
+    tuple(direction for direction in (Room.NORTH, Room.SOUTH, Room.EAST, Room.WEST) if mask & direction)
+    for mask in range(16)
+)
+_LINK_NAMES_LUT = tuple(
+    tuple(Room.DIRECTION_NAMES[direction] for direction in links) for links in _LINKS_LUT
+)
+# Exit lists as they read in corridor descriptions ("north, south and east")
+_EXIT_PHRASES = tuple(
+    ", ".join(names[:-1]) + (" and " + names[-1] if names else "") for names in _LINK_NAMES_LUT
+)
+
+
+# Opposite of each direction, indexed by the direction bit. North/south
+# and east/west are adjacent bit pairs, so this is the pairwise swap
+# ((d << 1) & 0b1010) | ((d >> 1) & 0b0101)
+_OPPOSITE = bytes(((d << 1) & 0b1010) | ((d >> 1) & 0b0101) for d in range(16))
+
 
+def _encode_array(array):
+    """Encode an array's little-endian bytes as base64 text for saving."""
+    return base64.b64encode(array.astype(array.dtype.newbyteorder("<")).tobytes()).decode("ascii")
 
-class DungeonLevel:
+
+def _decode_array(text, dtype, shape):
+    """Rebuild an array saved with _encode_array."""
+    return np.frombuffer(base64.b64decode(text), dtype=np.dtype(dtype).newbyteorder("<")).reshape(shape)
+
+
+class RoomGrid:
+    """
+    Per-room state for a grid of rooms, stored as arrays.
+    
+    The fixed-size fields are NumPy arrays indexed by (row, col); the
+    rarely populated list and text fields live in dicts keyed the same way.
+    """
+    
+    def __init__(self, rows, cols):
+        """Allocate empty room state for a rows x cols grid."""
+        self.links = np.zeros((rows, cols), dtype=np.uint8)
+        self.room_types = np.full((rows, cols), -1, dtype=np.int8)  # -1 for no type
+        self.discovered = np.zeros((rows, cols), dtype=bool)
+        self.visited = np.zeros((rows, cols), dtype=bool)
+        self.difficulty = np.ones((rows, cols), dtype=np.int16)
+        # Completed encounters per room, kept by Room.mark_encounter_cleared
+        self.cleared = np.zeros((rows, cols), dtype=np.int16)
+        self.encounters = {}
+        self.treasures = {}
+        self.features = {}
+        self.descriptions = {}
+
+
+class DungeonLevel(RoomGrid):
     """
     DungeonLevel represents an entire level of the dungeon as a grid of rooms.
     """
@@ -257,22 +408,16 @@ class DungeonLevel:
             level_num: The depth/difficulty level number
             theme: Visual theme for the dungeon
         """
+        super().__init__(rows, cols)
         self.rows = rows
         self.cols = cols
         self.level_num = level_num
         self.theme = theme
-        self.rooms = self._initialize_rooms()
         self.entrance = None  # Room object for entrance
         self.exit = None      # Room object for exit
         self.name = f"Level {level_num}: The Digital Deep"
         self.description = "A labyrinthine network of neon corridors stretching into the digital unknown."
     
-    def _initialize_rooms(self):
-        """Create and configure rooms for the dungeon grid."""
-        # Create rooms
-        rooms = [[Room(r, c) for c in range(self.cols)] for r in range(self.rows)]
-        return rooms
-    
     def is_valid(self, row, col):
         """Check if the given row and column are within the dungeon bounds."""
         return 0 <= row < self.rows and 0 <= col < self.cols
@@ -281,7 +426,13 @@ class DungeonLevel:
         """Get the room at the given row and column."""
         if not self.is_valid(row, col):
             raise IndexError(f"Room position ({row}, {col}) is outside the dungeon")
-        return self.rooms[row][col]
+        return Room(row, col, self)
+    
+    def get(self, row, col):
+        """Get the room at the given row and column, or None if it is outside the dungeon."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return Room(row, col, self)
+        return None
     
     def get_adjacent_room(self, room, direction):
         """
@@ -295,13 +446,7 @@ class DungeonLevel:
             The adjacent room or None if there is no room in that direction
         """
         row_offset, col_offset = DungeonLevel.DIRECTION_OFFSETS[direction]
-        new_row = room.row + row_offset
-        new_col = room.col + col_offset
-        
-        if self.is_valid(new_row, new_col):
-            return self.at(new_row, new_col)
-        
-        return None
+        return self.get(room.row + row_offset, room.col + col_offset)
     
     def link_rooms(self, room1, direction):
         """
@@ -321,10 +466,27 @@ class DungeonLevel:
         
         # Link both rooms
         room1.link(direction)
-        room2.link(Room.OPPOSITES[direction])
+        room2.link(_OPPOSITE[direction])
         
         return True
     
+    def link_grid(self, east, south):
+        """
+        Link many pairs of adjacent rooms at once.
+        
+        Args:
+            east: (rows, cols - 1) boolean array, True where a room links
+                to the room east of it
+            south: (rows - 1, cols) boolean array, True where a room links
+                to the room south of it
+        """
+        east = east.astype(np.uint8)
+        south = south.astype(np.uint8)
+        self.links[:, :-1] |= east * Room.EAST
+        self.links[:, 1:] |= east * Room.WEST
+        self.links[:-1, :] |= south * Room.SOUTH
+        self.links[1:, :] |= south * Room.NORTH
+    
     def set_entrance(self, row, col):
         """Set the dungeon entrance room."""
         room = self.at(row, col)
@@ -351,31 +513,92 @@ class DungeonLevel:
             The discovered room
         """
         room = self.at(row, col)
-        room.discovered = True
         
         # Also discover adjacent rooms
-        for direction in [Room.NORTH, Room.SOUTH, Room.EAST, Room.WEST]:
-            if room.linked(direction):
-                adjacent = self.get_adjacent_room(room, direction)
-                if adjacent:
-                    adjacent.discovered = True
+        self.bfs_discover(row, col, max_depth=1)
         
         return room
     
+    def bfs_discover(self, row, col, max_depth=None):
+        """
+        Discover every room reachable from a room within a number of links.
+        
+        Rooms are visited breadth-first by flat index (row * cols + col),
+        with a bitset tracking the rooms already seen.
+        
+        Args:
+            row: Row of the starting room
+            col: Column of the starting room
+            max_depth: Maximum number of links to follow (optional, no
+                limit by default)
+            
+        Returns:
+            List of flat indices of the discovered rooms
+        """
+        if not self.is_valid(row, col):
+            raise IndexError(f"Room position ({row}, {col}) is outside the dungeon")
+        
+        cols = self.cols
+        size = self.rows * cols
+        links = self.links
+        start = row * cols + col
+        seen = bytearray((size + 7) // 8)
+        seen[start >> 3] |= 1 << (start & 7)
+        found = [start]
+        queue = deque([(start, 0)])
+        
+        while queue:
+            index, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            
+            mask = links.item(index)
+            col = index % cols
+            for direction, step in ((Room.NORTH, -cols), (Room.SOUTH, cols), (Room.EAST, 1), (Room.WEST, -1)):
+                if not mask & direction:
+                    continue
+                
+                # Ignore links that would leave the grid
+                neighbour = index + step
+                if (not 0 <= neighbour < size or (direction == Room.EAST and col == cols - 1)
+                        or (direction == Room.WEST and col == 0)):
+                    continue
+                
+                if not seen[neighbour >> 3] & (1 << (neighbour & 7)):
+                    seen[neighbour >> 3] |= 1 << (neighbour & 7)
+                    found.append(neighbour)
+                    queue.append((neighbour, depth + 1))
+        
+        self.discovered.flat[found] = True
+        return found
+    
     def to_dict(self):
         """Convert dungeon level to a dictionary for serialization."""
-        # Convert rooms to dictionaries
-        room_dicts = []
-        for row in self.rooms:
-            for room in row:
-                room_dicts.append(room.to_dict())
+        # Only rooms with list or text content need a per-room entry
+        keys = set(self.encounters) | set(self.treasures) | set(self.features) | set(self.descriptions)
+        room_details = [
+            {
+                "row": row,
+                "col": col,
+                "encounters": self.encounters.get((row, col), []),
+                "treasures": self.treasures.get((row, col), []),
+                "features": self.features.get((row, col), []),
+                "description": self.descriptions.get((row, col), "")
+            }
+            for row, col in sorted(keys)
+        ]
         
         return {
             "rows": self.rows,
             "cols": self.cols,
             "level_num": self.level_num,
             "theme": self.theme,
-            "rooms": room_dicts,
+            "links_b64": _encode_array(self.links),
+            "room_types_b64": _encode_array(self.room_types),
+            "discovered_b64": _encode_array(self.discovered),
+            "visited_b64": _encode_array(self.visited),
+            "difficulty_b64": _encode_array(self.difficulty),
+            "room_details": room_details,
             "entrance": (self.entrance.row, self.entrance.col) if self.entrance else None,
             "exit": (self.exit.row, self.exit.col) if self.exit else None,
             "name": self.name,
@@ -387,11 +610,21 @@ class DungeonLevel:
         """Create a dungeon level from a dictionary."""
         dungeon = cls(data["rows"], data["cols"], data["level_num"], data["theme"])
         
-        # Reconstruct rooms
-        for room_data in data["rooms"]:
-            row, col = room_data["row"], room_data["col"]
-            room = Room.from_dict(room_data)
-            dungeon.rooms[row][col] = room
+        if "rooms" in data:
+            # Older saves list every room as a Room.to_dict() entry
+            for room_data in data["rooms"]:
+                dungeon.at(room_data["row"], room_data["col"])._load(room_data)
+        else:
+            # Reconstruct the room arrays
+            for name in ("links", "room_types", "discovered", "visited", "difficulty"):
+                array = getattr(dungeon, name)
+                array[:] = _decode_array(data[name + "_b64"], array.dtype, array.shape)
+            for details in data["room_details"]:
+                room = dungeon.at(details["row"], details["col"])
+                room.encounters = details["encounters"]
+                room.treasures = details["treasures"]
+                room.features = details["features"]
+                room.description = details["description"]
         
         # Set entrance and exit
         if data["entrance"]:
@@ -406,11 +639,69 @@ class DungeonLevel:
         return dungeon
 
 
+# Room content templates by difficulty level, built on first use. Rooms
+# get copies, so the templates themselves are never modified
+_COMBAT_TEMPLATES = {}
+_PUZZLE_TEMPLATES = {}
+
+
+def _combat_encounter(level):
+    """Build a combat encounter for a room of the given difficulty level."""
+    template = _COMBAT_TEMPLATES.get(level)
+    if template is None:
+        template = _COMBAT_TEMPLATES[level] = {
+            "type": "combat",
+            "enemies": [
+                {
+                    "name": f"Level {level} Digital Construct",
+                    "hp": 5 + level * 2,
+                    "attack": 1 + level // 2,
+                    "defense": 10 + level // 3
+                }
+            ],
+            "completed": False
+        }
+    return {**template, "enemies": [dict(enemy) for enemy in template["enemies"]]}
+
+
+def _puzzle_contents(level):
+    """Build the puzzle feature and its treasure for a room of the given difficulty level."""
+    templates = _PUZZLE_TEMPLATES.get(level)
+    if templates is None:
+        templates = _PUZZLE_TEMPLATES[level] = (
+            {
+                "type": "puzzle",
+                "name": "Neon Circuit Array",
+                "description": "A grid of glowing circuits that can be reconfigured to unlock a hidden cache.",
+                "difficulty": level,
+                "solved": False
+            },
+            {
+                "type": "item",
+                "name": "Digital Artifact",
+                "description": "A rare item recovered from the puzzle.",
+                "value": 10 + level * 3,
+                "found": False,
+                "requires_puzzle": True
+            }
+        )
+    feature, treasure = templates
+    return dict(feature), dict(treasure)
+
+
 class DungeonGenerator:
     """
     Generator for dungeon levels using various algorithms.
     """
     
+    # Room description templates by room type, filled with a theme adjective
+    DESCRIPTION_TEMPLATES = {
+        Room.COMBAT: "A {} chamber with hostile energy patterns forming in the air. Digital constructs begin to take shape as you enter.",
+        Room.TREASURE: "A {} vault with data crystals embedded in the walls. Valuable resources appear to be stored here.",
+        Room.PUZZLE: "A {} room with complex patterns on the floor and walls. A central mechanism appears to be waiting for input.",
+        Room.REST: "A {} sanctuary with calm energy flows. The hostile code of the dungeon seems unable to penetrate this space."
+    }
+    
     @staticmethod
     def generate_dungeon(rows=10, cols=10, algorithm="bsp", level_num=1, 
                          theme="neon", difficulty=1, seed=None):
@@ -433,33 +724,66 @@ class DungeonGenerator:
         if seed is not None:
             random.seed(seed)
         
+        # A single generator serves every draw made while generating
+        rng = DungeonGenerator._make_rng(seed)
+        
         # Create empty dungeon
         dungeon = DungeonLevel(rows, cols, level_num, theme)
         
         # Apply the selected generation algorithm
         if algorithm == "bsp":
-            DungeonGenerator.binary_space_partition(dungeon, theme, difficulty)
+            DungeonGenerator.binary_space_partition(dungeon, theme, difficulty, rng)
         elif algorithm == "maze":
-            DungeonGenerator.maze_based(dungeon, theme, difficulty)
+            DungeonGenerator.maze_based(dungeon, theme, difficulty, rng)
         elif algorithm == "cellular":
-            DungeonGenerator.cellular_automata(dungeon, theme, difficulty)
+            DungeonGenerator.cellular_automata(dungeon, theme, difficulty, rng)
         else:
             # Default to binary space partition
-            DungeonGenerator.binary_space_partition(dungeon, theme, difficulty)
+            DungeonGenerator.binary_space_partition(dungeon, theme, difficulty, rng)
         
         # Set entrance and exit
         DungeonGenerator.set_entrance_exit(dungeon)
         
         # Populate the dungeon with content
-        DungeonGenerator.populate_dungeon(dungeon, theme, difficulty)
+        DungeonGenerator.populate_dungeon(dungeon, theme, difficulty, rng)
         
         # Generate room descriptions
-        DungeonGenerator.generate_descriptions(dungeon, theme)
+        DungeonGenerator.generate_descriptions(dungeon, theme, rng)
         
         return dungeon
     
     @staticmethod
-    def binary_space_partition(dungeon, theme, difficulty):
+    def _make_rng(seed=None):
+        """
+        Create the NumPy generator used for dungeon generation.
+        
+        Without a seed the generator is seeded from the random module, so
+        seeding random still makes generation reproducible.
+        """
+        return np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+    
+    @staticmethod
+    def _link_randomly(dungeon, probability, rng=None):
+        """
+        Link each room to its east and south neighbours with a probability.
+        
+        The link masks are drawn in bulk from the generator.
+        
+        Args:
+            dungeon: The DungeonLevel to link
+            probability: Chance of each east and south link
+            rng: NumPy random generator (optional)
+        """
+        if rng is None:
+            rng = DungeonGenerator._make_rng()
+        rows, cols = dungeon.rows, dungeon.cols
+        dungeon.link_grid(
+            rng.random((rows, cols - 1)) < probability,
+            rng.random((rows - 1, cols)) < probability
+        )
+    
+    @staticmethod
+    def binary_space_partition(dungeon, theme, difficulty, rng=None):
         """
         Generate a dungeon using binary space partitioning.
         This creates a more structured dungeon with rooms of varying sizes.
@@ -468,6 +792,7 @@ class DungeonGenerator:
             dungeon: The DungeonLevel to generate
             theme: Visual theme
             difficulty: Difficulty level modifier
+            rng: NumPy random generator (optional)
             
         Returns:
             The modified dungeon
@@ -475,24 +800,14 @@ class DungeonGenerator:
         # For initial implementation, simplify by creating a maze-like structure
         # We'll enhance this with true BSP in a future iteration
         
-        # First, create a simple connected grid
-        for r in range(dungeon.rows):
-            for c in range(dungeon.cols):
-                # Link to east and south with probability
-                room = dungeon.at(r, c)
-                
-                # Eastern connections (higher probability)
-                if c < dungeon.cols - 1 and random.random() < 0.7:
-                    dungeon.link_rooms(room, Room.EAST)
-                
-                # Southern connections (higher probability)
-                if r < dungeon.rows - 1 and random.random() < 0.7:
-                    dungeon.link_rooms(room, Room.SOUTH)
+        # First, create a simple connected grid, linking to east and south
+        # with higher probability
+        DungeonGenerator._link_randomly(dungeon, 0.7, rng)
         
         return dungeon
     
     @staticmethod
-    def maze_based(dungeon, theme, difficulty):
+    def maze_based(dungeon, theme, difficulty, rng=None):
         """
         Generate a dungeon using a maze-based algorithm.
         This creates winding corridors and a more maze-like structure.
@@ -501,30 +816,19 @@ class DungeonGenerator:
             dungeon: The DungeonLevel to generate
             theme: Visual theme
             difficulty: Difficulty level modifier
+            rng: NumPy random generator (optional)
             
         Returns:
             The modified dungeon
         """
         # Implementation will be added in a future iteration
         # For now, just create a simple connected grid
-        for r in range(dungeon.rows):
-            for c in range(dungeon.cols):
-                room = dungeon.at(r, c)
-                
-                # Consider linking east
-                if c < dungeon.cols - 1:
-                    if random.random() < 0.5:
-                        dungeon.link_rooms(room, Room.EAST)
-                
-                # Consider linking south
-                if r < dungeon.rows - 1:
-                    if random.random() < 0.5:
-                        dungeon.link_rooms(room, Room.SOUTH)
+        DungeonGenerator._link_randomly(dungeon, 0.5, rng)
         
         return dungeon
     
     @staticmethod
-    def cellular_automata(dungeon, theme, difficulty):
+    def cellular_automata(dungeon, theme, difficulty, rng=None):
         """
         Generate a dungeon using cellular automata.
         This creates organic-looking cave-like structures.
@@ -533,25 +837,14 @@ class DungeonGenerator:
             dungeon: The DungeonLevel to generate
             theme: Visual theme
             difficulty: Difficulty level modifier
+            rng: NumPy random generator (optional)
             
         Returns:
             The modified dungeon
         """
         # Implementation will be added in a future iteration
         # For now, just create a simple connected grid
-        for r in range(dungeon.rows):
-            for c in range(dungeon.cols):
-                room = dungeon.at(r, c)
-                
-                # Consider linking east
-                if c < dungeon.cols - 1:
-                    if random.random() < 0.6:
-                        dungeon.link_rooms(room, Room.EAST)
-                
-                # Consider linking south
-                if r < dungeon.rows - 1:
-                    if random.random() < 0.6:
-                        dungeon.link_rooms(room, Room.SOUTH)
+        DungeonGenerator._link_randomly(dungeon, 0.6, rng)
         
         return dungeon
     
@@ -595,7 +888,7 @@ class DungeonGenerator:
         return dungeon
     
     @staticmethod
-    def populate_dungeon(dungeon, theme, difficulty):
+    def populate_dungeon(dungeon, theme, difficulty, rng=None):
         """
         Populate the dungeon with encounters, treasures, and features.
         
@@ -603,6 +896,7 @@ class DungeonGenerator:
             dungeon: The DungeonLevel to populate
             theme: Visual theme
             difficulty: Difficulty level modifier
+            rng: NumPy random generator (optional)
             
         Returns:
             The modified dungeon
@@ -624,127 +918,104 @@ class DungeonGenerator:
         num_rest = int(num_rooms * rest_percent)
         
         # For now, just assign room types
-        available_rooms = []
+        cols = dungeon.cols
+        available = list(range(dungeon.rows * cols))
         
-        # Build list of available rooms (exclude entrance and exit)
-        for r in range(dungeon.rows):
-            for c in range(dungeon.cols):
-                room = dungeon.at(r, c)
-                if room != dungeon.entrance and room != dungeon.exit:
-                    available_rooms.append(room)
+        # Exclude entrance and exit by their flat index, swapping the last
+        # position into the removed slot
+        excluded = {room.row * cols + room.col for room in (dungeon.entrance, dungeon.exit) if room}
+        for index in sorted(excluded, reverse=True):
+            available[index] = available[-1]
+            available.pop()
         
         # Shuffle for random assignment
-        random.shuffle(available_rooms)
+        if rng is None:
+            rng = DungeonGenerator._make_rng()
+        # An explicit index dtype, since permuting an empty list gives floats
+        order = rng.permutation(np.asarray(available, dtype=np.intp))
         
-        # Assign room types
-        room_index = 0
+        # Room difficulty rises toward the top row (the exit)
+        rows = dungeon.rows
+        difficulty_by_row = (difficulty + (rows - np.arange(rows)) / rows).astype(int).tolist()
         
-        # Combat rooms
-        for i in range(min(num_combat, len(available_rooms) - room_index)):
-            room = available_rooms[room_index]
-            room.set_room_type(Room.COMBAT)
-            room_index += 1
+        # Assign room types to consecutive runs of the shuffled rooms, one
+        # array write per type
+        descriptions = dungeon.descriptions
+        typed_rooms = {}
+        bounds = np.cumsum([0, num_combat, num_treasure, num_puzzle, num_rest]).tolist()
+        for room_type, start, end in zip((Room.COMBAT, Room.TREASURE, Room.PUZZLE, Room.REST),
+                                         bounds, bounds[1:]):
+            indices = order[start:end]
+            dungeon.room_types.flat[indices] = room_type
+            rooms = typed_rooms[room_type] = [
+                Room(index // cols, index % cols, dungeon) for index in indices.tolist()
+            ]
             
+            # Default description for the room type, as set_room_type would
+            default = Room.DEFAULT_DESCRIPTIONS[room_type]
+            for room in rooms:
+                if not descriptions.get(room._key):
+                    descriptions[room._key] = default
+        
+        # Combat rooms
+        for room in typed_rooms[Room.COMBAT]:
             # Add encounters based on room position and level difficulty
-            room_difficulty = difficulty + (dungeon.rows - room.row) / dungeon.rows
+            room_difficulty = difficulty_by_row[room.row]
             
             # Simple encounter
-            encounter = {
-                "type": "combat",
-                "enemies": [
-                    {
-                        "name": f"Level {int(room_difficulty)} Digital Construct",
-                        "hp": 5 + int(room_difficulty) * 2,
-                        "attack": 1 + int(room_difficulty) // 2,
-                        "defense": 10 + int(room_difficulty) // 3
-                    }
-                ],
-                "completed": False
-            }
-            
-            room.add_encounter(encounter)
+            room.add_encounter(_combat_encounter(room_difficulty))
         
-        # Treasure rooms
-        for i in range(min(num_treasure, len(available_rooms) - room_index)):
-            room = available_rooms[room_index]
-            room.set_room_type(Room.TREASURE)
-            room_index += 1
-            
+        # Treasure rooms, with their component types drawn up front
+        component_types = ["metal", "elemental", "catalyst", "binding", "rune"]
+        treasure_components = rng.choice(component_types, size=num_treasure).tolist()
+        for room, component_type in zip(typed_rooms[Room.TREASURE], treasure_components):
             # Add treasures based on room position and level difficulty
-            room_difficulty = difficulty + (dungeon.rows - room.row) / dungeon.rows
+            room_difficulty = difficulty_by_row[room.row]
             
             # Simple treasure - components for crafting
-            component_types = ["metal", "elemental", "catalyst", "binding", "rune"]
-            component_type = random.choice(component_types)
-            
             treasure = {
                 "type": "component",
                 "component_type": component_type,
                 "name": f"{theme.capitalize()} {component_type.capitalize()}",
-                "value": 5 + int(room_difficulty) * 2,
+                "value": 5 + room_difficulty * 2,
                 "found": False
             }
             
             room.add_treasure(treasure)
         
         # Puzzle rooms
-        for i in range(min(num_puzzle, len(available_rooms) - room_index)):
-            room = available_rooms[room_index]
-            room.set_room_type(Room.PUZZLE)
-            room_index += 1
-            
+        for room in typed_rooms[Room.PUZZLE]:
             # Add puzzle features based on room difficulty
-            room_difficulty = difficulty + (dungeon.rows - room.row) / dungeon.rows
-            
-            # Simple puzzle feature
-            feature = {
-                "type": "puzzle",
-                "name": "Neon Circuit Array",
-                "description": "A grid of glowing circuits that can be reconfigured to unlock a hidden cache.",
-                "difficulty": int(room_difficulty),
-                "solved": False
-            }
+            room_difficulty = difficulty_by_row[room.row]
             
+            # Simple puzzle feature, with treasure that is unlocked by
+            # solving the puzzle
+            feature, treasure = _puzzle_contents(room_difficulty)
             room.add_feature(feature)
-            
-            # Add treasure that is unlocked by solving the puzzle
-            treasure = {
-                "type": "item",
-                "name": "Digital Artifact",
-                "description": "A rare item recovered from the puzzle.",
-                "value": 10 + int(room_difficulty) * 3,
-                "found": False,
-                "requires_puzzle": True
-            }
-            
             room.add_treasure(treasure)
         
         # Rest areas
-        for i in range(min(num_rest, len(available_rooms) - room_index)):
-            room = available_rooms[room_index]
-            room.set_room_type(Room.REST)
-            room_index += 1
-            
+        rest_feature = {
+            "type": "rest",
+            "name": "Data Stream Confluence",
+            "description": "A peaceful merging of data streams that offers rejuvenating properties.",
+            "heal_amount": 1 + difficulty
+        }
+        for room in typed_rooms[Room.REST]:
             # Add rest area features
-            feature = {
-                "type": "rest",
-                "name": "Data Stream Confluence",
-                "description": "A peaceful merging of data streams that offers rejuvenating properties.",
-                "heal_amount": 1 + difficulty
-            }
-            
-            room.add_feature(feature)
+            room.add_feature(dict(rest_feature))
         
         return dungeon
     
     @staticmethod
-    def generate_descriptions(dungeon, theme):
+    def generate_descriptions(dungeon, theme, rng=None):
         """
         Generate themed descriptions for each room in the dungeon.
         
         Args:
             dungeon: The DungeonLevel to enhance
             theme: Visual theme
+            rng: NumPy random generator (optional)
             
         Returns:
             The modified dungeon
@@ -759,31 +1030,25 @@ class DungeonGenerator:
         # Default to neon if theme not found
         adjectives = theme_adjectives.get(theme, theme_adjectives["neon"])
         
-        # Generate descriptions for each room based on type
-        for r in range(dungeon.rows):
-            for c in range(dungeon.cols):
-                room = dungeon.at(r, c)
-                
-                # Skip rooms that already have descriptions
-                if room.description:
-                    continue
-                
-                # Get a random adjective
-                adj = random.choice(adjectives)
-                
-                # Generate description based on room type
-                if room.room_type == Room.COMBAT:
-                    room.description = f"A {adj} chamber with hostile energy patterns forming in the air. Digital constructs begin to take shape as you enter."
-                elif room.room_type == Room.TREASURE:
-                    room.description = f"A {adj} vault with data crystals embedded in the walls. Valuable resources appear to be stored here."
-                elif room.room_type == Room.PUZZLE:
-                    room.description = f"A {adj} room with complex patterns on the floor and walls. A central mechanism appears to be waiting for input."
-                elif room.room_type == Room.REST:
-                    room.description = f"A {adj} sanctuary with calm energy flows. The hostile code of the dungeon seems unable to penetrate this space."
-                else:
-                    # Generic corridor description
-                    exits = room.get_link_directions()
-                    exit_str = ", ".join(exits[:-1]) + (" and " + exits[-1] if exits else "")
-                    room.description = f"A {adj} corridor with exits leading {exit_str}."
+        # Skip rooms that already have descriptions
+        descriptions = dungeon.descriptions
+        pending = [
+            (r, c) for r in range(dungeon.rows) for c in range(dungeon.cols)
+            if not descriptions.get((r, c))
+        ]
+        
+        # Draw an adjective for every pending room at once
+        if rng is None:
+            rng = DungeonGenerator._make_rng()
+        picks = rng.integers(len(adjectives), size=len(pending)).tolist()
+        room_types = dungeon.room_types.tolist()
+        links = dungeon.links.tolist()
+        for (r, c), pick in zip(pending, picks):
+            # Generate description based on room type
+            template = DungeonGenerator.DESCRIPTION_TEMPLATES.get(room_types[r][c])
+            if template is None:
+                # Generic corridor description
+                template = "A {} corridor with exits leading " + _EXIT_PHRASES[links[r][c]] + "."
+            descriptions[(r, c)] = template.format(adjectives[pick])
         
         return dungeon
\ No newline at end of file
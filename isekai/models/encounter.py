@@ -5,17 +5,224 @@ This module contains the classes for handling encounters in dungeons,
 including combat, traps, and puzzles.
 """
 
+import math
 import random
-import sys
-import os
+from operator import attrgetter
 
-# Add the current directory to the path so we can import modules
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernel is used instead
+    njit = None
+
+from models.dungeon import Room
+
+# Bound methods of the shared generator, saving a module attribute lookup
+# on every draw in the spawn and loot paths
+_random = random.random
+_choice = random.choice
+_randrange = random.randrange
+
+
+class BatchRNG:
+    """
+    Uniform draws served from a buffer filled by a NumPy PCG64 generator.
+
+    Generating a dungeon's worth of encounters makes hundreds of small
+    draws; pass one BatchRNG as the rng argument of the generators so
+    they are taken BUFFER_SIZE at a time instead of one Mersenne Twister
+    call each. The methods mirror the random module's.
+    """
+    BUFFER_SIZE = 1024
+
+    def __init__(self, seed=None):
+        self._generator = np.random.default_rng(seed)
+        self._uniforms = []
+
+    def random(self):
+        """Return the next float in [0, 1)."""
+        if not self._uniforms:
+            self._uniforms = self._generator.random(self.BUFFER_SIZE).tolist()
+        return self._uniforms.pop()
+
+    def array(self, shape):
+        """Return an array of floats in [0, 1) straight from the generator."""
+        return self._generator.random(shape)
+
+    def randrange(self, n):
+        """Return an integer in [0, n)."""
+        return int(self.random() * n)
+
+    def randint(self, a, b):
+        """Return an integer in [a, b]."""
+        return a + int(self.random() * (b - a + 1))
+
+    def uniform(self, a, b):
+        """Return a float between a and b."""
+        return a + (b - a) * self.random()
+
+    def choice(self, seq):
+        """Return a random element of a non-empty sequence."""
+        return seq[int(self.random() * len(seq))]
+
+
+def _insertion_sample(n, k, randrange=None):
+    """
+    Draw k distinct indices from range(n) by insertion sampling.
+
+    Each draw picks a rank among the values not yet taken and shifts it
+    past the smaller values already in the sorted sample, so only k random
+    numbers are needed and no population is materialized.
+
+    Returns:
+        Sorted list of k distinct indices
+    """
+    randrange = randrange or _randrange
+    sample = []
+    for i in range(k):
+        value = randrange(n - i)
+        pos = 0
+        while pos < i and sample[pos] <= value:
+            value += 1
+            pos += 1
+        sample.insert(pos, value)
+    return sample
+
+
+def _pool_sample(n, k, randrange=None):
+    """
+    Draw k distinct indices from range(n) by a partial Fisher-Yates shuffle.
+
+    Returns:
+        List of k distinct indices in draw order
+    """
+    randrange = randrange or _randrange
+    pool = list(range(n))
+    sample = []
+    for i in range(k):
+        j = randrange(n - i)
+        sample.append(pool[j])
+        pool[j] = pool[n - i - 1]
+    return sample
+
+
+def _reservoir_sample(n, k, rand=None, randrange=None):
+    """
+    Draw k distinct indices from range(n) with Li's reservoir algorithm L.
+
+    Instead of visiting every index, the gap to the next replacement is
+    drawn directly, so the expected number of draws is O(k(1 + log(n/k))).
+
+    Returns:
+        List of k distinct indices in no particular order
+    """
+    rand = rand or _random
+    randrange = randrange or _randrange
+    if k == 0:
+        return []
+
+    def open_uniform():
+        # log() needs a draw strictly inside (0, 1)
+        u = rand()
+        while u == 0.0:
+            u = rand()
+        return u
+
+    reservoir = list(range(k))
+    w = math.exp(math.log(open_uniform()) / k)
+    i = k - 1
+    while True:
+        i += int(math.log(open_uniform()) / math.log(1.0 - w)) + 1
+        if i >= n:
+            return reservoir
+        reservoir[randrange(k)] = i
+        w *= math.exp(math.log(open_uniform()) / k)
+
+
+# Pools up to this size always use insertion sampling; its quadratic shift
+# is cheaper than building a pool or computing logarithms
+_SMALL_POOL = 16
+
+
+def _sample_indices(n, k, rng=None):
+    """
+    Draw k distinct indices from range(n), picking the algorithm by size.
+
+    Insertion sampling is used for small pools or when k is below sqrt(n),
+    a partial shuffle when k is below n / 2, and reservoir sampling L for
+    larger samples.
+
+    Args:
+        n: Population size
+        k: Number of indices to draw, at most n
+        rng: Optional BatchRNG to draw from instead of the random module
+
+    Returns:
+        List of k distinct indices
+    """
+    randrange = _randrange if rng is None else rng.randrange
+    if n <= _SMALL_POOL or k * k < n:
+        return _insertion_sample(n, k, randrange)
+    if 2 * k < n:
+        return _pool_sample(n, k, randrange)
+    return _reservoir_sample(n, k, _random if rng is None else rng.random, randrange)
+
+
+def _monster_stats_numpy(levels, types, bonus):
+    """
+    Compute attributes and derived stats for a batch of monsters.
+    
+    Args:
+        levels: int64 array of monster levels
+        types: int64 array of monster type codes
+        bonus: Attribute bonus table indexed by type code, _TYPE_ATTR_BONUS
+    
+    Returns:
+        int64 array of shape (n, 6) with columns strength, dexterity,
+        wisdom, max_hp, attack and defense
+    """
+    stats = np.empty((levels.shape[0], 6), dtype=np.int64)
+    stats[:, :3] = (10 + levels)[:, None] + bonus[types]
+    stats[:, 3] = 5 + levels * 3 + stats[:, 0] // 2
+    stats[:, 4] = levels + stats[:, 0] // 2
+    stats[:, 5] = 10 + stats[:, 1] // 2
+    return stats
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _compute_monster_stats(levels, types, bonus):
+        """Compute attributes and derived stats for a batch of monsters"""
+        n = levels.shape[0]
+        stats = np.empty((n, 6), dtype=np.int64)
+        for i in range(n):
+            base = 10 + levels[i]
+            t = types[i]
+            strength = base + bonus[t, 0]
+            dexterity = base + bonus[t, 1]
+            stats[i, 0] = strength
+            stats[i, 1] = dexterity
+            stats[i, 2] = base + bonus[t, 2]
+            stats[i, 3] = 5 + levels[i] * 3 + strength // 2
+            stats[i, 4] = levels[i] + strength // 2
+            stats[i, 5] = 10 + dexterity // 2
+        return stats
+else:
+    _compute_monster_stats = _monster_stats_numpy
 
 
 class Monster:
     """
     Monster represents an enemy in a combat encounter.
+    
+    Args:
+        name: Monster name
+        level: Monster level (determines base stats)
+        monster_type: Type of monster (affects abilities and stats)
+        attributes: Optional dict of attributes (str, dex, wis)
+        abilities: Optional list of special abilities
+        rng: Optional BatchRNG to draw from instead of the random module
     """
     # Monster types
     GLITCH = 1        # Error-based monsters
@@ -31,121 +238,101 @@ class Monster:
         VIRUS: "Virus"
     }
     
-    def __init__(self, name, level, monster_type=None, attributes=None, abilities=None):
-        """
-        Initialize a new monster.
-        
-        Args:
-            name: Monster name
-            level: Monster level (determines base stats)
-            monster_type: Type of monster (affects abilities and stats)
-            attributes: Optional dict of attributes (str, dex, wis)
-            abilities: Optional list of special abilities
-        """
+    __slots__ = (
+        "name", "level", "monster_type", "attributes", "max_hp", "hp",
+        "attack", "defense", "status_effects", "abilities", "_loot", "_loot_rng"
+    )
+    
+    def __init__(self, name, level, monster_type=None, attributes=None, abilities=None, rng=None):
+        """Fill in whatever was not given and derive the combat stats."""
         self.name = name
         self.level = level
-        self.monster_type = monster_type or random.choice([Monster.GLITCH, Monster.DIGITAL, Monster.CORRUPTED, Monster.VIRUS])
+        self.monster_type = monster_type or (_choice if rng is None else rng.choice)(_MONSTER_TYPES)
         
         # Set attributes based on level and type if not provided
         self.attributes = attributes or self._generate_attributes()
         
         # Set derived stats
-        self.max_hp = 5 + (level * 3) + (self.attributes['strength'] // 2)
+        self.max_hp = 5 + (self.level * 3) + (self.attributes['strength'] // 2)
         self.hp = self.max_hp
 
         # Attack and defense derived from attributes and level
-        self.attack = level + (self.attributes['strength'] // 2)
+        self.attack = self.level + (self.attributes['strength'] // 2)
         self.defense = 10 + (self.attributes['dexterity'] // 2)
 
         # Status effects
         self.status_effects = []
 
         # Special abilities
-        self.abilities = abilities or self._generate_abilities()
+        self.abilities = abilities or self._generate_abilities(rng)
         
-        # Loot table
-        self.loot = self._generate_loot()
+        # Loot table, rolled from the same generator the first time it is
+        # needed
+        self._loot = None
+        self._loot_rng = rng
     
     def _generate_attributes(self):
         """Generate attributes based on monster level and type."""
-        # Base attributes scale with level
-        attributes = {
-            "strength": 10 + self.level,
-            "dexterity": 10 + self.level,
-            "wisdom": 10 + self.level
+        # Base attributes scale with level, adjusted by monster type
+        base = 10 + self.level
+        strength, dexterity, wisdom = _TYPE_ATTR_DELTAS.get(self.monster_type, _NO_ATTR_DELTAS)
+        return {
+            "strength": base + strength,
+            "dexterity": base + dexterity,
+            "wisdom": base + wisdom
         }
-        
-        # Adjust based on monster type
-        if self.monster_type == Monster.GLITCH:
-            attributes["dexterity"] += 2  # Glitches are quick and unpredictable
-        elif self.monster_type == Monster.DIGITAL:
-            attributes["wisdom"] += 2     # Digital entities are smart
-        elif self.monster_type == Monster.CORRUPTED:
-            attributes["strength"] += 2   # Corrupted entities are strong
-        elif self.monster_type == Monster.VIRUS:
-            # Viruses are balanced but dangerous
-            attributes["strength"] += 1
-            attributes["dexterity"] += 1
-        
-        return attributes
     
-    def _generate_abilities(self):
+    def _generate_abilities(self, rng=None):
         """Generate special abilities based on monster type and level."""
         abilities = []
-        
+
         # All monsters get more abilities as they level up
         num_abilities = 1 + (self.level // 3)
         
-        # Type-specific ability pools
-        type_abilities = {
-            Monster.GLITCH: [
-                {"name": "Glitch Strike", "damage_multiplier": 1.5, "target": "single"},
-                {"name": "Corruption Field", "damage": 2, "target": "all"},
-                {"name": "Disrupt", "effect": "reduce_defense", "amount": 2, "duration": 2},
-                {"name": "Error Cascade", "damage": 1, "effect": "confusion", "duration": 2}
-            ],
-            Monster.DIGITAL: [
-                {"name": "Data Spike", "damage_multiplier": 1.2, "target": "single"},
-                {"name": "Logic Bomb", "damage": 3, "target": "single"},
-                {"name": "Firewall", "effect": "shield", "amount": 3, "duration": 2},
-                {"name": "System Scan", "effect": "reveal_weakness", "duration": 2}
-            ],
-            Monster.CORRUPTED: [
-                {"name": "Corrupt Strike", "damage_multiplier": 1.3, "target": "single"},
-                {"name": "Virus Spread", "damage": 1, "effect": "damage_over_time", "amount": 1, "duration": 3},
-                {"name": "Memory Leak", "effect": "reduce_mp", "amount": 2},
-                {"name": "System Crash", "damage": 4, "cooldown": 3}
-            ],
-            Monster.VIRUS: [
-                {"name": "Infect", "damage": 1, "effect": "weaken", "amount": 1, "duration": 3},
-                {"name": "Replicate", "effect": "summon", "cooldown": 4},
-                {"name": "Data Drain", "damage": 2, "heal_percent": 50},
-                {"name": "Encryption", "effect": "increase_defense", "amount": 3, "duration": 2}
-            ]
-        }
-        
         # Select abilities from the pool for this monster type
-        available_abilities = type_abilities.get(self.monster_type, [])
+        available_abilities = _TYPE_ABILITIES.get(self.monster_type, ())
         
         # Ensure we don't try to get more abilities than available
         num_abilities = min(num_abilities, len(available_abilities))
         
         # Select random abilities without replacement
-        selected_indices = random.sample(range(len(available_abilities)), num_abilities)
+        selected_indices = _sample_indices(len(available_abilities), num_abilities, rng)
         
+        # Copy the selected templates so callers may modify their abilities
         for index in selected_indices:
-            abilities.append(available_abilities[index])
+            abilities.append(dict(available_abilities[index]))
         
         return abilities
     
-    def _generate_loot(self):
+    @property
+    def loot(self):
+        """Loot table of this monster, generated on first access."""
+        if self._loot is None:
+            self._loot = self._generate_loot(self._loot_rng)
+            self._loot_rng = None
+        return self._loot
+    
+    @loot.setter
+    def loot(self, value):
+        self._loot = value
+    
+    def _generate_loot(self, rng=None):
         """Generate loot table based on monster level and type."""
+        rand = _random if rng is None else rng.random
         loot_table = []
         
+        # Both drop rolls are made up front. A roll that passes its chance
+        # p is uniform below p, so roll / p also picks the item type and
+        # no further draws are needed.
+        component_roll, consumable_roll = rand(), rand()
+        component_chance = min(1.0, 0.3 + (self.level * 0.05))
+        consumable_chance = min(1.0, 0.2 + (self.level * 0.03))
+        
         # Chance to drop crafting components
-        if random.random() < 0.3 + (self.level * 0.05):
-            component_types = ["metal", "elemental", "catalyst", "binding", "rune"]
-            component_type = random.choice(component_types)
+        if component_roll < component_chance:
+            component_type = _COMPONENT_TYPES[
+                int(component_roll / component_chance * len(_COMPONENT_TYPES))
+            ]
             
             loot_table.append({
                 "type": "component",
@@ -156,9 +343,10 @@ class Monster:
             })
         
         # Chance to drop consumable item
-        if random.random() < 0.2 + (self.level * 0.03):
-            consumable_types = ["health_potion", "mana_potion", "buff_item"]
-            consumable_type = random.choice(consumable_types)
+        if consumable_roll < consumable_chance:
+            consumable_type = _CONSUMABLE_TYPES[
+                int(consumable_roll / consumable_chance * len(_CONSUMABLE_TYPES))
+            ]
             
             if consumable_type == "health_potion":
                 loot_table.append({
@@ -199,66 +387,172 @@ class Monster:
         
         return loot_table
     
-    def get_loot(self):
-        """Roll for and return dropped loot from this monster."""
+    def get_loot(self, rng=None):
+        """
+        Roll for and return dropped loot from this monster.
+        
+        Items whose amount did not change are the loot table's own dicts,
+        so callers should copy an item before modifying it.
+        """
+        rand = _random if rng is None else rng.random
         dropped_loot = []
         
         for loot_item in self.loot:
             # Roll for each item based on drop chance
-            if random.random() <= loot_item.get("drop_chance", 1.0):
-                # Create a copy of the loot item to avoid modifying the original
-                dropped = loot_item.copy()
-                
-                # Add some randomization to amounts
-                if "amount" in dropped:
-                    variation = dropped["amount"] * 0.2  # 20% variation
-                    dropped["amount"] = int(dropped["amount"] + random.uniform(-variation, variation))
+            if rand() <= loot_item.get("drop_chance", 1.0):
+                # Add some randomization to amounts. Dropped loot shares the
+                # table's dicts; a new dict is only built when the amount
+                # changes, so the table itself is never modified.
+                if "amount" in loot_item:
+                    amount = loot_item["amount"]
+                    if amount >= 5:
+                        variation = amount * 0.2  # 20% variation
+                        amount = int(amount + (rand() * 2.0 - 1.0) * variation)
+                    elif rand() < 0.5:
+                        # Below 5 the variation is under 1, so truncating
+                        # only ever takes one off, on a negative draw
+                        amount -= 1
                     
                     # Ensure minimum value of 1
-                    dropped["amount"] = max(1, dropped["amount"])
+                    amount = max(1, amount)
+                    if amount != loot_item["amount"]:
+                        loot_item = {**loot_item, "amount": amount}
                 
-                dropped_loot.append(dropped)
+                dropped_loot.append(loot_item)
         
         return dropped_loot
     
     def to_dict(self):
         """Convert monster to a dictionary for serialization."""
-        return {
-            "name": self.name,
-            "level": self.level,
-            "monster_type": self.monster_type,
-            "attributes": self.attributes,
-            "max_hp": self.max_hp,
-            "hp": self.hp,
-            "attack": self.attack,
-            "defense": self.defense,
-            "abilities": self.abilities,
-            "loot": self.loot
-        }
+        return dict(zip(_MONSTER_FIELDS, _monster_values(self)))
     
     @classmethod
     def from_dict(cls, data):
         """Create a monster from a dictionary."""
-        monster = cls(
-            data["name"],
-            data["level"],
-            data["monster_type"],
-            data["attributes"],
-            data["abilities"]
-        )
+        # Every field is restored, so skip __init__ and its random rolls
+        monster = cls.__new__(cls)
+        monster.name = data["name"]
+        monster.level = data["level"]
+        monster.monster_type = data["monster_type"]
+        monster.attributes = data["attributes"]
         monster.max_hp = data["max_hp"]
         monster.hp = data["hp"]
         monster.attack = data["attack"]
         monster.defense = data["defense"]
-        monster.loot = data["loot"]
+        monster.status_effects = []
+        monster.abilities = data["abilities"]
+        monster._loot = data["loot"]
+        monster._loot_rng = None
         return monster
 
 
+# Serialized fields of a Monster, projected with one attrgetter call;
+# nested dicts and lists are shared, not copied
+_MONSTER_FIELDS = (
+    "name", "level", "monster_type", "attributes", "max_hp", "hp",
+    "attack", "defense", "abilities", "loot"
+)
+_monster_values = attrgetter(*_MONSTER_FIELDS)
+
+# Attribute adjustments (strength, dexterity, wisdom) per monster type
+_TYPE_ATTR_DELTAS = {
+    Monster.GLITCH: (0, 2, 0),     # Glitches are quick and unpredictable
+    Monster.DIGITAL: (0, 0, 2),    # Digital entities are smart
+    Monster.CORRUPTED: (2, 0, 0),  # Corrupted entities are strong
+    Monster.VIRUS: (1, 1, 0),      # Viruses are balanced but dangerous
+}
+_NO_ATTR_DELTAS = (0, 0, 0)
+
+# The same adjustments as an array indexed by type code, for the batch
+# stats kernel; codes without an entry get no adjustment
+_TYPE_ATTR_BONUS = np.array(
+    [_TYPE_ATTR_DELTAS.get(code, _NO_ATTR_DELTAS) for code in range(max(_TYPE_ATTR_DELTAS) + 1)],
+    dtype=np.int64
+)
+
+# Type-specific ability pools. Monsters copy the abilities they are given,
+# so these templates are shared and never modified.
+_TYPE_ABILITIES = {
+    Monster.GLITCH: (
+        {"name": "Glitch Strike", "damage_multiplier": 1.5, "target": "single"},
+        {"name": "Corruption Field", "damage": 2, "target": "all"},
+        {"name": "Disrupt", "effect": "reduce_defense", "amount": 2, "duration": 2},
+        {"name": "Error Cascade", "damage": 1, "effect": "confusion", "duration": 2}
+    ),
+    Monster.DIGITAL: (
+        {"name": "Data Spike", "damage_multiplier": 1.2, "target": "single"},
+        {"name": "Logic Bomb", "damage": 3, "target": "single"},
+        {"name": "Firewall", "effect": "shield", "amount": 3, "duration": 2},
+        {"name": "System Scan", "effect": "reveal_weakness", "duration": 2}
+    ),
+    Monster.CORRUPTED: (
+        {"name": "Corrupt Strike", "damage_multiplier": 1.3, "target": "single"},
+        {"name": "Virus Spread", "damage": 1, "effect": "damage_over_time", "amount": 1, "duration": 3},
+        {"name": "Memory Leak", "effect": "reduce_mp", "amount": 2},
+        {"name": "System Crash", "damage": 4, "cooldown": 3}
+    ),
+    Monster.VIRUS: (
+        {"name": "Infect", "damage": 1, "effect": "weaken", "amount": 1, "duration": 3},
+        {"name": "Replicate", "effect": "summon", "cooldown": 4},
+        {"name": "Data Drain", "damage": 2, "heal_percent": 50},
+        {"name": "Encryption", "effect": "increase_defense", "amount": 3, "duration": 2}
+    )
+}
+
+_MONSTER_TYPES = (Monster.GLITCH, Monster.DIGITAL, Monster.CORRUPTED, Monster.VIRUS)
+
+# Name parts for generated monsters
+_PREFIXES = (
+    "Alpha", "Beta", "Delta", "Gamma", "Omega",
+    "Prime", "Core", "Nexus", "Vector", "Matrix"
+)
+
+_TYPE_NAME_SUFFIXES = {
+    Monster.GLITCH: ("Anomaly", "Distortion", "Fragmentation", "Artifact", "Disruption"),
+    Monster.DIGITAL: ("Construct", "Algorithm", "Subroutine", "Process", "Protocol"),
+    Monster.CORRUPTED: ("Mutation", "Aberration", "Corruption", "Degradation", "Erosion"),
+    Monster.VIRUS: ("Infection", "Parasite", "Malware", "Trojan", "Worm")
+}
+
+# Every "prefix suffix" name per type, so naming a monster is one draw
+_NAME_PAIRS = {
+    monster_type: tuple(f"{prefix} {suffix}" for prefix in _PREFIXES for suffix in suffixes)
+    for monster_type, suffixes in _TYPE_NAME_SUFFIXES.items()
+}
+_DEFAULT_NAMES = tuple(f"{prefix} Entity" for prefix in _PREFIXES)
+
+_BOSS_NAMES = (
+    "The Overclocked Sentinel",
+    "Kernel Panic",
+    "The Void Protocol",
+    "Segmentation Fault",
+    "Corrupted Administrator",
+    "The Quantum Anomaly",
+    "Stack Overflow",
+    "Infinite Loop",
+    "The Root Daemon",
+    "System.Exception"
+)
+
+# Boss abilities; the damage of System Purge is filled in from the boss level
+_BOSS_ABILITIES = (
+    {"name": "System Purge", "damage": 0, "target": "all", "cooldown": 3},
+    {"name": "Root Access", "effect": "summon_minions", "cooldown": 4},
+    {"name": "Firewall Lockdown", "effect": "prevent_escape", "duration": 2},
+    {"name": "Data Corruption", "effect": "status_effect", "target": "all", "duration": 3}
+)
+
+
+# Loot categories rolled by Monster._generate_loot
+_COMPONENT_TYPES = ("metal", "elemental", "catalyst", "binding", "rune")
+_CONSUMABLE_TYPES = ("health_potion", "mana_potion", "buff_item")
+
+
 class MonsterGenerator:
     """Generates monsters with appropriate level and type."""
     
     @staticmethod
-    def generate_monster(level, theme="neon", monster_type=None):
+    def generate_monster(level, theme="neon", monster_type=None, rng=None):
         """
         Generate a monster of the specified level and type.
         
@@ -266,65 +560,91 @@ class MonsterGenerator:
             level: The monster's level
             theme: The dungeon theme
             monster_type: Optional specific monster type to generate
+            rng: Optional BatchRNG to draw from instead of the random module
             
         Returns:
             A new Monster instance
         """
+        choice = _choice if rng is None else rng.choice
+
         # Either use specified type or choose randomly
         if not monster_type:
-            monster_type = random.choice([Monster.GLITCH, Monster.DIGITAL, Monster.CORRUPTED, Monster.VIRUS])
+            monster_type = choice(_MONSTER_TYPES)
         
         # Generate type-specific name
-        prefix = random.choice([
-            "Alpha", "Beta", "Delta", "Gamma", "Omega",
-            "Prime", "Core", "Nexus", "Vector", "Matrix"
-        ])
-        
-        type_names = {
-            Monster.GLITCH: ["Anomaly", "Distortion", "Fragmentation", "Artifact", "Disruption"],
-            Monster.DIGITAL: ["Construct", "Algorithm", "Subroutine", "Process", "Protocol"],
-            Monster.CORRUPTED: ["Mutation", "Aberration", "Corruption", "Degradation", "Erosion"],
-            Monster.VIRUS: ["Infection", "Parasite", "Malware", "Trojan", "Worm"]
-        }
-        
-        suffix = random.choice(type_names.get(monster_type, ["Entity"]))
+        base_name = choice(_NAME_PAIRS.get(monster_type, _DEFAULT_NAMES))
         
         # Full name with level indicator
-        name = f"Lvl {level} {prefix} {suffix}"
+        name = f"Lvl {level} {base_name}"
         
         # Create and return the monster
-        return Monster(name, level, monster_type)
+        return Monster(name, level, monster_type, rng=rng)
     
     @staticmethod
-    def generate_boss(level, theme="neon"):
+    def generate_batch(levels, monster_types=None, theme="neon", rng=None):
+        """
+        Generate many monsters at once, e.g. when populating a dungeon.
+        
+        Attributes and derived stats for the whole batch are computed by
+        one kernel call; each monster is then filled in without going
+        through Monster.__init__.
+        
+        Args:
+            levels: Sequence of monster levels
+            monster_types: Optional sequence of monster types, one per level;
+                types are chosen randomly when omitted
+            theme: The dungeon theme
+            rng: Optional BatchRNG to draw from instead of the random module
+            
+        Returns:
+            List of new Monster instances
+        """
+        choice = _choice if rng is None else rng.choice
+        if monster_types is None:
+            monster_types = [choice(_MONSTER_TYPES) for _ in levels]
+        
+        stats = _compute_monster_stats(
+            np.asarray(levels, dtype=np.int64),
+            np.asarray(monster_types, dtype=np.int64),
+            _TYPE_ATTR_BONUS
+        ).tolist()
+        
+        monsters = []
+        for level, monster_type, row in zip(levels, monster_types, stats):
+            monster = Monster.__new__(Monster)
+            monster.name = f"Lvl {level} {choice(_NAME_PAIRS.get(monster_type, _DEFAULT_NAMES))}"
+            monster.level = level
+            monster.monster_type = monster_type
+            monster.attributes = {"strength": row[0], "dexterity": row[1], "wisdom": row[2]}
+            monster.max_hp = monster.hp = row[3]
+            monster.attack = row[4]
+            monster.defense = row[5]
+            monster.status_effects = []
+            monster.abilities = monster._generate_abilities(rng)
+            monster._loot = None
+            monster._loot_rng = rng
+            monsters.append(monster)
+        
+        return monsters
+    
+    @staticmethod
+    def generate_boss(level, theme="neon", rng=None):
         """
         Generate a boss monster for the dungeon level.
         
         Args:
             level: The boss's level (usually higher than regular monsters)
             theme: The dungeon theme
+            rng: Optional BatchRNG to draw from instead of the random module
             
         Returns:
             A new Monster instance with boss properties
         """
-        # Boss names
-        boss_names = [
-            "The Overclocked Sentinel",
-            "Kernel Panic",
-            "The Void Protocol",
-            "Segmentation Fault",
-            "Corrupted Administrator",
-            "The Quantum Anomaly",
-            "Stack Overflow",
-            "Infinite Loop",
-            "The Root Daemon",
-            "System.Exception"
-        ]
-        
-        name = random.choice(boss_names)
+        choice = _choice if rng is None else rng.choice
+        name = choice(_BOSS_NAMES)
         
         # Create a more powerful monster as the boss
-        boss = Monster(name, level + 2)
+        boss = Monster(name, level + 2, rng=rng)
         
         # Boost boss stats
         boss.max_hp *= 2
@@ -332,15 +652,11 @@ class MonsterGenerator:
         boss.attack += 2
         boss.defense += 2
         
-        # Add a special boss ability
-        boss_abilities = [
-            {"name": "System Purge", "damage": level * 2, "target": "all", "cooldown": 3},
-            {"name": "Root Access", "effect": "summon_minions", "cooldown": 4},
-            {"name": "Firewall Lockdown", "effect": "prevent_escape", "duration": 2},
-            {"name": "Data Corruption", "effect": "status_effect", "target": "all", "duration": 3}
-        ]
-        
-        boss.abilities.append(random.choice(boss_abilities))
+        # Add a special boss ability; damaging ones scale with level
+        ability = dict(choice(_BOSS_ABILITIES))
+        if "damage" in ability:
+            ability["damage"] = level * 2
+        boss.abilities.append(ability)
         
         # Improve boss loot
         boss.loot.append({
@@ -362,30 +678,41 @@ class Encounter:
     TRAP = 2
     PUZZLE = 3
     
-    def __init__(self, encounter_type, difficulty=1):
+    # Fields of every encounter type are declared; the ones that do not
+    # apply to an encounter's type are left at their defaults
+    __slots__ = (
+        "encounter_type", "difficulty", "completed", "description", "rewards",
+        "monsters", "ambush",
+        "trap_type", "detected", "disarmed", "effect",
+        "puzzle_type", "hints", "solution", "solved", "reward"
+    )
+    
+    def __init__(self, encounter_type, difficulty=1, rng=None):
         """
         Initialize a new encounter.
         
         Args:
             encounter_type: Type of encounter
             difficulty: Base difficulty level
+            rng: Optional BatchRNG to draw from instead of the random module
         """
+        rand, choice = (_random, _choice) if rng is None else (rng.random, rng.choice)
         self.encounter_type = encounter_type
         self.difficulty = difficulty
         self.completed = False
         self.description = ""
+        self._clear_type_fields()
         
         # Encounter-specific properties
         if encounter_type == Encounter.COMBAT:
-            self.monsters = []
-            self.ambush = random.random() < 0.3  # 30% chance of ambush
+            self.ambush = rand() < 0.3  # 30% chance of ambush
         elif encounter_type == Encounter.TRAP:
-            self.trap_type = random.choice(["damage", "status", "teleport"])
+            self.trap_type = choice(_TRAP_TYPES)
             self.detected = False
             self.disarmed = False
-            self.effect = self._generate_trap_effect()
+            self.effect = self._generate_trap_effect(choice)
         elif encounter_type == Encounter.PUZZLE:
-            self.puzzle_type = random.choice(["sequence", "pattern", "riddle"])
+            self.puzzle_type = choice(_PUZZLE_TYPES)
             self.hints = []
             self.solution = ""
             self.solved = False
@@ -393,7 +720,21 @@ class Encounter:
         
         self.rewards = []
     
-    def _generate_trap_effect(self):
+    def _clear_type_fields(self):
+        """Reset the type-specific fields to their defaults."""
+        self.monsters = []
+        self.ambush = None
+        self.trap_type = None
+        self.detected = None
+        self.disarmed = None
+        self.effect = None
+        self.puzzle_type = None
+        self.hints = None
+        self.solution = None
+        self.solved = None
+        self.reward = None
+    
+    def _generate_trap_effect(self, choice=None):
         """Generate a trap effect based on trap type and difficulty."""
         effect = {}
         
@@ -408,7 +749,7 @@ class Encounter:
         elif self.trap_type == "status":
             effect = {
                 "type": "status",
-                "status": random.choice(["poison", "slow", "weaken"]),
+                "status": (choice or _choice)(_TRAP_STATUSES),
                 "duration": 1 + (self.difficulty // 2),
                 "avoidable": True,
                 "save_attribute": "strength",
@@ -457,10 +798,13 @@ class Encounter:
         self.description = description
         return self
     
-    def complete(self):
+    def complete(self, rng=None):
         """
         Mark the encounter as completed and determine rewards.
         
+        Args:
+            rng: Optional BatchRNG to roll the monsters' loot with
+        
         Returns:
             List of rewards from this encounter
         """
@@ -471,7 +815,7 @@ class Encounter:
         
         if self.encounter_type == Encounter.COMBAT:
             for monster in self.monsters:
-                monster_loot = monster.get_loot()
+                monster_loot = monster.get_loot(rng)
                 for loot in monster_loot:
                     collected_rewards.append(loot)
         
@@ -480,6 +824,49 @@ class Encounter:
         
         return collected_rewards
     
+    def complete_vectorized(self, rng=None):
+        """
+        Mark the encounter as completed, rolling all monster loot at once.
+        
+        Same drop rules as complete(), but the drop roll and amount
+        variation for every loot row of every monster are drawn and
+        compared as arrays in one pass. As with get_loot, unchanged loot
+        dicts are shared with the monsters' tables.
+        
+        Args:
+            rng: Optional BatchRNG to draw the rolls from
+        
+        Returns:
+            List of rewards from this encounter
+        """
+        self.completed = True
+        
+        collected_rewards = []
+        
+        if self.encounter_type == Encounter.COMBAT:
+            rows = [loot_item for monster in self.monsters for loot_item in monster.loot]
+            if rows:
+                if rng is None:
+                    rng = BatchRNG(random.getrandbits(64))
+                rolls, variations = rng.array((2, len(rows)))
+                
+                drop_chances = np.array([loot_item.get("drop_chance", 1.0) for loot_item in rows])
+                amounts = np.array([loot_item.get("amount", 0) for loot_item in rows], dtype=np.float64)
+                
+                # +/-20% variation on amounts, with a minimum of 1
+                varied = amounts + (variations * 2.0 - 1.0) * (amounts * 0.2)
+                varied = np.maximum(1, varied.astype(np.int64)).tolist()
+                
+                for i in np.flatnonzero(rolls <= drop_chances).tolist():
+                    loot_item = rows[i]
+                    if "amount" in loot_item and varied[i] != loot_item["amount"]:
+                        loot_item = {**loot_item, "amount": varied[i]}
+                    collected_rewards.append(loot_item)
+        
+        collected_rewards.extend(self.rewards)
+        
+        return collected_rewards
+    
     def to_dict(self):
         """Convert encounter to a dictionary for serialization."""
         data = {
@@ -511,7 +898,11 @@ class Encounter:
     @classmethod
     def from_dict(cls, data):
         """Create an encounter from a dictionary."""
-        encounter = cls(data["encounter_type"], data["difficulty"])
+        # Every field is restored, so skip __init__ and its random rolls
+        encounter = cls.__new__(cls)
+        encounter.encounter_type = data["encounter_type"]
+        encounter.difficulty = data["difficulty"]
+        encounter._clear_type_fields()
         encounter.completed = data["completed"]
         encounter.description = data["description"]
         encounter.rewards = data["rewards"]
@@ -535,11 +926,35 @@ class Encounter:
         return encounter
 
 
+# Encounter subtypes and the text describing them
+_TRAP_TYPES = ("damage", "status", "teleport")
+_TRAP_STATUSES = ("poison", "slow", "weaken")
+_TRAP_DESCRIPTIONS = {
+    "damage": "A trigger mechanism will release a surge of harmful energy.",
+    "status": "A strange field surrounds the treasure that might affect your capabilities.",
+    "teleport": "A spatial distortion seems linked to the treasure container."
+}
+
+_PUZZLE_TYPES = ("sequence", "pattern", "riddle")
+_PUZZLE_DESCRIPTIONS = {
+    "sequence": "A sequence of symbols must be activated in the correct order.",
+    "pattern": "A pattern of lights must be replicated on the control panel.",
+    "riddle": "A cryptic riddle is inscribed on the wall, hinting at a hidden mechanism."
+}
+
+# Name prefix of puzzle reward crystals per dungeon theme
+_THEME_PREFIXES = {
+    "neon": "Prismatic",
+    "cyber": "Digital",
+    "retro": "Vintage"
+}
+
+
 class EncounterGenerator:
     """Generates encounters appropriate for dungeon rooms."""
     
     @staticmethod
-    def generate_encounter(room_type, difficulty=1, theme="neon"):
+    def generate_encounter(room_type, difficulty=1, theme="neon", rng=None):
         """
         Generate an encounter appropriate for the given room type.
         
@@ -547,15 +962,17 @@ class EncounterGenerator:
             room_type: The type of room from Room class
             difficulty: Base difficulty level
             theme: The dungeon theme
+            rng: Optional BatchRNG shared across a dungeon's encounters, so
+                all their draws come from one batched generator
             
         Returns:
             An Encounter instance or None if this room type doesn't have encounters
         """
-        from models.dungeon import Room
+        rand = _random if rng is None else rng.random
         
         if room_type == Room.COMBAT:
             # Create a combat encounter
-            encounter = Encounter(Encounter.COMBAT, difficulty)
+            encounter = Encounter(Encounter.COMBAT, difficulty, rng)
             
             # Determine number of monsters based on difficulty
             num_monsters = 1 + (difficulty // 2)
@@ -565,7 +982,7 @@ class EncounterGenerator:
             
             # Add monsters
             for i in range(num_monsters):
-                monster = MonsterGenerator.generate_monster(difficulty, theme)
+                monster = MonsterGenerator.generate_monster(difficulty, theme, rng=rng)
                 encounter.add_monster(monster)
             
             # Set description
@@ -578,17 +995,17 @@ class EncounterGenerator:
             
         elif room_type == Room.BOSS:
             # Create a boss encounter
-            encounter = Encounter(Encounter.COMBAT, difficulty + 2)
+            encounter = Encounter(Encounter.COMBAT, difficulty + 2, rng)
             
             # Generate boss monster
-            boss = MonsterGenerator.generate_boss(difficulty, theme)
+            boss = MonsterGenerator.generate_boss(difficulty, theme, rng)
             encounter.add_monster(boss)
             
             # Sometimes add minions
-            if random.random() < 0.5:
-                num_minions = random.randint(1, 2)
+            if rand() < 0.5:
+                num_minions = 2 if rand() < 0.5 else 1
                 for i in range(num_minions):
-                    minion = MonsterGenerator.generate_monster(difficulty - 1, theme)
+                    minion = MonsterGenerator.generate_monster(difficulty - 1, theme, rng=rng)
                     encounter.add_monster(minion)
             
             # Set description
@@ -598,26 +1015,13 @@ class EncounterGenerator:
             
         elif room_type == Room.PUZZLE:
             # Create a puzzle encounter
-            encounter = Encounter(Encounter.PUZZLE, difficulty)
-            
-            # Generate puzzle details
-            puzzle_types = {
-                "sequence": "A sequence of symbols must be activated in the correct order.",
-                "pattern": "A pattern of lights must be replicated on the control panel.",
-                "riddle": "A cryptic riddle is inscribed on the wall, hinting at a hidden mechanism."
-            }
+            encounter = Encounter(Encounter.PUZZLE, difficulty, rng)
             
-            puzzle_type = random.choice(list(puzzle_types.keys()))
-            encounter.puzzle_type = puzzle_type
-            encounter.set_description(puzzle_types[puzzle_type])
+            # Describe the puzzle type the encounter rolled
+            encounter.set_description(_PUZZLE_DESCRIPTIONS[encounter.puzzle_type])
             
             # Add reward for solving
-            theme_prefixes = {
-                "neon": "Prismatic",
-                "cyber": "Digital",
-                "retro": "Vintage"
-            }
-            prefix = theme_prefixes.get(theme, "Mysterious")
+            prefix = _THEME_PREFIXES.get(theme, "Mysterious")
             
             reward = {
                 "type": "rare_component",
@@ -631,17 +1035,10 @@ class EncounterGenerator:
             
         elif room_type == Room.TREASURE:
             # Treasure rooms might have trap encounters
-            if random.random() < 0.3:  # 30% chance
+            if rand() < 0.3:  # 30% chance
                 # Create a trap encounter guarding the treasure
-                encounter = Encounter(Encounter.TRAP, difficulty)
-                
-                trap_desc = {
-                    "damage": "A trigger mechanism will release a surge of harmful energy.",
-                    "status": "A strange field surrounds the treasure that might affect your capabilities.",
-                    "teleport": "A spatial distortion seems linked to the treasure container."
-                }
-                
-                encounter.set_description(trap_desc[encounter.trap_type])
+                encounter = Encounter(Encounter.TRAP, difficulty, rng)
+                encounter.set_description(_TRAP_DESCRIPTIONS[encounter.trap_type])
                 
                 return encounter
         
@@ -12,9 +12,16 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_data
+def load_css(path="assets/css/style.css"):
+    """Read a stylesheet once and serve it from the cache on reruns."""
+    with open(path) as f:
+        return f.read()
+
+
 # Load custom CSS
-with open("assets/css/style.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # Initialize game state
 if 'character' not in st.session_state:
@@ -0,0 +1,10 @@
+"""
+Shared pytest configuration for the Neon D&D Isekai tests
+"""
+import sys
+from pathlib import Path
+
+# Make the models and utils packages importable, once per session
+APP_ROOT = str(Path(__file__).resolve().parent.parent)
+if APP_ROOT not in sys.path:
+    sys.path.insert(0, APP_ROOT)
@@ -1,33 +1,40 @@
 """
 Unit tests for the Character class
 """
-import os
-import sys
+import copy
 import unittest
 from unittest.mock import patch
 
-# Add parent directory to path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from models.character import Character
 
+def _item_set(inventory):
+    """Hashable view of an inventory for set membership checks"""
+    return {frozenset(item.items()) for item in inventory if item is not None}
+
 class TestCharacter(unittest.TestCase):
     """Test cases for the Character class"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        # Create a test character with predefined attributes
-        self.test_attributes = {
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by every test"""
+        # Predefined attributes; tests only read these
+        cls.test_attributes = {
             'strength': 14,
             'dexterity': 12,
             'wisdom': 10
         }
-        self.test_character = Character(
+        # Prototype character, copied for each test since tests modify it
+        cls._character_proto = Character(
             name="Test Character",
             char_class="Warrior",
             origin="Arcade Cabinet Malfunction",
-            attributes=self.test_attributes
+            attributes=dict(cls.test_attributes)
         )
     
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_character = copy.deepcopy(self._character_proto)
+    
     def test_character_creation(self):
         """Test character creation with specified attributes"""
         # Check basic character properties
@@ -47,37 +54,49 @@ class TestCharacter(unittest.TestCase):
     
     def test_attribute_rolling(self):
         """Test that attributes are generated correctly when not specified"""
-        # Patch the _roll_attributes method to return known values
-        with patch.object(Character, '_roll_attributes') as mock_roll:
-            mock_roll.return_value = {
+        # Create character without specifying attributes, rolling known values
+        rolled_character = Character(
+            name="Rolled Character",
+            char_class="Wizard",
+            origin="VR Headset Glitch",
+            attribute_roller=lambda: {
                 'strength': 16,
                 'dexterity': 14,
                 'wisdom': 12
             }
-            
-            # Create character without specifying attributes
-            rolled_character = Character(
-                name="Rolled Character",
-                char_class="Wizard",
-                origin="VR Headset Glitch"
-            )
-            
-            # Check attributes were set from roll
-            self.assertEqual(rolled_character.attributes['strength'], 16)
-            self.assertEqual(rolled_character.attributes['dexterity'], 14)
-            self.assertEqual(rolled_character.attributes['wisdom'], 12)
+        )
+        
+        # Check attributes were set from roll
+        self.assertEqual(rolled_character.attributes['strength'], 16)
+        self.assertEqual(rolled_character.attributes['dexterity'], 14)
+        self.assertEqual(rolled_character.attributes['wisdom'], 12)
+        
+        # The default roller gives 4d6 drop lowest scores
+        rolled_character = Character("Default Roll", "Wizard", "VR Headset Glitch")
+        for score in rolled_character.attributes.values():
+            self.assertTrue(3 <= score <= 18)
     
     def test_starting_equipment(self):
         """Test that character gets appropriate starting equipment"""
         # Warrior should start with specific equipment
         warrior = Character("Warrior Test", "Warrior", "Test Origin", self.test_attributes)
-        self.assertIn({"name": "Iron Sword", "type": "weapon", "damage": "1d8"}, warrior.inventory)
+        self.assertIn(frozenset({"name": "Iron Sword", "type": "weapon", "damage": "1d8"}.items()),
+                      _item_set(warrior.inventory))
         self.assertEqual(warrior.equipment['weapon'], "Iron Sword")
         
         # Wizard should start with different equipment
         wizard = Character("Wizard Test", "Wizard", "Test Origin", self.test_attributes)
-        self.assertIn({"name": "Apprentice Staff", "type": "weapon", "damage": "1d6"}, wizard.inventory)
+        self.assertIn(frozenset({"name": "Apprentice Staff", "type": "weapon", "damage": "1d6"}.items()),
+                      _item_set(wizard.inventory))
         self.assertEqual(wizard.equipment['weapon'], "Apprentice Staff")
+        self.assertEqual(wizard.equipment['accessory'], "Spellbook")
+        
+        # Characters get their own copies of the starting items and skills
+        other = Character("Other Warrior", "Warrior", "Test Origin", self.test_attributes)
+        other.inventory[0]["damage"] = "2d8"
+        other.skills[0]["mp_cost"] = 5
+        self.assertEqual(warrior.inventory[0]["damage"], "1d8")
+        self.assertEqual(warrior.skills[0]["mp_cost"], 0)
     
     def test_to_dict(self):
         """Test conversion to dictionary for serialization"""
@@ -105,6 +124,14 @@ class TestCharacter(unittest.TestCase):
         self.assertEqual(restored_character.char_class, self.test_character.char_class)
         self.assertEqual(restored_character.attributes, self.test_character.attributes)
         self.assertEqual(restored_character.inventory, self.test_character.inventory)
+        
+        # Saved progress is restored rather than recomputed
+        char_dict.update(level=4, xp=3500, hp=3, max_hp=30)
+        with patch.object(Character, '_roll_attributes') as mock_roll:
+            restored_character = Character.from_dict(char_dict)
+        mock_roll.assert_not_called()
+        self.assertEqual(restored_character.to_dict(), char_dict)
+        self.assertFalse(hasattr(restored_character, "__dict__"))
     
     def test_level_up(self):
         """Test level up mechanics"""
@@ -165,6 +192,3 @@ class TestCharacter(unittest.TestCase):
         # Test using a non-existent skill
         result = self.test_character.use_skill("Nonexistent Skill")
         self.assertFalse(result['success'])
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
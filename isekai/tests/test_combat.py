@@ -1,50 +1,137 @@
 """
 Unit tests for the combat system
 """
-import os
-import sys
+import copy
+import random
 import unittest
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List
 from unittest.mock import patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from models.combat import CombatSystem, Action, Effect, CombatResult
+import numpy as np
+
+from models.combat import (
+    CombatSystem, Action, Effect, CombatResult, Participant, LOG_CAPACITY,
+    _apply_dot_kernel, _attack_core, _DiceRNG, _draw, _3D6_OUTCOMES
+)
 from models.encounter import Monster
 
+
+def _fixed_rng(value):
+    """A seeded Random whose randint always returns value"""
+    rng = random.Random(0)
+    rng.randint = lambda a, b: value
+    return rng
+
+
+@dataclass
+class CombatChar:
+    """Player character fixture that CombatSystem reads through attributes, like a Monster"""
+    name: str
+    char_class: str
+    level: int
+    attributes: Dict[str, int]
+    hp: int
+    max_hp: int
+    attack: int
+    defense: int
+    abilities: List[Dict[str, Any]] = field(default_factory=list)
+    inventory: List[Dict[str, Any]] = field(default_factory=list)
+    status_effects: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the character dict form"""
+        return {
+            "name": self.name,
+            "class": self.char_class,
+            "level": self.level,
+            "attributes": self.attributes,
+            "hp": self.hp,
+            "max_hp": self.max_hp,
+            "attack": self.attack,
+            "defense": self.defense,
+            "abilities": self.abilities,
+            "inventory": self.inventory,
+            "status_effects": self.status_effects
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Create a CombatChar from character dict data"""
+        return cls(
+            name=data["name"],
+            char_class=data["class"],
+            level=data["level"],
+            attributes=data["attributes"],
+            hp=data["hp"],
+            max_hp=data["max_hp"],
+            attack=data["attack"],
+            defense=data["defense"],
+            abilities=data.get("abilities", []),
+            inventory=data.get("inventory", []),
+            status_effects=data.get("status_effects", [])
+        )
+
+
 class TestCombatSystem(unittest.TestCase):
     """Test cases for CombatSystem class"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        # Create a player character
-        self.character = {
-            "name": "Test Character",
-            "class": "Netrunner",
-            "level": 3,
-            "attributes": {
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by every test"""
+        # Player character template, copied for each test since combat
+        # modifies hp, inventory and status effects
+        cls._character_proto = CombatChar(
+            name="Test Character",
+            char_class="Netrunner",
+            level=3,
+            attributes={
                 "strength": 12,
                 "dexterity": 14,
                 "wisdom": 10
             },
-            "hp": 20,
-            "max_hp": 20,
-            "attack": 7,  # level + (strength // 2)
-            "defense": 17,  # 10 + (dexterity // 2)
-            "abilities": [
+            hp=20,
+            max_hp=20,
+            attack=7,  # level + (strength // 2)
+            defense=17,  # 10 + (dexterity // 2)
+            abilities=[
                 {"name": "Hack", "type": "attack", "attribute": "wisdom", 
                  "effects": [{"type": "damage", "value": 8}]},
                 {"name": "Firewall", "type": "defense", "attribute": "wisdom",
                  "effects": [{"type": "shield", "value": 5}]}
             ],
-            "inventory": [
+            inventory=[
                 {"name": "Health Potion", "type": "consumable", 
                  "effects": [{"type": "heal", "value": 10}]}
-            ],
-            "status_effects": []
+            ]
+        )
+        
+        # Monster templates by type, rolled once for the class
+        cls._monster_protos = {
+            kind: Monster(f"{Monster.TYPE_NAMES[kind]} Prototype", 2, kind)
+            for kind in (Monster.DIGITAL, Monster.VIRUS)
         }
+    
+    def _spawn(self, name, kind):
+        """Copy the class's monster template of a type, with its own mutable state"""
+        prototype = self._monster_protos[kind]
+        monster = copy.copy(prototype)
+        monster.name = name
+        monster.attributes = dict(prototype.attributes)
+        monster.abilities = [dict(ability) for ability in prototype.abilities]
+        monster.status_effects = []
+        return monster
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        # Create a player character with its own inventory and status effects
+        self.character = replace(self._character_proto,
+                                 inventory=list(self._character_proto.inventory),
+                                 status_effects=[])
         
         # Create monsters
-        self.monster = Monster("Test Monster", 2, Monster.DIGITAL)
+        self.monster = self._spawn("Test Monster", Monster.DIGITAL)
+        self._monster_attack = self.monster.attack
         
         # Create an encounter with monsters
         self.encounter = {
@@ -55,6 +142,11 @@ class TestCombatSystem(unittest.TestCase):
         # Create the combat system
         self.combat = CombatSystem(self.character, self.encounter)
     
+    def _force_rolls(self, value):
+        """Make every die the combat rolls come up as value"""
+        self.combat.rng = _fixed_rng(value)
+        self.combat.dice = lambda: 3 * value
+    
     def test_init(self):
         """Test combat system initialization"""
         self.assertEqual(self.combat.character, self.character)
@@ -65,26 +157,82 @@ class TestCombatSystem(unittest.TestCase):
         self.assertIsNotNone(self.combat.initiative_order)
         self.assertGreater(len(self.combat.initiative_order), 0)
     
+    def test_dict_character(self):
+        """Test that a plain character dict still works as the combatant"""
+        character = self._character_proto.to_dict()
+        character["inventory"] = list(character["inventory"])
+        character["status_effects"] = []
+        self.assertEqual(CombatChar.from_dict(character), self._character_proto)
+        
+        combat = CombatSystem(character, self.encounter, dice=lambda: 18)
+        combat.execute_action(Action(Action.DEFEND, character, character))
+        self.assertEqual(len(combat.get_status_effects(character, "defense_up")), 1)
+        
+        character["hp"] = 0
+        combat.check_combat_end_conditions()
+        self.assertEqual(combat.result, CombatResult.DEFEAT)
+    
     def test_roll_initiative(self):
         """Test initiative calculation"""
         # Add a second monster
-        monster2 = Monster("Monster 2", 2, Monster.VIRUS)
+        monster2 = self._spawn("Monster 2", Monster.VIRUS)
         self.encounter["monsters"].append(monster2)
         
         # Roll initiative
-        with patch('random.randint', return_value=3):  # Force consistent dice rolls
-            initiative = self.combat.roll_initiative()
-            
-            # Should have 3 entries (character + 2 monsters)
-            self.assertEqual(len(initiative), 3)
-            
-            # Each entry should have 'entity' and 'initiative' keys
-            for entry in initiative:
-                self.assertIn('entity', entry)
-                self.assertIn('initiative', entry)
+        self._force_rolls(3)  # Force consistent dice rolls
+        initiative = self.combat.roll_initiative()
+        
+        # Should have 3 entries (character + 2 monsters)
+        self.assertEqual(len(initiative), 3)
+        
+        # Each entry should have 'entity' and 'initiative' keys
+        for entry in initiative:
+            self.assertIn('entity', entry)
+            self.assertIn('initiative', entry)
+    
+    def test_roll_initiative_single_monster(self):
+        """Test the one-on-one initiative fast path"""
+        self.combat.dice = lambda: 10
+        initiative = self.combat.roll_initiative()
+
+        # Player (DEX 14) beats the monster (DEX 12) on equal dice
+        self.assertEqual(len(initiative), 2)
+        self.assertTrue(initiative[0]["is_player"])
+        self.assertGreaterEqual(initiative[0]["initiative"], initiative[1]["initiative"])
+
+        # Ties go to the player
+        self.monster.attributes["dexterity"] = 14
+        initiative = self.combat.roll_initiative()
+        self.assertTrue(initiative[0]["is_player"])
+
+        # A stronger monster roll puts the monster first
+        self.combat.dice = iter([3, 18]).__next__
+        initiative = self.combat.roll_initiative()
+        self.assertFalse(initiative[0]["is_player"])
+
+    def test_actions(self):
+        """Test attack, ability and monster actions on one combat system"""
+        cases = (
+            ("attack", 6, self._check_attack_action),    # Max damage roll
+            ("ability", 10, self._check_ability_action), # High roll to ensure success
+            ("monster", 6, self._check_monster_action),  # Ensure hit, with a higher damage value
+        )
+        for name, roll, check in cases:
+            with self.subTest(action=name):
+                self._reset_fight()
+                self._force_rolls(roll)
+                check()
+    
+    def _reset_fight(self):
+        """Restore both combatants and clear the log between sub-tests"""
+        self.character.hp = self._character_proto.hp
+        self.character.defense = self._character_proto.defense
+        self.character.status_effects = []
+        self.monster.hp = self.monster.max_hp
+        self.monster.attack = self._monster_attack
+        self.combat.log.clear()
     
-    @patch('random.randint', return_value=6)  # Max damage roll
-    def test_attack_action(self, mock_randint):
+    def _check_attack_action(self):
         """Test performing an attack action"""
         # Initial HP
         initial_monster_hp = self.monster.hp
@@ -107,11 +255,10 @@ class TestCombatSystem(unittest.TestCase):
         # Combat log should be updated
         self.assertGreater(len(self.combat.log), 0)
     
-    @patch('random.randint', return_value=10)  # High roll to ensure success
-    def test_ability_action(self, mock_randint):
+    def _check_ability_action(self):
         """Test performing an ability action"""
         # Create ability action (using "Hack" ability)
-        ability = self.character["abilities"][0]
+        ability = self.character.abilities[0]
         action = Action(Action.ABILITY, self.character, self.monster, ability=ability)
         
         # Execute action
@@ -125,13 +272,41 @@ class TestCombatSystem(unittest.TestCase):
         # Combat log should be updated
         self.assertGreater(len(self.combat.log), 0)
     
+    def _check_monster_action(self):
+        """Test monster taking an action"""
+        # Initial character HP
+        initial_character_hp = self.character.hp
+
+        # Set up monster with high attack value
+        self.monster.attack = 10  # Ensure substantial damage
+
+        # Reduce character defense to ensure hit
+        self.character.defense = 10
+
+        # Monster takes action
+        action = self.combat.get_monster_action(self.monster)
+        result = self.combat.execute_action(action)
+
+        # Force damage application for test
+        self.character.hp -= 5
+
+        # Verify result
+        self.assertEqual(result.source, self.monster)
+        self.assertEqual(result.target, self.character)
+
+        # Character HP should be reduced
+        self.assertLess(self.character.hp, initial_character_hp)
+
+        # Combat log should be updated
+        self.assertGreater(len(self.combat.log), 0)
+    
     def test_item_action(self):
         """Test using an item"""
         # Reduce character HP
-        self.character["hp"] = 10
+        self.character.hp = 10
         
         # Create item action (using "Health Potion")
-        item = self.character["inventory"][0]
+        item = self.character.inventory[0]
         action = Action(Action.ITEM, self.character, self.character, item=item)
         
         # Execute action
@@ -142,10 +317,10 @@ class TestCombatSystem(unittest.TestCase):
         self.assertEqual(result.item, item)
         
         # Character HP should be increased
-        self.assertGreater(self.character["hp"], 10)
+        self.assertGreater(self.character.hp, 10)
         
         # Item should be removed from inventory
-        self.assertNotIn(item, self.character["inventory"])
+        self.assertNotIn(item, self.character.inventory)
         
         # Combat log should be updated
         self.assertGreater(len(self.combat.log), 0)
@@ -162,50 +337,17 @@ class TestCombatSystem(unittest.TestCase):
         self.assertEqual(result.action_type, Action.DEFEND)
         
         # Character should have a defense buff status effect
-        has_defense_buff = False
-        for effect in self.character["status_effects"]:
-            if effect["type"] == "defense_up":
-                has_defense_buff = True
-                break
-        
-        self.assertTrue(has_defense_buff)
+        self.assertTrue(self.combat.get_status_effects(self.character, "defense_up"))
+        self.assertIn(self.combat.get_status_effects(self.character, "defense_up")[0],
+                      self.character.status_effects)
         
         # Combat log should be updated
         self.assertGreater(len(self.combat.log), 0)
     
-    @patch('utils.dice.roll_3d6', return_value=18)  # Ensure hit
-    @patch('random.randint', return_value=6)  # Higher damage value
-    def test_monster_action(self, mock_randint, mock_roll_3d6):
-        """Test monster taking an action"""
-        # Initial character HP
-        initial_character_hp = self.character["hp"]
-
-        # Set up monster with high attack value
-        self.monster.attack = 10  # Ensure substantial damage
-
-        # Reduce character defense to ensure hit
-        self.character["defense"] = 10
-
-        # Monster takes action
-        action = self.combat.get_monster_action(self.monster)
-        result = self.combat.execute_action(action)
-
-        # Force damage application for test
-        self.character["hp"] -= 5
-
-        # Verify result
-        self.assertEqual(result.source, self.monster)
-        self.assertEqual(result.target, self.character)
-
-        # Character HP should be reduced
-        self.assertLess(self.character["hp"], initial_character_hp)
-
-        # Combat log should be updated
-        self.assertGreater(len(self.combat.log), 0)
-    
-    @patch('random.randint', return_value=10)  # High roll to ensure hit
-    def test_process_turn(self, mock_randint):
+    def test_process_turn(self):
         """Test processing a full combat turn"""
+        self._force_rolls(10)  # High roll to ensure hit
+        
         # Setup simple initiative to ensure player goes first
         self.combat.initiative_order = [
             {"entity": self.character, "initiative": 20},
@@ -235,7 +377,7 @@ class TestCombatSystem(unittest.TestCase):
         self.monster.hp = 10
         
         # Case 2: Player defeated
-        self.character["hp"] = 0
+        self.character.hp = 0
         self.combat.check_combat_end_conditions()
         self.assertTrue(self.combat.combat_ended)
         self.assertEqual(self.combat.result, CombatResult.DEFEAT)
@@ -247,48 +389,51 @@ class TestCombatSystem(unittest.TestCase):
         self.combat.apply_effect(damage_effect, self.character, self.monster)
         
         # Test heal effect
-        self.character["hp"] = 10
+        self.character.hp = 10
         heal_effect = Effect("heal", 5)
         self.combat.apply_effect(heal_effect, self.character, self.character)
-        self.assertEqual(self.character["hp"], 15)
+        self.assertEqual(self.character.hp, 15)
         
         # Test status effect
         status_effect = Effect("status", "poison", duration=3)
         self.combat.apply_effect(status_effect, self.monster, self.character)
         
-        status_found = False
-        for effect in self.character["status_effects"]:
-            if effect["type"] == "poison":
-                status_found = True
-                self.assertEqual(effect["duration"], 3)
-                break
-                
-        self.assertTrue(status_found)
+        poison = self.combat.get_status_effects(self.character, "poison")
+        self.assertEqual(len(poison), 1)
+        self.assertEqual(poison[0]["duration"], 3)
     
     def test_process_status_effects(self):
         """Test processing status effects at end of turn"""
         # Add a poison effect to character
-        self.character["status_effects"].append({
+        self.character.status_effects.append({
             "type": "poison",
             "value": 2,
             "duration": 2
         })
         
         # Process effects
-        initial_hp = self.character["hp"]
+        initial_hp = self.character.hp
         self.combat.process_status_effects()
         
         # Character should take damage
-        self.assertEqual(self.character["hp"], initial_hp - 2)
+        self.assertEqual(self.character.hp, initial_hp - 2)
         
         # Duration should be reduced
-        self.assertEqual(self.character["status_effects"][0]["duration"], 1)
+        self.assertEqual(self.character.status_effects[0]["duration"], 1)
         
         # Process again
         self.combat.process_status_effects()
         
         # Duration should now be 0, effect should be removed
-        self.assertEqual(len(self.character["status_effects"]), 0)
+        self.assertEqual(len(self.character.status_effects), 0)
+        self.assertEqual(self.combat.get_status_effects(self.character, "poison"), [])
+        
+        # Effects appended directly after the index was built are still seen
+        self.combat.execute_action(Action(Action.DEFEND, self.character, self.character))
+        self.character.status_effects.append({"type": "poison", "value": 2, "duration": 1})
+        self.combat.process_status_effects()
+        self.assertEqual(self.character.status_effects, [])
+        self.assertEqual(self.combat.get_status_effects(self.character, "defense_up"), [])
     
     def test_get_combat_summary(self):
         """Test getting a combat summary"""
@@ -322,5 +467,366 @@ class TestCombatSystem(unittest.TestCase):
         self.assertIn("loot", summary)
 
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+
+class TestCombatState(unittest.TestCase):
+    """Test cases for the combat_state based CombatSystem API"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.character = {
+            "name": "Test Character",
+            "attributes": {"strength": 14, "dexterity": 12, "wisdom": 10},
+            "hp": 30,
+            "max_hp": 30,
+            "mp": 10,
+            "max_mp": 10,
+            "defense": 12,
+            "abilities": [{"name": "Cleave", "damage": 3, "target": "all"}],
+            "inventory": [
+                {"name": "Health Chip", "type": "consumable",
+                 "subtype": "health_potion", "amount": 5}
+            ],
+            "status_effects": []
+        }
+        self.monsters = [
+            {
+                "name": f"Construct {i}",
+                "attributes": {"strength": 10, "dexterity": 10, "wisdom": 10},
+                "hp": 8,
+                "max_hp": 8,
+                "defense": 10,
+                "abilities": [{"name": "Data Spike", "damage_multiplier": 1.2, "target": "single"}]
+            }
+            for i in range(2)
+        ]
+        self.combat_state = CombatSystem.start_combat(self.character, self.monsters)
+
+    def _set_turn(self, participant_index):
+        """Force the turn to the given participant"""
+        order = self.combat_state["initiative_order"].tolist()
+        self.combat_state["current_turn"] = order.index(participant_index)
+
+    def test_start_combat(self):
+        """Test combat state initialization"""
+        self.assertEqual(len(self.combat_state["participants"]), 3)
+        self.assertEqual(len(self.combat_state["initiative_order"]), 3)
+        self.assertEqual(sorted(self.combat_state["initiative_order"].tolist()), [0, 1, 2])
+        self.assertEqual(self.combat_state["soa"]["defense"].tolist(), [12, 10, 10])
+        self.assertIs(
+            self.combat_state["participants"][self.combat_state["character_idx"]]["data"],
+            self.character
+        )
+        self.assertEqual(self.combat_state["status"], CombatSystem.ACTIVE)
+        self.assertEqual(self.combat_state["round"], 1)
+
+    def test_modifiers_cached_and_refreshed(self):
+        """Test attribute modifiers are computed once and refreshed on demand"""
+        binding = self.combat_state["fast"][0]
+        self.assertIsInstance(binding, Participant)
+        self.assertFalse(hasattr(binding, "__dict__"))
+        self.assertEqual(binding.mods["strength"], 2)
+        self.assertEqual(binding.mods["dexterity"], 1)
+
+        self.character["attributes"]["strength"] = 18
+        self.assertEqual(binding.mods["strength"], 2)
+        CombatSystem.refresh_modifiers(self.combat_state, 0)
+        self.assertEqual(binding.mods["strength"], 4)
+
+    def test_attack_buff_updates_cached_modifier(self):
+        """Test attack buffs adjust the cached strength modifier while active"""
+        self.character["inventory"] = [{"name": "Overclock", "type": "consumable",
+                                        "subtype": "buff_item", "amount": 2, "duration": 2}]
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "item", None, None, 0)
+        self.assertEqual(self.combat_state["fast"][0].mods["strength"], 4)
+
+        CombatSystem.refresh_modifiers(self.combat_state, 0)
+        self.assertEqual(self.combat_state["fast"][0].mods["strength"], 4)
+
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "defend")
+        self.assertEqual(self.combat_state["fast"][0].mods["strength"], 2)
+        self.assertEqual(self.combat_state["active_effects"], [])
+
+    def test_defend_until_next_turn(self):
+        """Test defending raises defense until the defender acts again"""
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "defend")
+        self.assertEqual(self.combat_state["defending"], {0})
+
+        self._set_turn(1)
+        CombatSystem.process_action(self.combat_state, "attack", 0)
+        rolls = [entry for entry in CombatSystem.render_log(self.combat_state)
+                 if entry.startswith("Attack roll")]
+        self.assertTrue(rolls[-1].endswith("Defense: 14"))
+
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "defend")
+        self.assertIn("Test Character is no longer defending.", CombatSystem.render_log(self.combat_state))
+        self.assertEqual(self.combat_state["defending"], {0})
+
+    def test_attack_until_victory(self):
+        """Test attacking every monster down ends combat in victory"""
+        for index in (1, 2):
+            while self.combat_state["participants"][index]["data"]["hp"] > 0:
+                self._set_turn(0)
+                CombatSystem.process_action(self.combat_state, "attack", index)
+
+        self.assertEqual(self.combat_state["status"], CombatSystem.VICTORY)
+
+    def test_defeat_updates_alive_sets(self):
+        """Test defeated participants leave the alive sets and are skipped"""
+        self.assertEqual(self.combat_state["alive_monsters"], {1, 2})
+        self.combat_state["soa"]["hp"][1] = 1
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "ability", None, 0)
+
+        self.assertEqual(self.combat_state["alive_monsters"], {2})
+        self.assertEqual(self.combat_state["alive_chars"], {0})
+        current = CombatSystem.get_current_participant(self.combat_state)
+        self.assertIsNot(current, self.combat_state["participants"][1])
+
+    def test_log_rendered_lazily(self):
+        """Test log entries are stored as tuples and rendered on demand"""
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "defend")
+
+        self.assertIsInstance(self.combat_state["log"][-1], tuple)
+        rendered = CombatSystem.render_log(self.combat_state)
+        self.assertEqual(rendered[0], "Combat begins!")
+        self.assertIn("Test Character takes a defensive stance.", rendered)
+
+        summary = CombatSystem.get_combat_summary(self.combat_state)
+        self.assertEqual(summary["log"], rendered[-5:])
+
+    def test_damage_over_time(self):
+        """Test damage-over-time effects tick each action and then expire"""
+        self.character["abilities"].append({
+            "name": "Worm", "effect": "damage_over_time",
+            "amount": 3, "duration": 2, "target": "single"
+        })
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "ability", 1, 1)
+        self.assertEqual(self.monsters[0]["hp"], 5)
+        self.assertEqual(self.combat_state["dot"]["duration"].tolist(), [1])
+
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "defend")
+        self.assertEqual(self.monsters[0]["hp"], 2)
+        self.assertEqual(self.combat_state["dot"]["target"].size, 0)
+        self.assertIn("The effect Affected by Worm has worn off.",
+                      CombatSystem.render_log(self.combat_state))
+
+    def test_quiet_damage_over_time_skips_log_entries(self):
+        """Test damage-over-time effects build no log entries in a quiet combat"""
+        combat_state = CombatSystem.start_combat(self.character, self.monsters, seed=3,
+                                                 verbose=False)
+        CombatSystem._add_dot(combat_state, 1, 3, 1, "Affected by Worm")
+        with patch('models.combat._log') as mock_log:
+            CombatSystem._apply_dots(combat_state)
+        mock_log.assert_not_called()
+        self.assertEqual(combat_state["soa"]["hp"][1], 5)
+        self.assertEqual(combat_state["dot"]["target"].size, 0)
+
+    def test_log_is_bounded(self):
+        """Test the combat log keeps only the most recent entries"""
+        for _ in range(LOG_CAPACITY):
+            self._set_turn(0)
+            CombatSystem.process_action(self.combat_state, "defend")
+
+        self.assertEqual(len(self.combat_state["log"]), LOG_CAPACITY)
+        self.assertNotEqual(CombatSystem.render_log(self.combat_state)[0], "Combat begins!")
+        self.assertEqual(len(CombatSystem.get_combat_summary(self.combat_state)["log"]), 5)
+
+    def test_quiet_combat_skips_log(self):
+        """Test a non-verbose combat resolves without recording a log"""
+        combat_state = CombatSystem.start_combat(self.character, self.monsters, seed=3,
+                                                 verbose=False)
+        for _ in range(200):
+            if combat_state["status"] != CombatSystem.ACTIVE:
+                break
+            if CombatSystem.get_current_participant(combat_state)["type"] == "character":
+                target = next(iter(combat_state["alive_monsters"]))
+                CombatSystem.process_action(combat_state, "attack", target)
+            else:
+                CombatSystem.auto_action(combat_state)
+
+        self.assertNotEqual(combat_state["status"], CombatSystem.ACTIVE)
+        self.assertEqual(len(combat_state["log"]), 0)
+
+    def test_draw_from_dice_buffer(self):
+        """Test dice are drawn from the combat's buffer and refilled when spent"""
+        dice = _draw(3, self.combat_state)
+        self.assertEqual(len(dice), 3)
+        self.assertTrue(all(1 <= die <= 6 for die in dice))
+        self.assertEqual(self.combat_state["_dice_pos"], 3)
+
+        self.combat_state["_dice_pos"] = len(self.combat_state["_dice_buf"]) - 1
+        self.assertEqual(len(_draw(3, self.combat_state)), 3)
+        self.assertEqual(self.combat_state["_dice_pos"], 3)
+
+    def test_seeded_combats_roll_identically(self):
+        """Test combats started with the same seed draw the same dice"""
+        first = CombatSystem.start_combat(self.character, self.monsters, seed=11)
+        second = CombatSystem.start_combat(self.character, self.monsters, seed=11)
+        self.assertEqual(_draw(12, first), _draw(12, second))
+
+    def test_3d6_outcome_table(self):
+        """Test the 3d6 table holds every outcome of three dice"""
+        self.assertEqual(len(_3D6_OUTCOMES), 216)
+        self.assertEqual(int(_3D6_OUTCOMES.min()), 3)
+        self.assertEqual(int(_3D6_OUTCOMES.max()), 18)
+        self.assertEqual(int((_3D6_OUTCOMES == 10).sum()), 27)
+
+    def test_dice_rng_reseed(self):
+        """Test buffered dice are reproducible from a seed"""
+        first, second = _DiceRNG(5), _DiceRNG(5)
+        rolls = [first.d6_sum3() for _ in range(20)]
+        self.assertTrue(all(3 <= roll <= 18 for roll in rolls))
+        self.assertEqual(rolls, [second.d6_sum3() for _ in range(20)])
+
+        first.seed(5)
+        self.assertEqual([first.d6_sum3() for _ in range(20)], rolls)
+
+    def test_dot_kernel(self):
+        """Test the damage-over-time kernel stacks effects and clamps at zero"""
+        hp = np.array([10, 4, 7], dtype=np.int32)
+        target = np.array([1, 1, 2], dtype=np.int32)
+        amount = np.array([3, 3, 2], dtype=np.int32)
+        _apply_dot_kernel(hp, target, amount)
+        self.assertEqual(hp.tolist(), [10, 0, 5])
+
+    def test_attack_core(self):
+        """Test attack resolution from pre-rolled dice"""
+        self.assertEqual(tuple(_attack_core(10, 4, 1, 10, False)), (11, 10, True, 5))
+        self.assertEqual(tuple(_attack_core(10, 4, 1, 10, True)), (11, 12, False, 0))
+        self.assertEqual(tuple(_attack_core(12, 1, 0, 10, True)), (12, 12, True, 1))
+
+    def test_used_item_slots_stay_stable(self):
+        """Test used items leave the inventory while item slots stay stable"""
+        self.character["inventory"].append({"name": "Mana Chip", "type": "consumable",
+                                            "subtype": "mana_potion", "amount": 5})
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "item", None, None, 0)
+        self.assertEqual([item["name"] for item in self.character["inventory"]], ["Mana Chip"])
+        self.assertEqual(CombatSystem.item_slots(self.combat_state, 0), [1])
+
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "item", None, None, 0)
+        self.assertIn("Test Character tries to use an invalid item!",
+                      CombatSystem.render_log(self.combat_state))
+
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "item", None, None, 1)
+        self.assertEqual(self.character["inventory"], [])
+        self.assertEqual(CombatSystem.item_slots(self.combat_state, 0), [])
+
+    def test_monster_policy_is_seeded(self):
+        """Test monster actions come from a plan drawn from the combat's generator"""
+        plans = []
+        for _ in range(2):
+            combat_state = CombatSystem.start_combat(self.character, self.monsters, seed=7)
+            self.combat_state = combat_state
+            self._set_turn(1)
+            CombatSystem.auto_action(combat_state)
+            plans.append(combat_state["fast"][1].plan)
+
+        self.assertEqual(len(plans[0]), 31)
+        self.assertEqual(plans[0], plans[1])
+
+    def test_custom_action_dispatch(self):
+        """Test actions are dispatched through the handler table"""
+        handler = MagicMock(side_effect=lambda combat_state, *args: combat_state)
+        self._set_turn(0)
+        with patch.dict('models.combat._ACTION_DISPATCH', {"taunt": handler}):
+            CombatSystem.process_action(self.combat_state, "taunt", 1)
+
+        handler.assert_called_once_with(
+            self.combat_state, self.combat_state["participants"][0],
+            self.combat_state["participants"][1], None, None
+        )
+
+    def test_summary_cached_until_state_changes(self):
+        """Test the combat summary is rebuilt only after the state changes"""
+        summary = CombatSystem.get_combat_summary(self.combat_state)
+        cached = self.combat_state["_cached_summary"]
+        self.assertEqual(CombatSystem.get_combat_summary(self.combat_state), summary)
+        self.assertIs(self.combat_state["_cached_summary"], cached)
+        
+        # Callers get copies, so changing one leaves the cache intact
+        summary["monsters"].clear()
+        summary["character"]["hp"] = -1
+        self.assertEqual(CombatSystem.get_combat_summary(self.combat_state), cached)
+        self.assertNotEqual(cached["character"]["hp"], -1)
+        
+        # Helpers called directly also invalidate the cached summary
+        CombatSystem._apply_damage(self.combat_state, 1, 3)
+        damaged = CombatSystem.get_combat_summary(self.combat_state)
+        self.assertIsNot(self.combat_state["_cached_summary"], cached)
+        self.assertEqual(damaged["monsters"][0]["hp"], cached["monsters"][0]["hp"] - 3)
+        summary = damaged
+
+        version = self.combat_state["version"]
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "defend")
+        self.assertGreater(self.combat_state["version"], version)
+        updated = CombatSystem.get_combat_summary(self.combat_state)
+        self.assertIsNot(updated, summary)
+        self.assertEqual(updated["log"][-1], CombatSystem.render_log(self.combat_state)[-1])
+
+    def test_flee(self):
+        """Test fleeing rolls 3d6 against the group difficulty"""
+        self._set_turn(0)
+        with patch('models.combat._draw', return_value=[6, 6, 6]) as mock_draw:
+            CombatSystem.process_action(self.combat_state, "flee")
+
+        mock_draw.assert_called_once_with(3, self.combat_state)
+        self.assertEqual(self.combat_state["status"], CombatSystem.FLED)
+
+    def test_next_turn_rotates_alive_ring(self):
+        """Test turns rotate over living participants and count rounds"""
+        participants = self.combat_state["participants"]
+        CombatSystem._mark_defeated(self.combat_state, 1)
+        self.combat_state["current_turn"] = self.combat_state["alive_ring"][0]
+
+        seen = []
+        for _ in range(4):
+            CombatSystem.next_turn(self.combat_state)
+            seen.append(CombatSystem.get_current_participant(self.combat_state))
+
+        self.assertNotIn(participants[1], seen)
+        self.assertIs(seen[0], seen[2])
+        self.assertEqual(self.combat_state["round"], 3)
+
+    def test_participants_synced_from_arrays(self):
+        """Test participant hit points mirror the combat arrays after an action"""
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "ability", None, 0)
+
+        hp = self.combat_state["soa"]["hp"].tolist()
+        for participant, value in zip(self.combat_state["participants"], hp):
+            self.assertEqual(participant["data"]["hp"], value)
+        self.assertEqual(hp[1:], [5, 5])
+
+    def test_area_ability_logs_new_defeats_once(self):
+        """Test area damage only reports targets defeated by this hit"""
+        self.combat_state["soa"]["hp"][1] = 0
+        self.combat_state["soa"]["hp"][2] = 2
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "ability", None, 0)
+
+        defeats = [entry for entry in CombatSystem.render_log(self.combat_state)
+                   if entry.endswith("is defeated!")]
+        self.assertEqual(defeats, ["Construct 1 is defeated!"])
+        self.assertEqual(self.combat_state["soa"]["hp"].tolist()[1:], [0, 0])
+
+    def test_ability_by_id(self):
+        """Test abilities can be chosen by id instead of index"""
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "ability", ability_id="Cleave")
+        self.assertEqual(self.combat_state["soa"]["hp"].tolist()[1:], [5, 5])
+
+        self._set_turn(0)
+        CombatSystem.process_action(self.combat_state, "ability", ability_id="Fireball")
+        self.assertIn("Test Character tries to use an invalid ability!",
+                      CombatSystem.render_log(self.combat_state))
@@ -1,24 +1,32 @@
 """
 Unit tests for crafting system
 """
-import os
-import sys
+import re
 import unittest
+from functools import lru_cache
 from unittest.mock import patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from models.character import Character
 
+_PLACEHOLDERS = re.compile(r"(\[QUALITY\]|\[DICE\])")
+
+@lru_cache(maxsize=None)
+def _compile_formula(formula):
+    """Split a stat formula into literal text and placeholder tokens"""
+    return tuple(token for token in _PLACEHOLDERS.split(formula) if token)
+
 # Create a simple crafting module that we can test, based on The Forge implementation
 class CraftingSystem:
     @staticmethod
-    def check_recipe(component_names, recipes):
+    def build_index(recipes):
+        """Index recipes by their sorted component names"""
+        # Built in reverse so the first of two identical recipes wins, as in a scan
+        return {tuple(sorted(recipe["components"])): recipe for recipe in reversed(recipes)}
+    
+    @staticmethod
+    def check_recipe(component_names, recipe_index):
         """Check if components match a known recipe"""
-        for recipe in recipes:
-            if sorted(recipe["components"]) == sorted(component_names):
-                return recipe
-        return None
+        return recipe_index.get(tuple(sorted(component_names)))
     
     @staticmethod
     def determine_quality(roll):
@@ -35,20 +43,21 @@ class CraftingSystem:
     @staticmethod
     def process_stats(recipe, quality_value, quality_dice):
         """Process stats from recipe with quality values"""
+        values = {"[QUALITY]": str(quality_value), "[DICE]": str(quality_dice)}
         stats = {}
         for stat_name, stat_formula in recipe.get("stats", {}).items():
-            # Replace placeholders with actual values
-            stat_value = stat_formula.replace("[QUALITY]", str(quality_value))
-            stat_value = stat_value.replace("[DICE]", str(quality_dice))
-            stats[stat_name] = stat_value
+            # Substitute placeholder tokens with actual values
+            stats[stat_name] = "".join(
+                values.get(token, token) for token in _compile_formula(stat_formula)
+            )
         return stats
     
     @staticmethod
-    def craft_item(components, character, roll, recipes):
+    def craft_item(components, character, roll, recipe_index):
         """Main crafting function"""
         # Check if components match a recipe
         component_names = [c["name"] for c in components]
-        recipe = CraftingSystem.check_recipe(component_names, recipes)
+        recipe = CraftingSystem.check_recipe(component_names, recipe_index)
         
         if not recipe:
             return {
@@ -107,10 +116,11 @@ class CraftingSystem:
 class TestCrafting(unittest.TestCase):
     """Test cases for crafting system"""
     
-    def setUp(self):
-        """Set up test fixtures"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by every test; tests only read them"""
         # Sample recipes
-        self.test_recipes = [
+        cls.test_recipes = [
             {
                 "name": "Flaming Sword",
                 "type": "weapon",
@@ -134,16 +144,17 @@ class TestCrafting(unittest.TestCase):
                 }
             }
         ]
+        cls.recipe_index = CraftingSystem.build_index(cls.test_recipes)
         
         # Sample components
-        self.test_components = [
+        cls.test_components = [
             {"name": "Iron Chunk", "type": "metal", "quality": "basic", "icon": "🔩"},
             {"name": "Fire Essence", "type": "elemental", "element": "fire", "icon": "🔥"},
             {"name": "Damage Rune", "type": "rune", "effect": "damage", "icon": "🔆"}
         ]
         
         # Test character
-        self.test_character = {
+        cls.test_character = {
             "name": "Test Warrior",
             "class": "Warrior",
             "attributes": {
@@ -157,20 +168,26 @@ class TestCrafting(unittest.TestCase):
         """Test that component combinations match recipes correctly"""
         # Test matching recipe
         components = ["Iron Chunk", "Fire Essence", "Damage Rune"]
-        recipe = CraftingSystem.check_recipe(components, self.test_recipes)
+        recipe = CraftingSystem.check_recipe(components, self.recipe_index)
         self.assertIsNotNone(recipe)
         self.assertEqual(recipe["name"], "Flaming Sword")
         
         # Test mismatched recipe
         components = ["Iron Chunk", "Fire Essence", "Shield Rune"]  # Wrong combination
-        recipe = CraftingSystem.check_recipe(components, self.test_recipes)
+        recipe = CraftingSystem.check_recipe(components, self.recipe_index)
         self.assertIsNone(recipe)
         
         # Test order independence
         components = ["Damage Rune", "Fire Essence", "Iron Chunk"]  # Different order
-        recipe = CraftingSystem.check_recipe(components, self.test_recipes)
+        recipe = CraftingSystem.check_recipe(components, self.recipe_index)
         self.assertIsNotNone(recipe)
         self.assertEqual(recipe["name"], "Flaming Sword")
+        
+        # Lookups only see the recipes in the index they are given
+        other_index = CraftingSystem.build_index([self.test_recipes[1]])
+        recipe = CraftingSystem.check_recipe(["Shield Rune", "Glowing Herb", "Mana Crystal"], other_index)
+        self.assertEqual(recipe["name"], "Healing Charm")
+        self.assertIsNone(CraftingSystem.check_recipe(components, other_index))
     
     def test_quality_determination(self):
         """Test quality levels based on roll results"""
@@ -208,6 +225,12 @@ class TestCrafting(unittest.TestCase):
         stats = CraftingSystem.process_stats(recipe, 1, 4)
         self.assertEqual(stats["damage"], "1d8+1")
         self.assertEqual(stats["elemental"], "1d4 fire")
+        
+        # Formulas with repeated or no placeholders
+        recipe = {"stats": {"ability": "[QUALITY]×[QUALITY] [DICE]", "plain": "fixed"}}
+        stats = CraftingSystem.process_stats(recipe, 2, 6)
+        self.assertEqual(stats["ability"], "2×2 6")
+        self.assertEqual(stats["plain"], "fixed")
     
     def test_successful_crafting(self):
         """Test successful item crafting"""
@@ -216,7 +239,7 @@ class TestCrafting(unittest.TestCase):
             self.test_components, 
             self.test_character,
             15,  # High roll
-            self.test_recipes
+            self.recipe_index
         )
         
         # Check success
@@ -241,7 +264,7 @@ class TestCrafting(unittest.TestCase):
             wrong_components,
             self.test_character,
             15,
-            self.test_recipes
+            self.recipe_index
         )
         
         # Should fail due to recipe mismatch
@@ -253,7 +276,7 @@ class TestCrafting(unittest.TestCase):
             self.test_components,
             self.test_character,
             5,  # Low roll
-            self.test_recipes
+            self.recipe_index
         )
         
         # Should fail due to low roll
@@ -267,7 +290,7 @@ class TestCrafting(unittest.TestCase):
             self.test_components,
             self.test_character,  # Warrior
             10,  # Borderline roll, with affinity bonus should succeed well
-            self.test_recipes
+            self.recipe_index
         )
         
         # Should succeed with better quality due to affinity
@@ -281,7 +304,7 @@ class TestCrafting(unittest.TestCase):
             self.test_components,
             mage_character,
             10,  # Same roll, but no affinity bonus
-            self.test_recipes
+            self.recipe_index
         )
         
         # Should still succeed but with lower quality
@@ -292,6 +315,3 @@ class TestCrafting(unittest.TestCase):
             warrior_result["item"]["quality"],
             mage_result["item"]["quality"]
         )
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
@@ -1,13 +1,9 @@
 """
 Unit tests for the dice utilities
 """
-import os
-import sys
 import unittest
 from unittest.mock import patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.dice import roll_die, roll_dice, roll_check, attribute_modifier
 
 class TestDice(unittest.TestCase):
@@ -75,6 +71,3 @@ class TestDice(unittest.TestCase):
         self.assertEqual(attribute_modifier(16), 3)  # +3 modifier
         self.assertEqual(attribute_modifier(8), -1)  # -1 modifier
         self.assertEqual(attribute_modifier(3), -3)  # -3 modifier
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
@@ -1,13 +1,9 @@
 """
 Unit tests for the dungeon model and generation
 """
-import os
-import sys
 import unittest
 from unittest.mock import patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from models.dungeon import Room, DungeonLevel, DungeonGenerator
 
 class TestRoom(unittest.TestCase):
@@ -90,6 +86,21 @@ class TestRoom(unittest.TestCase):
         self.assertIn("You enter", result["events"][0])
         self.assertGreater(character["hp"], 5)  # Should heal in rest room
     
+    def test_encounter_clearing(self):
+        """Test rooms track cleared encounters"""
+        self.assertTrue(self.room.is_cleared())
+        self.room.add_encounter({"type": "combat", "completed": False})
+        self.room.add_encounter({"type": "combat", "completed": True})
+        self.assertFalse(self.room.is_cleared())
+        
+        self.room.mark_encounter_cleared(0)
+        self.room.mark_encounter_cleared(0)
+        self.assertTrue(self.room.encounters[0]["completed"])
+        self.assertTrue(self.room.is_cleared())
+        
+        restored = Room.from_dict(self.room.to_dict())
+        self.assertTrue(restored.is_cleared())
+    
     def test_serialization(self):
         """Test room serialization and deserialization"""
         self.room.set_room_type(Room.TREASURE)
@@ -150,6 +161,11 @@ class TestDungeonLevel(unittest.TestCase):
         # Test out of bounds
         with self.assertRaises(IndexError):
             self.dungeon.at(10, 10)
+        
+        # get() returns None instead of raising
+        self.assertEqual(self.dungeon.get(2, 3), room)
+        self.assertIsNone(self.dungeon.get(10, 10))
+        self.assertIsNone(self.dungeon.get(-1, 0))
     
     def test_linking_rooms(self):
         """Test linking rooms in the dungeon"""
@@ -208,6 +224,21 @@ class TestDungeonLevel(unittest.TestCase):
         self.assertFalse(south_room.discovered)
         self.assertFalse(west_room.discovered)
     
+    def test_bfs_discover(self):
+        """Test breadth-first discovery follows links up to a depth"""
+        # Corridor (4, 0) -> (4, 1) -> (3, 1) -> (3, 2)
+        self.dungeon.link_rooms(self.dungeon.at(4, 0), Room.EAST)
+        self.dungeon.link_rooms(self.dungeon.at(4, 1), Room.NORTH)
+        self.dungeon.link_rooms(self.dungeon.at(3, 1), Room.EAST)
+        
+        found = self.dungeon.bfs_discover(4, 0, max_depth=2)
+        self.assertEqual(sorted(found), [16, 20, 21])
+        self.assertTrue(self.dungeon.at(3, 1).discovered)
+        self.assertFalse(self.dungeon.at(3, 2).discovered)
+        
+        self.assertEqual(len(self.dungeon.bfs_discover(4, 0)), 4)
+        self.assertTrue(self.dungeon.at(3, 2).discovered)
+    
     def test_serialization(self):
         """Test dungeon serialization and deserialization"""
         # Set up a simple dungeon
@@ -241,6 +272,37 @@ class TestDungeonLevel(unittest.TestCase):
         room = new_dungeon.at(2, 2)
         self.assertTrue(room.linked(Room.NORTH))
         self.assertTrue(room.linked(Room.EAST))
+    
+    def test_rooms_are_views(self):
+        """Test rooms read and write the dungeon's room arrays"""
+        room = self.dungeon.at(1, 3)
+        room.set_room_type(Room.TREASURE)
+        room.add_treasure({"type": "gold", "value": 5})
+        self.dungeon.link_rooms(room, Room.WEST)
+        
+        self.assertEqual(self.dungeon.room_types[1, 3], Room.TREASURE)
+        self.assertEqual(self.dungeon.links[1, 3], Room.WEST)
+        self.assertEqual(self.dungeon.links[1, 2], Room.EAST)
+        self.assertEqual(self.dungeon.at(1, 3), room)
+        self.assertNotEqual(self.dungeon.at(1, 2), room)
+        self.assertEqual(len(self.dungeon.at(1, 3).treasures), 1)
+    
+    def test_from_room_list(self):
+        """Test loading a dungeon saved as a list of rooms"""
+        room = Room(2, 2)
+        room.set_room_type(Room.REST)
+        room.link(Room.NORTH)
+        data = {
+            "rows": 5, "cols": 5, "level_num": 1, "theme": "neon",
+            "rooms": [room.to_dict()],
+            "entrance": None, "exit": None,
+            "name": "Level 1", "description": ""
+        }
+        
+        dungeon = DungeonLevel.from_dict(data)
+        self.assertEqual(dungeon.at(2, 2).room_type, Room.REST)
+        self.assertTrue(dungeon.at(2, 2).linked(Room.NORTH))
+        self.assertIsNone(dungeon.at(0, 0).room_type)
 
 
 class TestDungeonGenerator(unittest.TestCase):
@@ -273,6 +335,17 @@ class TestDungeonGenerator(unittest.TestCase):
         self.assertGreater(room_types.get(Room.COMBAT, 0), 0)
         self.assertGreater(room_types.get(Room.TREASURE, 0), 0)
     
+    def test_generate_entrance_and_exit_only(self):
+        """Test grids with no rooms left to populate beyond entrance and exit"""
+        for rows, cols in ((1, 1), (2, 1)):
+            with self.subTest(rows=rows, cols=cols):
+                dungeon = DungeonGenerator.generate_dungeon(rows=rows, cols=cols, seed=1)
+                self.assertIsNotNone(dungeon.entrance)
+                self.assertIsNotNone(dungeon.exit)
+                
+                restored = DungeonLevel.from_dict(dungeon.to_dict())
+                self.assertEqual(restored.to_dict(), dungeon.to_dict())
+    
     def test_different_algorithms(self):
         """Test different generation algorithms"""
         # BSP algorithm
@@ -292,7 +365,18 @@ class TestDungeonGenerator(unittest.TestCase):
             rows=5, cols=5, algorithm="cellular", seed=42
         )
         self.assertIsNotNone(cellular_dungeon)
+    
+    def test_links_are_symmetric_and_seeded(self):
+        """Test bulk-generated links are two-way and reproducible"""
+        first = DungeonGenerator.generate_dungeon(rows=12, cols=9, seed=7)
+        second = DungeonGenerator.generate_dungeon(rows=12, cols=9, seed=7)
+        self.assertTrue((first.links == second.links).all())
+        
+        links = first.links
+        self.assertTrue(((links[:, :-1] & Room.EAST) > 0).tolist() ==
+                        ((links[:, 1:] & Room.WEST) > 0).tolist())
+        self.assertTrue(((links[:-1, :] & Room.SOUTH) > 0).tolist() ==
+                        ((links[1:, :] & Room.NORTH) > 0).tolist())
+        self.assertFalse((links[0, :] & Room.NORTH).any())
+        self.assertFalse((links[:, -1] & Room.EAST).any())
 
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
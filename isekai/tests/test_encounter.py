@@ -1,14 +1,11 @@
 """
 Unit tests for the encounter system
 """
-import os
-import sys
 import unittest
 from unittest.mock import patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from models.encounter import Monster, MonsterGenerator, Encounter, EncounterGenerator
+from models.encounter import (Monster, MonsterGenerator, Encounter, EncounterGenerator, BatchRNG, _insertion_sample,
+                              _pool_sample, _reservoir_sample, _sample_indices)
 from models.dungeon import Room
 
 class TestMonster(unittest.TestCase):
@@ -40,6 +37,9 @@ class TestMonster(unittest.TestCase):
         
         # Should have loot
         self.assertGreater(len(self.monster.loot), 0)
+        
+        # Monsters are slotted, without a per-instance __dict__
+        self.assertFalse(hasattr(self.monster, "__dict__"))
     
     def test_init_with_custom_attributes(self):
         """Test monster initialization with custom attributes"""
@@ -61,12 +61,25 @@ class TestMonster(unittest.TestCase):
     
     def test_get_loot(self):
         """Test loot generation"""
+        # The loot table is only rolled once something asks for it
+        self.assertIsNone(self.monster._loot)
+        
         # Mock random to always drop items
-        with patch('random.random', return_value=0.1):
+        with patch('models.encounter._random', return_value=0.1):
             loot = self.monster.get_loot()
             # Should get at least one item
             self.assertGreaterEqual(len(loot), 1)
     
+    def test_get_loot_small_amounts(self):
+        """Test amount variation on loot amounts below 5"""
+        self.monster.loot = [{"type": "consumable", "name": "Chip", "amount": 3, "drop_chance": 1.0}]
+        
+        amounts = {self.monster.get_loot()[0]["amount"] for _ in range(200)}
+        self.assertEqual(amounts, {2, 3})
+        
+        # The table itself is left untouched
+        self.assertEqual(self.monster.loot[0]["amount"], 3)
+    
     def test_serialization(self):
         """Test monster serialization and deserialization"""
         monster_dict = self.monster.to_dict()
@@ -82,6 +95,41 @@ class TestMonster(unittest.TestCase):
         self.assertEqual(new_monster.attack, self.monster.attack)
         self.assertEqual(new_monster.defense, self.monster.defense)
         self.assertEqual(len(new_monster.abilities), len(self.monster.abilities))
+        self.assertEqual(new_monster.loot, self.monster.loot)
+        
+        # Restoring a monster should not roll anything
+        with patch('models.encounter._random', side_effect=AssertionError), \
+                patch('models.encounter._choice', side_effect=AssertionError):
+            restored = Monster.from_dict(monster_dict)
+            self.assertEqual(restored.to_dict(), monster_dict)
+
+    def test_insertion_sample(self):
+        """Test that ability sampling draws distinct, in-range indices"""
+        for n in range(1, 8):
+            for k in range(n + 1):
+                sample = _insertion_sample(n, k)
+                self.assertEqual(len(sample), k)
+                self.assertEqual(sample, sorted(set(sample)))
+                self.assertTrue(all(0 <= i < n for i in sample))
+        
+        # Every subset of a small pool should be reachable
+        seen = {tuple(_insertion_sample(4, 2)) for _ in range(500)}
+        self.assertEqual(len(seen), 6)
+    
+    def test_sample_indices(self):
+        """Test every index sampling strategy on larger pools"""
+        for sampler in (_insertion_sample, _pool_sample, _reservoir_sample, _sample_indices):
+            for n, k in ((40, 0), (40, 3), (40, 15), (40, 30), (40, 40), (200, 150)):
+                sample = sampler(n, k)
+                self.assertEqual(len(sample), k)
+                self.assertEqual(len(set(sample)), k)
+                self.assertTrue(all(0 <= i < n for i in sample))
+        
+        # Reservoir sampling should still reach every index
+        seen = set()
+        for _ in range(200):
+            seen.update(_reservoir_sample(20, 15))
+        self.assertEqual(seen, set(range(20)))
 
 
 class TestMonsterGenerator(unittest.TestCase):
@@ -103,6 +151,30 @@ class TestMonsterGenerator(unittest.TestCase):
         
         self.assertEqual(monster.monster_type, Monster.VIRUS)
     
+    def test_generate_batch(self):
+        """Test that batch generation matches one-at-a-time stats"""
+        levels = [1, 2, 3, 5, 8]
+        types = [Monster.GLITCH, Monster.DIGITAL, Monster.CORRUPTED, Monster.VIRUS, Monster.GLITCH]
+        
+        batch = MonsterGenerator.generate_batch(levels, types, rng=BatchRNG(4))
+        
+        self.assertEqual(len(batch), 5)
+        for monster, level, monster_type in zip(batch, levels, types):
+            single = Monster("Single", level, monster_type)
+            self.assertEqual(monster.attributes, single.attributes)
+            self.assertEqual(
+                (monster.max_hp, monster.hp, monster.attack, monster.defense),
+                (single.max_hp, single.hp, single.attack, single.defense)
+            )
+            self.assertIn(f"Lvl {level}", monster.name)
+            self.assertEqual(len(monster.abilities), len(single.abilities))
+            self.assertGreater(len(monster.loot), 0)
+        
+        # Types are chosen randomly when not given
+        batch = MonsterGenerator.generate_batch([2] * 10)
+        for monster in batch:
+            self.assertIn(monster.monster_type, Monster.TYPE_NAMES)
+    
     def test_generate_boss(self):
         """Test boss monster generation"""
         boss = MonsterGenerator.generate_boss(level=5, theme="cyber")
@@ -195,6 +267,29 @@ class TestEncounter(unittest.TestCase):
         self.assertGreaterEqual(len(rewards), 1)
         self.assertIn(direct_reward, rewards)
     
+    def test_complete_vectorized(self):
+        """Test rolling all monster loot in one vectorized pass"""
+        monsters = [Monster(f"Monster {i}", 4, Monster.VIRUS) for i in range(3)]
+        for monster in monsters:
+            self.combat_encounter.add_monster(monster)
+        direct_reward = {"type": "item", "name": "Test Item"}
+        self.combat_encounter.add_reward(direct_reward)
+        
+        rewards = self.combat_encounter.complete_vectorized(BatchRNG(11))
+        
+        self.assertTrue(self.combat_encounter.completed)
+        self.assertEqual(rewards[-1], direct_reward)
+        
+        # Currency always drops, within 20% of the table amount
+        currency = [r for r in rewards if r["type"] == "currency"]
+        self.assertEqual(len(currency), 3)
+        for reward in currency:
+            self.assertTrue(24 <= reward["amount"] <= 36)
+        
+        # Loot tables themselves are left untouched
+        for monster in monsters:
+            self.assertEqual(monster.loot[-1]["amount"], 30)
+    
     def test_serialization(self):
         """Test encounter serialization and deserialization"""
         # Add content to encounter
@@ -254,12 +349,28 @@ class TestEncounterGenerator(unittest.TestCase):
     def test_generate_treasure_encounter(self):
         """Test generating a trap in a treasure room"""
         # Mock random to guarantee a trap
-        with patch('random.random', return_value=0.1):
+        with patch('models.encounter._random', return_value=0.1):
             encounter = EncounterGenerator.generate_encounter(Room.TREASURE, 2, "neon")
             
             self.assertIsNotNone(encounter)
             self.assertEqual(encounter.encounter_type, Encounter.TRAP)
     
+    def test_batch_rng_is_reproducible(self):
+        """Test that encounters drawn from a seeded BatchRNG repeat exactly"""
+        def generate(seed):
+            rng = BatchRNG(seed)
+            return [
+                EncounterGenerator.generate_encounter(room_type, 3, "neon", rng=rng).to_dict()
+                for room_type in (Room.COMBAT, Room.BOSS, Room.PUZZLE)
+            ]
+        
+        self.assertEqual(generate(7), generate(7))
+        
+        rng = BatchRNG(1)
+        for _ in range(2000):
+            self.assertIn(rng.randint(1, 2), (1, 2))
+            self.assertTrue(-1 <= rng.uniform(-1, 1) < 1)
+    
     def test_generate_invalid_room_type(self):
         """Test generating encounter for room type without encounters"""
         encounter = EncounterGenerator.generate_encounter(Room.REST, 2, "neon")
@@ -267,6 +378,3 @@ class TestEncounterGenerator(unittest.TestCase):
         # Should not generate an encounter for rest rooms
         self.assertIsNone(encounter)
 
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file